@@ -9,6 +9,9 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from pathlib import Path
 from typing import Dict, Set, List, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import queue
 import uuid
 import cv2
 import numpy as np
@@ -57,6 +60,7 @@ from tools.segmenter.dialogs import (
     DeleteObjectDialog, PageSelectionDialog, NestingConfigDialog, NestingResultsDialog
 )
 from tools.segmenter.core.nesting import NestingEngine, check_rectpack_available
+from tools.segmenter.utils.image import crop_mask, expand_mask, get_mask_bbox
 from tools.segmenter.widgets import (
     CollapsibleFrame, PositionGrid,
     ResizableLayout, StatusBar, PanelConfig, DockablePanel
@@ -102,6 +106,19 @@ class SegmenterApp:
         self.current_page_id: Optional[str] = None
         self.categories: Dict[str, DynamicCategory] = {}
         self.all_objects: List[SegmentedObject] = []  # Global object list across all pages
+        # page_id -> {object_id: object} for objects with an instance on that page
+        self._objects_by_page: Dict[str, Dict[str, SegmentedObject]] = defaultdict(dict)
+        # object_id -> object, kept in step with the page index
+        self._object_by_id: Dict[str, SegmentedObject] = {}
+        # category -> objects indexed so far, for default "<prefix><N>" names.
+        # Never decremented (deletes keep their numbers); reset only when a
+        # workspace is loaded or a new PDF replaces the workspace.
+        self._category_counters: Dict[str, int] = {}
+        # instance/element id -> [(obj, inst[, elem])], rebuilt lazily when stale
+        self._object_index_version = 0
+        self._owner_maps_version = -1
+        self._instance_owners: Dict[str, list] = {}
+        self._element_owners: Dict[str, list] = {}
         # Store which objects are within each planform (planform_id -> list of object_ids)
         self.planform_objects: Dict[str, List[str]] = {}
         
@@ -151,6 +168,45 @@ class SegmenterApp:
         # Performance: Debouncing for display updates
         self._update_display_pending = False
         self._update_display_timer_id = None
+        # Cache invalidation + redraw requested by edits, flushed once when idle
+        self._pending_refresh = False
+        # While > 0 (e.g. during an inline rename), refreshes and tree syncs
+        # are queued and run by _resume_redraws
+        self._suspend_redraws = 0
+        self._tree_sync_pending = False
+        self._tree_sync_select: Optional[str] = None
+        # Pages are rendered on a single worker thread; only the newest
+        # request (by generation) is installed on the canvas
+        self._render_executor: Optional[ThreadPoolExecutor] = None
+        self._render_future = None
+        self._render_generation = 0
+        # Dedicated worker for rasterizing PDFs on open, and the load in flight
+        self._pdf_executor: Optional[ThreadPoolExecutor] = None
+        self._pdf_load_future = None
+        # Kept between nesting runs so unchanged parts aren't re-extracted
+        self._nesting_engine: Optional[NestingEngine] = None
+        # Coalesce bursts of tree selection events into one idle pass
+        self._tree_select_pending = False
+        # Categories of the selected objects, and the selection they were taken from
+        self._selected_categories: Set[str] = set()
+        self._selected_categories_ids: frozenset = frozenset()
+        # object_id -> signature of the object's tree rows when last built
+        self._tree_item_sigs: Dict[str, tuple] = {}
+        # Child rows of collapsed object/instance rows, inserted on first expand
+        self._tree_deferred_rows: Dict[str, list] = {}
+        # Inline rename Entry, created on first use and reused (hidden) after
+        self._inline_entry: Optional[tk.Entry] = None
+        self._inline_edit_obj: Optional[SegmentedObject] = None
+        # Plain-Python mirrors of Tk variables read on hot paths; kept in
+        # sync by the widget callbacks so tree code doesn't round-trip to Tcl
+        self._grouping_mode = "category"
+        self._auto_show_image = True
+        self._current_view = ""
+        
+        # Tree icons: color key -> PhotoImage, and category name -> PhotoImage
+        # (the latter is rebuilt whenever the category list is refreshed)
+        self.tree_icons = {}
+        self.category_tree_icons = {}
         
         # Dialog state tracking
         
@@ -542,6 +598,8 @@ class SegmenterApp:
                                        width=10)
         self.view_combo.pack(side=tk.RIGHT)
         self.view_combo.bind("<<ComboboxSelected>>", self._on_view_changed)
+        # The combo is editable and also set from code, so track every write
+        self.current_view_var.trace_add("write", lambda *args: self._on_view_changed())
         
         tk.Label(view_section.content, text="New objects will be assigned this view",
                 bg=t["bg"], fg=t["fg_subtle"], font=("Segoe UI", 8)).pack(anchor=tk.W, padx=8)
@@ -648,7 +706,7 @@ class SegmenterApp:
         group_combo = ttk.Combobox(group_frame, textvariable=self.tree_grouping_var,
                                    values=["category", "view"], state="readonly", width=10)
         group_combo.pack(side=tk.LEFT, padx=8)
-        group_combo.bind("<<ComboboxSelected>>", lambda e: self._update_tree())
+        group_combo.bind("<<ComboboxSelected>>", self._on_grouping_changed)
         
         # Tree
         tree_frame = tk.Frame(content, bg=t["bg"])
@@ -664,6 +722,7 @@ class SegmenterApp:
         self.object_tree.heading("#0", text="Objects")
         self.object_tree.column("#0", width=250)
         self.object_tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.object_tree.bind("<<TreeviewOpen>>", self._on_tree_open)
         self.object_tree.bind("<Button-1>", self._on_tree_click)
         self.object_tree.bind("<Double-1>", self._on_tree_double_click)
         self.object_tree.bind("<Button-3>", self._on_tree_right_click)
@@ -681,15 +740,14 @@ class SegmenterApp:
         self.object_tree.bind("<Enter>", _bind_tree_scroll)
         self.object_tree.bind("<Leave>", _unbind_tree_scroll)
         
-        self.tree_icons = {}
-        
         # Checkbox to toggle auto-load image on selection
         options_frame = tk.Frame(content, bg=t["bg"])
         options_frame.pack(fill=tk.X, padx=8, pady=(0, 4))
         
         self.auto_show_image_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(options_frame, text="Show image on select",
-                       variable=self.auto_show_image_var).pack(anchor=tk.W)
+                       variable=self.auto_show_image_var,
+                       command=self._on_auto_show_image_changed).pack(anchor=tk.W)
         
         # Collapse/expand buttons
         expand_frame = tk.Frame(content, bg=t["bg"])
@@ -947,6 +1005,8 @@ class SegmenterApp:
     
     def _refresh_categories(self):
         """Refresh category list in sidebar."""
+        self._build_tree_icons()
+        
         for w in self.cat_frame.winfo_children():
             w.destroy()
         
@@ -1067,7 +1127,7 @@ class SegmenterApp:
             self.object_move_start = None
             self.object_move_offset = None
             page = self._get_current_page()
-            if page and hasattr(page, 'canvas'):
+            if page and page.canvas is not None:
                 page.canvas.config(cursor="crosshair")
             self._update_display()
             self.status_var.set("Move cancelled")
@@ -1078,7 +1138,7 @@ class SegmenterApp:
             self.pixel_move_start = None
             self.pixel_move_offset = None
             page = self._get_current_page()
-            if page and hasattr(page, 'canvas'):
+            if page and page.canvas is not None:
                 page.canvas.config(cursor="crosshair")
             self._update_display()
             self.status_var.set("Move cancelled")
@@ -1090,7 +1150,7 @@ class SegmenterApp:
         self.rect_start = None
         self.rect_current = None
         page = self._get_current_page()
-        if page and hasattr(page, 'canvas'):
+        if page and page.canvas is not None:
             page.canvas.delete("temp")
             page.canvas.delete("rect")
         self._redraw_points()
@@ -1140,11 +1200,10 @@ class SegmenterApp:
         cat_name = self.category_var.get() or "R"
         cat = self.categories.get(cat_name)
         prefix = cat.prefix if cat else cat_name[0].upper()
-        count = sum(1 for o in self.all_objects if o.category == cat_name) + 1
+        count = self._category_counters.get(cat_name, 0) + 1
         
         # Get current view if set
-        current_view = getattr(self, 'current_view_var', None)
-        view_type = current_view.get() if current_view else ""
+        view_type = self._current_view
         
         name = simpledialog.askstring("Object Name", f"Name ({len(self.group_mode_elements)} elements):",
                                       initialvalue=f"{prefix}{count}", parent=self.root)
@@ -1155,7 +1214,7 @@ class SegmenterApp:
         inst = ObjectInstance(instance_num=1, page_id=page.tab_id, view_type=view_type)
         inst.elements = list(self.group_mode_elements)
         obj.instances.append(inst)
-        self.all_objects.append(obj)
+        self._add_object(obj)
         
         # Clear elements but keep group mode active - user can turn it off manually
         self.group_mode_elements.clear()
@@ -1164,9 +1223,8 @@ class SegmenterApp:
         # self.group_mode_active = False
         self._update_group_count()
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
+        self._request_refresh()
         self._add_tree_item(obj)  # Incremental add
-        self._update_display()
         self.status_var.set(f"Created: {name} - Group mode still active")
     
     def _adjust(self, setting: str, delta: int):
@@ -1192,7 +1250,7 @@ class SegmenterApp:
     
     def _zoom_fit(self):
         page = self._get_current_page()
-        if not page or page.original_image is None or not hasattr(page, 'canvas'):
+        if not page or page.original_image is None or page.canvas is None:
             return
         h, w = page.original_image.shape[:2]
         cw = max(page.canvas.winfo_width(), 100)
@@ -1220,6 +1278,7 @@ class SegmenterApp:
         if not self.settings.show_ruler:
             page.h_ruler.delete("all")
             page.v_ruler.delete("all")
+            page._ruler_key = None
             return
         
         # Get colors from theme
@@ -1233,6 +1292,20 @@ class SegmenterApp:
         
         unit = self.settings.ruler_unit
         
+        # Skip the redraw if nothing the rulers depend on has changed
+        # (most display updates are selection/edit redraws at a fixed view)
+        ruler_key = (ppi_zoomed, unit, bg_color, fg_color, tick_color,
+                     page.h_ruler.winfo_width(), page.v_ruler.winfo_height(),
+                     page.original_image.shape[:2] if page.original_image is not None else None)
+        if page.canvas is not None:
+            try:
+                ruler_key += (page.canvas.xview(), page.canvas.yview())
+            except:
+                pass
+        if getattr(page, '_ruler_key', None) == ruler_key:
+            return
+        page._ruler_key = ruler_key
+        
         # Draw horizontal ruler
         self._draw_h_ruler(page, ppi_zoomed, unit, bg_color, fg_color, tick_color)
         
@@ -1253,7 +1326,7 @@ class SegmenterApp:
         
         # Get scroll position
         x_offset = 0
-        if hasattr(page, 'canvas'):
+        if page.canvas is not None:
             try:
                 x_view = page.canvas.xview()
                 if page.original_image is not None:
@@ -1310,7 +1383,7 @@ class SegmenterApp:
         
         # Get scroll position
         y_offset = 0
-        if hasattr(page, 'canvas'):
+        if page.canvas is not None:
             try:
                 y_view = page.canvas.yview()
                 if page.original_image is not None:
@@ -1392,13 +1465,13 @@ class SegmenterApp:
             if not last.instances[-1].elements:
                 last.instances.pop()
             if not last.instances:
-                self.all_objects.remove(last)
+                self._remove_object(last)
                 self._remove_tree_item(last.object_id)
             else:
+                self._reindex_object(last)
                 self._update_tree_item(last)
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
-        self._update_display()
+        self._request_refresh()
     
     
     def _on_enter(self):
@@ -1423,8 +1496,7 @@ class SegmenterApp:
         page.hide_background = not page.hide_background
         
         self._update_view_menu_labels()
-        self.renderer.invalidate_cache()
-        self._update_display()
+        self._request_refresh()
     
     def _run_ocr_for_page(self):
         """Run OCR on current page and add new text regions to marked text list."""
@@ -1495,7 +1567,7 @@ class SegmenterApp:
         masks_missing = 0
         for region in regions:
             region_id = region.get('id', '')
-            mask = region.get('mask')
+            mask = self._get_region_mask(page, region)
             text = region.get('text', f"text_{region_id}")
             
             if mask is None:
@@ -1540,6 +1612,7 @@ class SegmenterApp:
                                 view_type=""
                             )
                             obj.instances.append(inst)
+                            self._index_object(obj)
                         
                         # Add element if not already present
                         elem_exists = any(e.element_id == region_id for e in inst.elements)
@@ -1582,7 +1655,7 @@ class SegmenterApp:
                     instances=[inst]
                 )
                 
-                self.all_objects.append(obj)
+                self._add_object(obj)
                 objects_created += 1
                 print(f"DEBUG: Created mark_text object '{text}' (id={obj.object_id}) with region_id '{region_id}' on page {page.tab_id}")
         
@@ -1595,7 +1668,7 @@ class SegmenterApp:
                 mark_text_objs = [o for o in self.all_objects if o.category == 'mark_text']
                 if mark_text_objs:
                     last_obj_id = mark_text_objs[-1].object_id
-            self._update_tree(preserve_state=True, select_object_id=last_obj_id)
+            self._sync_tree(select_object_id=last_obj_id)
             total_mark_text = sum(1 for o in self.all_objects if o.category == 'mark_text')
             print(f"DEBUG: Added {objects_created} mark_text objects. Total mark_text objects: {total_mark_text}")
             print(f"DEBUG: Tree should now show {total_mark_text} mark_text objects")
@@ -1628,13 +1701,13 @@ class SegmenterApp:
             self.categories["mark_text"] = mark_text_cat
             self._refresh_categories()
         
-        # Build a map of region_id -> mask from auto/manual regions
-        region_masks = {}
+        # Build a map of region_id -> region from auto/manual regions
+        # (full-page masks are only rebuilt for the elements that need repair)
+        regions_by_id = {}
         for region in all_text_regions:
             region_id = region.get('id', '')
-            mask = region.get('mask')
-            if region_id and mask is not None:
-                region_masks[region_id] = mask
+            if region_id and ('mask_crop' in region or region.get('mask') is not None):
+                regions_by_id[region_id] = region
         
         # Repair masks for existing mark_text objects that have empty masks
         # This handles workspaces saved with old format (no RLE-encoded masks)
@@ -1647,9 +1720,9 @@ class SegmenterApp:
                         for elem in inst.elements:
                             existing_element_ids.add(elem.element_id)
                             # Check if mask is empty or None and we have a region mask to repair it
-                            if elem.mask is None or (elem.mask is not None and np.sum(elem.mask > 0) == 0):
-                                if elem.element_id in region_masks:
-                                    elem.mask = region_masks[elem.element_id]
+                            if elem.mask is None or not elem.mask.any():
+                                if elem.element_id in regions_by_id:
+                                    elem.mask = self._get_region_mask(page, regions_by_id[elem.element_id])
                                     repaired_count += 1
         
         if repaired_count > 0:
@@ -1660,8 +1733,7 @@ class SegmenterApp:
         for region in all_text_regions:
             region_id = region.get('id', '')
             if region_id and region_id not in existing_element_ids:
-                mask = region.get('mask')
-                if mask is not None:
+                if region_id in regions_by_id:
                     regions_to_add.append(region)
                     existing_element_ids.add(region_id)
         
@@ -1696,7 +1768,7 @@ class SegmenterApp:
         region_masks = {}
         for region in all_line_regions:
             region_id = region.get('id', '')
-            mask = region.get('mask')
+            mask = self._get_region_mask(page, region)
             if region_id and mask is not None:
                 region_masks[region_id] = mask
         
@@ -1713,9 +1785,12 @@ class SegmenterApp:
                     if inst.page_id == page.tab_id:
                         for elem in inst.elements:
                             existing_element_ids.add(elem.element_id)
-                            mask_status = "None" if elem.mask is None else f"{np.sum(elem.mask > 0)} pixels"
+                            # any() stops at the first set pixel; a full pixel count per
+                            # element is too slow to log on every workspace load
+                            mask_empty = elem.mask is None or not elem.mask.any()
+                            mask_status = "None" if elem.mask is None else ("empty" if mask_empty else "set")
                             print(f"DEBUG: mark_line object {obj.object_id}, element {elem.element_id}: mask={mask_status}")
-                            if elem.mask is None or (elem.mask is not None and np.sum(elem.mask > 0) == 0):
+                            if mask_empty:
                                 mark_line_objects.append((obj, inst, elem))
         
         print(f"DEBUG: Found {len(mark_line_objects)} mark_line objects with empty/None masks, {len(region_masks)} region masks available")
@@ -1738,7 +1813,7 @@ class SegmenterApp:
                         if mask is not None and np.any(mask > 0):
                             elem.mask = mask
                             repaired_count += 1
-                            print(f"DEBUG: Reconstructed mask for element {elem.element_id} from {len(elem.points)} points (mode={elem.mode}, {np.sum(mask > 0)} pixels)")
+                            print(f"DEBUG: Reconstructed mask for element {elem.element_id} from {len(elem.points)} points (mode={elem.mode}, {np.count_nonzero(mask)} pixels)")
                         else:
                             print(f"DEBUG: Could not reconstruct mask for element {elem.element_id} (mode={elem.mode}, {len(elem.points)} points)")
                     except Exception as e:
@@ -1750,6 +1825,7 @@ class SegmenterApp:
             
             # Find which region masks are already used by elements with valid masks
             used_region_ids = set()
+            region_totals = {rid: np.count_nonzero(rmask) for rid, rmask in region_masks.items()}
             for obj in self.all_objects:
                 if obj.category == "mark_line":
                     for inst in obj.instances:
@@ -1759,8 +1835,8 @@ class SegmenterApp:
                                     # Check which region this mask matches (80% overlap)
                                     for rid, rmask in region_masks.items():
                                         if rid not in used_region_ids and rmask.shape == (h, w):
-                                            overlap = np.sum((elem.mask > 0) & (rmask > 0))
-                                            total = np.sum(rmask > 0)
+                                            overlap = np.count_nonzero((elem.mask > 0) & (rmask > 0))
+                                            total = region_totals[rid]
                                             if total > 0 and overlap / total > 0.8:
                                                 print(f"DEBUG: Region {rid} already used by element {elem.element_id} ({overlap}/{total} overlap)")
                                                 used_region_ids.add(rid)
@@ -1782,7 +1858,7 @@ class SegmenterApp:
                     elem.mask = region_mask.copy()
                     repaired_count += 1
                     used_region_ids.add(region_id)
-                    print(f"DEBUG: Repaired element {elem.element_id} (obj {obj.object_id}) with region {region_id} ({np.sum(region_mask > 0)} pixels)")
+                    print(f"DEBUG: Repaired element {elem.element_id} (obj {obj.object_id}) with region {region_id} ({region_totals[region_id]} pixels)")
                 else:
                     print(f"DEBUG: WARNING: Could not repair element {elem.element_id} (obj {obj.object_id}) - no available region masks ({idx+1}/{len(mark_line_objects)})")
         
@@ -1792,7 +1868,7 @@ class SegmenterApp:
         # Check for unrecoverable objects (mode="rect" with no mask data)
         unrecoverable_objects = []
         for obj, inst, elem in mark_line_objects:
-            if elem.mask is None or np.sum(elem.mask > 0) == 0:
+            if elem.mask is None or not elem.mask.any():
                 unrecoverable_objects.append((obj, inst, elem))
         
         if unrecoverable_objects:
@@ -1811,8 +1887,9 @@ class SegmenterApp:
             region_id = region.get('id', '')
             # Check if we already have an object for this region
             # We'll match by checking if any element has a similar ID or if we need to create new
-            mask = region.get('mask')
+            mask = self._get_region_mask(page, region)
             if mask is not None and np.any(mask > 0):
+                total = np.count_nonzero(mask)
                 # Check if this region is already represented in objects
                 region_already_added = False
                 for obj in self.all_objects:
@@ -1822,8 +1899,7 @@ class SegmenterApp:
                                 for elem in inst.elements:
                                     if elem.mask is not None and np.any(elem.mask > 0):
                                         # Check if masks overlap significantly
-                                        overlap = np.sum((elem.mask > 0) & (mask > 0))
-                                        total = np.sum(mask > 0)
+                                        overlap = np.count_nonzero((elem.mask > 0) & (mask > 0))
                                         if total > 0 and overlap / total > 0.8:  # 80% overlap
                                             region_already_added = True
                                             break
@@ -1838,7 +1914,7 @@ class SegmenterApp:
         # Create objects for regions that need to be added
         for region in regions_to_add:
             region_id = region.get('id', '')
-            mask = region.get('mask')
+            mask = self._get_region_mask(page, region)
             points = region.get('points', [])
             mode = region.get('mode', 'flood')
             
@@ -1875,11 +1951,11 @@ class SegmenterApp:
                     instances=[inst]
                 )
                 
-                self.all_objects.append(obj)
+                self._add_object(obj)
         
         if regions_to_add:
             self.workspace_modified = True
-            self._update_tree()
+            self._sync_tree()
             print(f"Added {len(regions_to_add)} mark_line objects from existing regions")
     
     def _toggle_hide_hatching(self):
@@ -1904,8 +1980,7 @@ class SegmenterApp:
         page.hide_hatching = not page.hide_hatching
         
         self._update_view_menu_labels()
-        self.renderer.invalidate_cache()
-        self._update_display()
+        self._request_refresh()
     
     def _update_view_menu_labels(self):
         """Update View menu labels based on current page state."""
@@ -2014,12 +2089,13 @@ class SegmenterApp:
         try:
             config = dialog.result
             
-            # Create nesting engine
+            # Reuse the nesting engine so unchanged parts keep their cached masks
             spacing_pixels = int(config["spacing"] * config["dpi"])
-            engine = NestingEngine(
-                spacing=spacing_pixels,
-                allow_rotation=config["allow_rotation"]
-            )
+            engine = self._nesting_engine
+            if engine is None:
+                engine = self._nesting_engine = NestingEngine()
+            engine.spacing = spacing_pixels
+            engine.allow_rotation = config["allow_rotation"]
             
             # Run nesting
             results = engine.nest_by_material(
@@ -2143,9 +2219,8 @@ class SegmenterApp:
                 x2 = min(w, x + bw + padding)
                 y2 = min(h, y + bh + padding)
                 
-                # Create mask for this region
-                mask = np.zeros((h, w), dtype=np.uint8)
-                mask[y1:y2, x1:x2] = 255
+                # Store only the box itself, not a full-page mask
+                mask_crop = np.full((y2 - y1, x2 - x1), 255, dtype=np.uint8)
                 
                 # Get detected text
                 text = data['text'][i] if data['text'][i].strip() else f"text_{region_id}"
@@ -2156,7 +2231,8 @@ class SegmenterApp:
                     'bbox': (x1, y1, x2, y2),
                     'confidence': conf,
                     'mode': 'auto',
-                    'mask': mask
+                    'mask_bbox': (x1, y1, x2, y2),
+                    'mask_crop': mask_crop
                 })
                 region_id += 1
            
@@ -2220,9 +2296,8 @@ class SegmenterApp:
                     if area < 100:
                         continue
                     
-                    # Create mask for this region
-                    region_mask = np.zeros((h, w), dtype=np.uint8)
-                    region_mask[labels == i] = 255
+                    # Crop this component's mask to its bounding box
+                    mask_crop = np.where(labels[y:y + bh, x:x + bw] == i, 255, 0).astype(np.uint8)
                     
                     cx, cy = centroids[i]
                     
@@ -2232,7 +2307,8 @@ class SegmenterApp:
                         'area': area,
                         'center': (int(cx), int(cy)),
                         'mode': 'auto',
-                        'mask': region_mask
+                        'mask_bbox': (x, y, x + bw, y + bh),
+                        'mask_crop': mask_crop
                     })
             
         except Exception as e:
@@ -2240,6 +2316,65 @@ class SegmenterApp:
         
         return regions
     
+    # Region mask storage
+    # Regions keep their mask as 'mask_bbox' (x1, y1, x2, y2) + 'mask_crop' instead of
+    # a full-page array. Regions without 'mask_crop' still carry a legacy full 'mask'.
+    def _set_region_mask(self, region: dict, mask: np.ndarray) -> dict:
+        """Store a region's mask as a bounding-box crop and drop the full-page array."""
+        bbox, crop = crop_mask(mask)
+        region['mask_bbox'] = bbox
+        region['mask_crop'] = crop
+        region.pop('mask', None)
+        return region
+    
+    def _get_region_mask(self, page: PageTab, region: dict) -> Optional[np.ndarray]:
+        """Get a full-page mask for a region, rebuilding it from the crop if needed."""
+        if 'mask_crop' in region:
+            return expand_mask(region['mask_bbox'], region['mask_crop'], page.original_image.shape)
+        return region.get('mask')
+    
+    def _merge_region_mask(self, combined: np.ndarray, region: dict) -> Optional[int]:
+        """
+        OR a region's mask into combined in place, touching only the region's bbox.
+        
+        Returns the region's pixel count, or None if it has no usable mask.
+        """
+        if 'mask_crop' in region:
+            crop = region['mask_crop']
+            if crop is None:
+                return 0
+            x1, y1, x2, y2 = region['mask_bbox']
+            roi = combined[y1:y2, x1:x2]
+            np.maximum(roi, crop, out=roi)
+            return int(np.count_nonzero(crop))
+        
+        mask = region.get('mask')
+        if mask is None:
+            return None
+        if mask.shape != combined.shape:
+            print(f"Region mask shape mismatch: {mask.shape} vs expected {combined.shape}")
+            return None
+        np.maximum(combined, mask, out=combined)
+        return int(np.count_nonzero(mask))
+    
+    def _get_region_center(self, region: dict) -> Optional[tuple]:
+        """Get the (x, y) mean of a region's mask pixels, or None if it is empty."""
+        if 'mask_crop' in region:
+            crop = region['mask_crop']
+            if crop is None:
+                return None
+            ys, xs = np.nonzero(crop)
+            x1, y1 = region['mask_bbox'][:2]
+            return (x1 + np.mean(xs), y1 + np.mean(ys))
+        
+        mask = region.get('mask')
+        if mask is None:
+            return None
+        ys, xs = np.nonzero(mask)
+        if len(xs) == 0:
+            return None
+        return (np.mean(xs), np.mean(ys))
+    
     # Manual text/hatching region management
     def _add_manual_text_region(self, page: PageTab, mask: np.ndarray, point: tuple, mode: str = "flood"):
         """Add a manually marked text region."""
@@ -2248,12 +2383,11 @@ class SegmenterApp:
         
         # Store the region with its seed point and mode for reference
         region_id = len(page.manual_text_regions) + 1
-        page.manual_text_regions.append({
+        page.manual_text_regions.append(self._set_region_mask({
             'id': region_id,
             'point': point,
             'mode': mode,
-            'mask': mask.copy()
-        })
+        }, mask))
         
         # Incrementally update combined text mask (much faster than full recompute)
         old_mask = getattr(page, 'combined_text_mask', None)
@@ -2268,9 +2402,7 @@ class SegmenterApp:
         self._update_working_image_cache_for_mask_with_old(page, 'text', page.combined_text_mask, old_mask)
         
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
-        # Use debounced update for better performance
-        self._update_display()
+        self._request_refresh()
         self.status_var.set(f"Added manual text region #{region_id} ({mode})")
     
     def _add_manual_hatch_region(self, page: PageTab, mask: np.ndarray, point: tuple, mode: str = "flood"):
@@ -2279,12 +2411,11 @@ class SegmenterApp:
             page.manual_hatch_regions = []
         
         region_id = len(page.manual_hatch_regions) + 1
-        page.manual_hatch_regions.append({
+        page.manual_hatch_regions.append(self._set_region_mask({
             'id': region_id,
             'point': point,
             'mode': mode,
-            'mask': mask.copy()
-        })
+        }, mask))
         
         # Incrementally update combined hatching mask (much faster than full recompute)
         old_mask = getattr(page, 'combined_hatch_mask', None)
@@ -2299,9 +2430,7 @@ class SegmenterApp:
         self._update_working_image_cache_for_mask_with_old(page, 'hatch', page.combined_hatch_mask, old_mask)
         
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
-        # Use debounced update for better performance
-        self._update_display()
+        self._request_refresh()
         self.status_var.set(f"Added manual hatching region #{region_id} ({mode})")
     
     def _detect_leader_line(self, page: PageTab, mask: np.ndarray, points: list) -> Optional[dict]:
@@ -2365,16 +2494,10 @@ class SegmenterApp:
             ex, ey = endpoint
             # Find nearest text region
             for region in all_text_regions:
-                region_mask = region.get('mask')
-                if region_mask is None:
-                    continue
-                
-                # Find closest point in text region
-                text_pixels = np.where(region_mask > 0)
-                if len(text_pixels[0]) > 0:
+                center = self._get_region_center(region)
+                if center is not None:
                     # Calculate distance to text region center
-                    text_y = np.mean(text_pixels[0])
-                    text_x = np.mean(text_pixels[1])
+                    text_x, text_y = center
                     dist = np.sqrt((ex - text_x)**2 + (ey - text_y)**2)
                     
                     if dist < min_text_dist and dist < 100:  # Within 100 pixels
@@ -2560,13 +2683,12 @@ class SegmenterApp:
         
         # Store the region first (defer expensive leader detection)
         region_id = len(page.manual_line_regions) + 1
-        region_data = {
+        region_data = self._set_region_mask({
             'id': region_id,
             'points': points.copy() if points else [],
             'mode': mode,
-            'mask': mask.copy(),
             'is_leader': False,  # Will be updated asynchronously
-        }
+        }, mask)
         
         page.manual_line_regions.append(region_data)
         
@@ -2613,12 +2735,12 @@ class SegmenterApp:
         )
         
         # Add to all_objects
-        self.all_objects.append(obj)
+        self._add_object(obj)
         self.workspace_modified = True
         
         # Update tree preserving expansion state and selecting the new object
         # (Don't trigger display update here - defer until after mask update)
-        self._update_tree(preserve_state=True, select_object_id=obj.object_id)
+        self._sync_tree(select_object_id=obj.object_id)
         
         # Update combined line mask incrementally (much faster than force_recompute)
         # Just add this new mask to the existing combined mask
@@ -2663,7 +2785,7 @@ class SegmenterApp:
                 self.status_var.set(f"Added line region ml-{next_number} (not detected as leader)")
             
             # Update tree to reflect new name (preserve state, select this object)
-            self._update_tree(preserve_state=True, select_object_id=obj.object_id)
+            self._sync_tree(select_object_id=obj.object_id)
         
         # Schedule leader detection after UI update
         self.root.after(100, detect_leader_async)
@@ -2672,6 +2794,43 @@ class SegmenterApp:
         self._update_display()
         self.status_var.set(f"Added line region #{region_id} ({mode})")
     
+    def _combine_region_masks(self, page: PageTab, kind: str) -> tuple:
+        """
+        Build the combined auto + manual mask for a page's text or hatch regions.
+        
+        Only reads the page's region lists, so it is safe to run off the Tk
+        thread. Returns (combined_mask, cache_key).
+        """
+        h, w = page.original_image.shape[:2]
+        combined = np.zeros((h, w), dtype=np.uint8)
+        
+        auto_count = 0
+        manual_count = 0
+        auto_pixels = 0
+        manual_pixels = 0
+        
+        # OR each region's cropped mask into its bbox of the combined mask
+        # (only the region's own rows/cols are touched, no full-page temporaries)
+        
+        # Add auto-detected regions
+        for region in getattr(page, f'auto_{kind}_regions', None) or []:
+            pixels = self._merge_region_mask(combined, region)
+            if pixels is not None:
+                auto_count += 1
+                auto_pixels += pixels
+        
+        # Add manual regions
+        for region in getattr(page, f'manual_{kind}_regions', None) or []:
+            pixels = self._merge_region_mask(combined, region)
+            if pixels is not None:
+                manual_count += 1
+                manual_pixels += pixels
+        
+        total_pixels = np.count_nonzero(combined)
+        print(f"_update_combined_{kind}_mask: auto={auto_count} ({auto_pixels}px), "
+              f"manual={manual_count} ({manual_pixels}px), combined={total_pixels}px")
+        return combined, f"{auto_count}_{manual_count}"
+    
     def _update_combined_text_mask(self, page: PageTab, force_recompute: bool = False):
         """
         Combine auto-detected and manual text masks with caching.
@@ -2681,7 +2840,6 @@ class SegmenterApp:
             force_recompute: If True, recompute even if cached
         """
         # Check if we have a cached version and regions haven't changed
-        cache_key = f"text_mask_{page.tab_id}"
         if not force_recompute and hasattr(page, '_text_mask_cache_key'):
             # Check if regions have changed
             auto_count = len(getattr(page, 'auto_text_regions', []))
@@ -2691,61 +2849,9 @@ class SegmenterApp:
                 # Cache is valid, skip recomputation
                 return
         
-        h, w = page.original_image.shape[:2]
-        combined = np.zeros((h, w), dtype=np.uint8)
-        
-        auto_count = 0
-        manual_count = 0
-        auto_pixels = 0
-        manual_pixels = 0
-        
-        # Collect all masks first, then combine in one operation (faster than loop with np.maximum)
-        all_masks = []
-        
-        # Add auto-detected regions
-        if hasattr(page, 'auto_text_regions'):
-            for region in page.auto_text_regions:
-                mask = region.get('mask')
-                if mask is not None:
-                    if mask.shape == (h, w):
-                        all_masks.append(mask)
-                        auto_count += 1
-                        auto_pixels += np.sum(mask > 0)
-                    else:
-                        print(f"Text mask shape mismatch: {mask.shape} vs expected {(h, w)}")
-        
-        # Add manual regions
-        if hasattr(page, 'manual_text_regions'):
-            for region in page.manual_text_regions:
-                mask = region.get('mask')
-                if mask is not None:
-                    if mask.shape == (h, w):
-                        all_masks.append(mask)
-                        manual_count += 1
-                        manual_pixels += np.sum(mask > 0)
-                    else:
-                        print(f"Manual text mask shape mismatch: {mask.shape} vs expected {(h, w)}")
-        
-        # Combine all masks (use batch processing for large numbers to avoid memory issues)
-        if all_masks:
-            # For large numbers of masks, process in batches to avoid memory allocation errors
-            # With 644 masks of size (555, 4500), stacking all at once would require ~15GB
-            batch_size = 100  # Process 100 masks at a time
-            for i in range(0, len(all_masks), batch_size):
-                batch = all_masks[i:i+batch_size]
-                # Use iterative np.maximum instead of np.stack to save memory
-                # This avoids creating a large intermediate array
-                for mask in batch:
-                    combined = np.maximum(combined, mask)
-            combined = combined.astype(np.uint8)
-        
-        total_pixels = np.sum(combined > 0)
-        # Store cache key and combined mask
-        page._text_mask_cache_key = f"{auto_count}_{manual_count}"
+        combined, cache_key = self._combine_region_masks(page, 'text')
+        page._text_mask_cache_key = cache_key
         page.combined_text_mask = combined
-        
-        print(f"_update_combined_text_mask: auto={auto_count} ({auto_pixels}px), "
-              f"manual={manual_count} ({manual_pixels}px), combined={total_pixels}px")
         # Update working image cache incrementally (handles both addition and removal)
         page = self._get_current_page()
         if page and page.tab_id == self.current_page_id:
@@ -2774,60 +2880,9 @@ class SegmenterApp:
                 # Cache is valid, skip recomputation
                 return
         
-        h, w = page.original_image.shape[:2]
-        combined = np.zeros((h, w), dtype=np.uint8)
-        
-        auto_count = 0
-        manual_count = 0
-        auto_pixels = 0
-        manual_pixels = 0
-        
-        # Collect all masks first, then combine in one operation (faster than loop with np.maximum)
-        all_masks = []
-        
-        # Add auto-detected regions
-        if hasattr(page, 'auto_hatch_regions'):
-            for region in page.auto_hatch_regions:
-                mask = region.get('mask')
-                if mask is not None:
-                    if mask.shape == (h, w):
-                        all_masks.append(mask)
-                        auto_count += 1
-                        auto_pixels += np.sum(mask > 0)
-                    else:
-                        print(f"Hatch mask shape mismatch: {mask.shape} vs expected {(h, w)}")
-        
-        # Add manual regions
-        if hasattr(page, 'manual_hatch_regions'):
-            for region in page.manual_hatch_regions:
-                mask = region.get('mask')
-                if mask is not None:
-                    if mask.shape == (h, w):
-                        all_masks.append(mask)
-                        manual_count += 1
-                        manual_pixels += np.sum(mask > 0)
-                    else:
-                        print(f"Manual hatch mask shape mismatch: {mask.shape} vs expected {(h, w)}")
-        
-        # Combine all masks (use batch processing for large numbers to avoid memory issues)
-        if all_masks:
-            # For large numbers of masks, process in batches to avoid memory allocation errors
-            batch_size = 100  # Process 100 masks at a time
-            for i in range(0, len(all_masks), batch_size):
-                batch = all_masks[i:i+batch_size]
-                # Use iterative np.maximum instead of np.stack to save memory
-                # This avoids creating a large intermediate array
-                for mask in batch:
-                    combined = np.maximum(combined, mask)
-            combined = combined.astype(np.uint8)
-        
-        total_pixels = np.sum(combined > 0)
-        # Store cache key and combined mask
-        page._hatch_mask_cache_key = f"{auto_count}_{manual_count}"
+        combined, cache_key = self._combine_region_masks(page, 'hatch')
+        page._hatch_mask_cache_key = cache_key
         page.combined_hatch_mask = combined
-        
-        print(f"_update_combined_hatch_mask: auto={auto_count} ({auto_pixels}px), "
-              f"manual={manual_count} ({manual_pixels}px), combined={total_pixels}px")
         # Update working image cache incrementally (handles both addition and removal)
         page = self._get_current_page()
         if page and page.tab_id == self.current_page_id:
@@ -2864,14 +2919,10 @@ class SegmenterApp:
         # Add masks from manual_line_regions (for backward compatibility)
         if hasattr(page, 'manual_line_regions'):
             for region in page.manual_line_regions:
-                mask = region.get('mask')
-                if mask is not None:
-                    if mask.shape == (h, w):
-                        all_masks.append(mask)
-                        region_count += 1
-                        region_pixels += np.sum(mask > 0)
-                    else:
-                        print(f"Line region mask shape mismatch: {mask.shape} vs expected {(h, w)}")
+                pixels = self._merge_region_mask(combined, region)
+                if pixels is not None:
+                    region_count += 1
+                    region_pixels += pixels
         
         # Add masks from all mark_line objects on this page
         for obj in self.all_objects:
@@ -2895,7 +2946,7 @@ class SegmenterApp:
                 batch = all_masks[i:i + batch_size]
                 batch_combined = np.maximum.reduce(batch)
                 combined = np.maximum(combined, batch_combined)
-        else:
+        elif not region_count:
             # No masks - set to None to indicate no lines to hide
             combined = None
         
@@ -2921,8 +2972,7 @@ class SegmenterApp:
             self.workspace_modified = True
             if update_display:
                 self._update_combined_text_mask(page)
-                self.renderer.invalidate_cache()
-                self._update_display()
+                self._request_refresh()
     
     def _remove_auto_text_region(self, page: PageTab, region_id: str, update_display: bool = True):
         """Remove an auto-detected text region by ID."""
@@ -2931,8 +2981,7 @@ class SegmenterApp:
             self.workspace_modified = True
             if update_display:
                 self._update_combined_text_mask(page)
-                self.renderer.invalidate_cache()
-                self._update_display()
+                self._request_refresh()
     
     def _remove_manual_hatch_region(self, page: PageTab, region_id: str, update_display: bool = True):
         """Remove a manual hatching region by ID."""
@@ -2941,8 +2990,7 @@ class SegmenterApp:
             self.workspace_modified = True
             if update_display:
                 self._update_combined_hatch_mask(page)
-                self.renderer.invalidate_cache()
-                self._update_display()
+                self._request_refresh()
     
     def _remove_auto_hatch_region(self, page: PageTab, region_id: str, update_display: bool = True):
         """Remove an auto-detected hatching region by ID."""
@@ -2951,8 +2999,7 @@ class SegmenterApp:
             self.workspace_modified = True
             if update_display:
                 self._update_combined_hatch_mask(page)
-                self.renderer.invalidate_cache()
-                self._update_display()
+                self._request_refresh()
     
     
     # Page management
@@ -3009,8 +3056,23 @@ class SegmenterApp:
         v_scroll = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL)
         v_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Track the scroll position as Tk reports it, so saving needs no
+        # xview()/yview() queries. A page loaded from a workspace keeps its
+        # saved position until its first render puts it back.
+        page._scroll_pending = from_workspace
+        
+        def _on_xview(first, last):
+            h_scroll.set(first, last)
+            if not page._scroll_pending:
+                page.scroll_x = float(first)
+        
+        def _on_yview(first, last):
+            v_scroll.set(first, last)
+            if not page._scroll_pending:
+                page.scroll_y = float(first)
+        
         canvas = tk.Canvas(canvas_frame, bg=self.theme["canvas_bg"], cursor="crosshair",
-                          xscrollcommand=h_scroll.set, yscrollcommand=v_scroll.set)
+                          xscrollcommand=_on_xview, yscrollcommand=_on_yview)
         canvas.pack(fill=tk.BOTH, expand=True)
         h_scroll.config(command=lambda *args: self._scroll_with_rulers(page, 'h', *args))
         v_scroll.config(command=lambda *args: self._scroll_with_rulers(page, 'v', *args))
@@ -3023,28 +3085,42 @@ class SegmenterApp:
         canvas.bind("<Motion>", self._on_motion)
         
         # Mouse wheel scrolling for canvas
-        def _canvas_mousewheel(event):
+        def _canvas_mousewheel(delta):
             # Vertical scroll with mouse wheel
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+            canvas.yview_scroll(int(-1*(int(delta)/120)), "units")
             self._draw_rulers(page)
         
-        def _canvas_mousewheel_horizontal(event):
+        def _canvas_mousewheel_horizontal(delta):
             # Horizontal scroll with Shift+wheel or horizontal wheel
-            canvas.xview_scroll(int(-1*(event.delta/120)), "units")
+            canvas.xview_scroll(int(-1*(int(delta)/120)), "units")
             self._draw_rulers(page)
         
-        def _bind_canvas_scroll(event):
-            canvas.bind_all("<MouseWheel>", _canvas_mousewheel)
-            canvas.bind_all("<Shift-MouseWheel>", _canvas_mousewheel_horizontal)
+        # Register the Tcl callbacks once per page so Enter/Leave only has to
+        # swap bindings in a single Tcl round-trip (and doesn't leak a new
+        # Tcl command for every lambda on every Enter).
+        wheel_cmd = canvas.register(_canvas_mousewheel)
+        wheel_h_cmd = canvas.register(_canvas_mousewheel_horizontal)
+        tilt_left_cmd = canvas.register(lambda: canvas.xview_scroll(-1, "units"))
+        tilt_right_cmd = canvas.register(lambda: canvas.xview_scroll(1, "units"))
+        bind_script = (
+            f"bind all <MouseWheel> {{{wheel_cmd} %D}}; "
+            f"bind all <Shift-MouseWheel> {{{wheel_h_cmd} %D}}; "
             # For mice with horizontal scroll (tilt wheel)
-            canvas.bind_all("<Shift-Button-4>", lambda e: canvas.xview_scroll(-1, "units"))
-            canvas.bind_all("<Shift-Button-5>", lambda e: canvas.xview_scroll(1, "units"))
+            f"bind all <Shift-Button-4> {{{tilt_left_cmd}}}; "
+            f"bind all <Shift-Button-5> {{{tilt_right_cmd}}}"
+        )
+        unbind_script = (
+            "bind all <MouseWheel> {}; "
+            "bind all <Shift-MouseWheel> {}; "
+            "bind all <Shift-Button-4> {}; "
+            "bind all <Shift-Button-5> {}"
+        )
+        
+        def _bind_canvas_scroll(event):
+            canvas.tk.eval(bind_script)
         
         def _unbind_canvas_scroll(event):
-            canvas.unbind_all("<MouseWheel>")
-            canvas.unbind_all("<Shift-MouseWheel>")
-            canvas.unbind_all("<Shift-Button-4>")
-            canvas.unbind_all("<Shift-Button-5>")
+            canvas.tk.eval(unbind_script)
         
         canvas.bind("<Enter>", _bind_canvas_scroll)
         canvas.bind("<Leave>", _unbind_canvas_scroll)
@@ -3084,7 +3160,7 @@ class SegmenterApp:
                     self._invalidate_working_image_cache()
                     self._update_view_menu_labels()  # Update menu for new page
                     self._update_display()
-                    self._update_tree()
+                    self._sync_tree()
                     break
         except:
             pass
@@ -3092,7 +3168,7 @@ class SegmenterApp:
     # Canvas events
     def _canvas_to_image(self, x: int, y: int) -> tuple:
         page = self._get_current_page()
-        if not page or not hasattr(page, 'canvas'):
+        if not page or page.canvas is None:
             return (0, 0)
         ix = int(page.canvas.canvasx(x) / self.zoom_level)
         iy = int(page.canvas.canvasy(y) / self.zoom_level)
@@ -3161,7 +3237,7 @@ class SegmenterApp:
             self.pixel_move_start = None
             self.pixel_move_offset = None
             page = self._get_current_page()
-            if page and hasattr(page, 'canvas'):
+            if page and page.canvas is not None:
                 page.canvas.config(cursor="crosshair")
             self._update_display()
             return
@@ -3171,7 +3247,7 @@ class SegmenterApp:
             self.object_move_start = None
             self.object_move_offset = None
             page = self._get_current_page()
-            if page and hasattr(page, 'canvas'):
+            if page and page.canvas is not None:
                 page.canvas.config(cursor="crosshair")
             self._update_display()
             return
@@ -3278,7 +3354,7 @@ class SegmenterApp:
             self.pixel_move_start = None
             self.pixel_move_offset = None
             page = self._get_current_page()
-            if page and hasattr(page, 'canvas'):
+            if page and page.canvas is not None:
                 page.canvas.config(cursor="crosshair")
             return
         
@@ -3290,7 +3366,7 @@ class SegmenterApp:
             self.object_move_start = None
             self.object_move_offset = None
             page = self._get_current_page()
-            if page and hasattr(page, 'canvas'):
+            if page and page.canvas is not None:
                 page.canvas.config(cursor="crosshair")
             return
         
@@ -3314,21 +3390,7 @@ class SegmenterApp:
         if not page:
             return
         
-        # Search through all_objects for elements on this page
-        result = None
-        for obj in self.all_objects:
-            for inst in obj.instances:
-                # Only check instances on current page
-                if inst.page_id != page.tab_id:
-                    continue
-                for elem in inst.elements:
-                    if elem.contains_point(x, y):
-                        result = (obj, inst, elem)
-                        break
-                if result:
-                    break
-            if result:
-                break
+        result = self._get_element_at_point(page.tab_id, x, y)
         
         if result:
             obj, inst, elem = result
@@ -3367,7 +3429,7 @@ class SegmenterApp:
         print(f"  text_mask exists: {text_mask is not None}, "
               f"hatch_mask exists: {hatch_mask is not None}")
         if text_mask is not None:
-            print(f"  text_mask pixels: {np.sum(text_mask > 0)}")
+            print(f"  text_mask pixels: {np.count_nonzero(text_mask)}")
         
         # Get image with text/hatch hidden if those options are enabled
         working_image = self._get_working_image(page)
@@ -3611,9 +3673,9 @@ class SegmenterApp:
                     # Preserve selection after tree update
                     old_selection = self.object_tree.selection()
                     self._update_tree_item(obj)  # Only update this object
-                    # Re-select
+                    # Re-select (rows may be held back under a collapsed parent)
                     for item in old_selection:
-                        if self.object_tree.exists(item):
+                        if self._reveal_tree_row(item):
                             try:
                                 self.object_tree.selection_add(item)
                             except:
@@ -3627,17 +3689,16 @@ class SegmenterApp:
         # No selection or eraser: create a new object
         cat = self.categories.get(elem.category)
         prefix = cat.prefix if cat else elem.category[0].upper()
-        count = sum(1 for o in self.all_objects if o.category == elem.category) + 1
+        count = self._category_counters.get(elem.category, 0) + 1
         
         # Assign current view if set
-        current_view = getattr(self, 'current_view_var', None)
-        view_type = current_view.get() if current_view else ""
+        view_type = self._current_view
         
         new_obj = SegmentedObject(name=f"{prefix}{count}", category=elem.category)
         inst = ObjectInstance(instance_num=1, page_id=page.tab_id, view_type=view_type)
         inst.elements.append(elem)
         new_obj.instances.append(inst)
-        self.all_objects.append(new_obj)
+        self._add_object(new_obj)
         
         # CRITICAL: If this is a planform, find and store all visible objects within its boundaries
         # Do this asynchronously to avoid blocking planform creation
@@ -3661,21 +3722,112 @@ class SegmenterApp:
             self.root.after(50, find_and_store_objects)
         
         self.workspace_modified = True
-        self.renderer.invalidate_cache()  # Objects changed
+        self._request_refresh()
         self._add_tree_item(new_obj)  # Only add new item
-        self._update_display()
         self.status_var.set(f"Created: {new_obj.name}")
     
     # Display
     def _get_objects_for_page(self, page_id: str) -> List[SegmentedObject]:
         """Get objects that have instances on a specific page."""
-        result = []
+        return list(self._objects_by_page.get(page_id, {}).values())
+    
+    # Page -> objects index (kept in step with all_objects / instance page_ids)
+    def _add_object(self, obj: SegmentedObject):
+        """Append an object to all_objects and the lookup indexes."""
+        self.all_objects.append(obj)
+        self._index_object(obj)
+    
+    def _remove_object(self, obj: SegmentedObject):
+        """Remove an object from all_objects and the lookup indexes."""
+        self.all_objects.remove(obj)
+        self._unindex_object(obj)
+    
+    def _remove_objects(self, objs: list):
+        """Remove several objects with a single pass over all_objects."""
+        if not objs:
+            return
+        doomed = {id(obj) for obj in objs}
+        self.all_objects = [o for o in self.all_objects if id(o) not in doomed]
+        for obj in objs:
+            self._unindex_object(obj)
+    
+    def _index_object(self, obj: SegmentedObject):
+        """Register an object under every page it has an instance on."""
+        if obj.object_id not in self._object_by_id:
+            self._object_by_id[obj.object_id] = obj
+            self._category_counters[obj.category] = self._category_counters.get(obj.category, 0) + 1
+        self._object_index_version += 1
+        for inst in obj.instances:
+            page_objects = self._objects_by_page[inst.page_id]
+            if obj.object_id not in page_objects:
+                page_objects[obj.object_id] = obj
+    
+    def _unindex_object(self, obj: SegmentedObject):
+        """Remove an object from the page index."""
+        if self._object_by_id.get(obj.object_id) is obj:
+            del self._object_by_id[obj.object_id]
+        self._object_index_version += 1
+        for page_objects in self._objects_by_page.values():
+            page_objects.pop(obj.object_id, None)
+    
+    def _reindex_object(self, obj: SegmentedObject):
+        """Refresh an object's page index entries after its instances changed."""
+        page_ids = {inst.page_id for inst in obj.instances}
+        for page_id, page_objects in self._objects_by_page.items():
+            if page_id not in page_ids:
+                page_objects.pop(obj.object_id, None)
+        self._index_object(obj)
+    
+    def _rebuild_objects_by_page(self):
+        """Rebuild the page index from all_objects (after bulk changes)."""
+        self._objects_by_page = defaultdict(dict)
+        self._object_by_id = {}
+        # Name counters never go down, so a deleted object's name isn't
+        # handed out again; only replacing the workspace clears them
+        counters = self._category_counters
+        self._category_counters = {}
+        for obj in self.all_objects:
+            self._index_object(obj)
+        for category, count in counters.items():
+            self._category_counters[category] = max(count, self._category_counters.get(category, 0))
+    
+    def _rebuild_owner_maps(self):
+        """Rebuild the instance/element id -> owner maps from all_objects."""
+        self._instance_owners = defaultdict(list)
+        self._element_owners = defaultdict(list)
         for obj in self.all_objects:
-            # Check if any instance is on this page
-            has_instance_on_page = any(inst.page_id == page_id for inst in obj.instances)
-            if has_instance_on_page:
-                result.append(obj)
-        return result
+            for inst in obj.instances:
+                self._instance_owners[inst.instance_id].append((obj, inst))
+                for elem in inst.elements:
+                    self._element_owners[elem.element_id].append((obj, inst, elem))
+        self._owner_maps_version = self._object_index_version
+    
+    def _owner_is_current(self, obj: SegmentedObject, inst: ObjectInstance, elem: SegmentElement = None) -> bool:
+        """Check that a cached owner entry still reflects the object tree."""
+        if self._object_by_id.get(obj.object_id) is not obj:
+            return False
+        if not any(i is inst for i in obj.instances):
+            return False
+        if elem is not None and not any(e is elem for e in inst.elements):
+            return False
+        return True
+    
+    def _get_owners(self, owners_attr: str, item_id: str) -> list:
+        """Look up cached owners for an id, rebuilding the maps if they are stale."""
+        hits = getattr(self, owners_attr).get(item_id)
+        if (not hits or self._owner_maps_version != self._object_index_version or
+                not all(self._owner_is_current(*hit) for hit in hits)):
+            self._rebuild_owner_maps()
+            hits = getattr(self, owners_attr).get(item_id)
+        return hits or []
+    
+    def _find_instance_owners(self, inst_id: str) -> list:
+        """Get all (object, instance) pairs for an instance ID."""
+        return self._get_owners('_instance_owners', inst_id)
+    
+    def _find_element_owners(self, elem_id: str) -> list:
+        """Get all (object, instance, element) triples for an element ID."""
+        return self._get_owners('_element_owners', elem_id)
     
     def _find_objects_within_planform(self, page: PageTab, planform_mask: np.ndarray, planform_obj_id: str) -> List[str]:
         """
@@ -3801,13 +3953,55 @@ class SegmenterApp:
             self._update_display_pending = True
             self._update_display_timer_id = self.root.after(50, self._do_update_display)
     
+    def _refresh_labels(self):
+        """Redraw after a change that only affects label text (e.g. a rename)."""
+        if not self.show_labels:
+            return  # Names aren't drawn, so the canvas can't change
+        self.renderer.invalidate_labels()
+        self._update_display()
+    
+    def _request_refresh(self):
+        """
+        Invalidate the render cache and redraw once the event queue is idle.
+        
+        Several edits in the same event (e.g. a batch of deletions) share a
+        single invalidation and repaint.
+        """
+        if self._pending_refresh:
+            return
+        self._pending_refresh = True
+        if not self._suspend_redraws:
+            self.root.after_idle(self._flush_refresh)
+    
+    def _resume_redraws(self):
+        """End a _suspend_redraws section, running whatever was queued during it."""
+        self._suspend_redraws = max(0, self._suspend_redraws - 1)
+        if self._suspend_redraws:
+            return
+        if self._tree_sync_pending:
+            self._tree_sync_pending = False
+            self._sync_tree(select_object_id=self._tree_sync_select)
+        if self._pending_refresh:
+            self.root.after_idle(self._flush_refresh)
+    
+    def _flush_refresh(self):
+        """Perform a refresh queued by _request_refresh (no-op if already done)."""
+        if not self._pending_refresh:
+            return
+        self._update_display(immediate=True)
+    
     def _do_update_display(self):
         """Internal method that actually performs the display update."""
         self._update_display_pending = False
         self._update_display_timer_id = None
         
+        # A queued refresh is handled here so nothing renders from a stale cache
+        if self._pending_refresh:
+            self._pending_refresh = False
+            self.renderer.invalidate_cache()
+        
         page = self._get_current_page()
-        if not page or page.original_image is None or not hasattr(page, 'canvas'):
+        if not page or page.original_image is None or page.canvas is None:
             return
         
         # Get objects for this page
@@ -3924,10 +4118,19 @@ class SegmenterApp:
         # Get object move info for rendering
         object_move_offset = self.object_move_offset if self.is_moving_objects else None
         
-        rendered = self.renderer.render_page(
+        # Render off the Tk thread (NumPy/OpenCV release the GIL for the heavy
+        # work) so input stays responsive; the selection is snapshotted since
+        # the UI can change it while the render runs
+        self._render_generation += 1
+        if self._render_future is not None:
+            self._render_future.cancel()  # Drop a queued render we'd discard anyway
+        if self._render_executor is None:
+            self._render_executor = ThreadPoolExecutor(max_workers=1)
+        self._render_future = self._render_executor.submit(
+            self.renderer.render_page,
             page, self.categories, self.zoom_level, self.show_labels,
-            self.selected_object_ids, self.selected_instance_ids, self.selected_element_ids,
-            self.settings.planform_opacity, self.group_mode_elements,
+            set(self.selected_object_ids), set(self.selected_instance_ids), set(self.selected_element_ids),
+            self.settings.planform_opacity, list(self.group_mode_elements),
             hide_background=hide_background,
             objects=render_objects,
             text_mask=text_mask,
@@ -3937,15 +4140,68 @@ class SegmenterApp:
             pixel_move_offset=pixel_move_offset,
             object_move_offset=object_move_offset
         )
+        self._poll_render(self._render_future, page.tab_id, self._render_generation)
+    
+    def _poll_render(self, future, page_id: str, generation: int):
+        """Wait (without blocking Tk) for a background render, then install it."""
+        if generation != self._render_generation or future.cancelled():
+            return  # Superseded by a newer update
+        if not future.done():
+            self.root.after(10, self._poll_render, future, page_id, generation)
+            return
+        try:
+            rendered = future.result()
+        except Exception as e:
+            print(f"ERROR: Render failed: {e}")
+            return
+        self._install_rendered(page_id, rendered)
+    
+    def _install_rendered(self, page_id: str, rendered: np.ndarray):
+        """Show a rendered page on its canvas (Tk thread only)."""
+        page = self.pages.get(page_id)
+        if page is None or page_id != self.current_page_id or page.canvas is None:
+            return
         
-        pil_img = Image.fromarray(cv2.cvtColor(rendered, cv2.COLOR_BGRA2RGBA))
-        page.tk_image = ImageTk.PhotoImage(pil_img)
-        
-        page.canvas.delete("all")
-        page.canvas.create_image(0, 0, anchor=tk.NW, image=page.tk_image)
+        # The renderer stays BGRA since the exporters write its output with cv2.
+        # A writable frame is ours, so swap to RGBA in place; a read-only one
+        # is the renderer's cached composite and is converted into a new
+        # buffer. Either way PIL maps the result directly instead of copying.
+        if rendered.flags.writeable:
+            rendered = np.ascontiguousarray(rendered)
+            cv2.cvtColor(rendered, cv2.COLOR_BGRA2RGBA, dst=rendered)
+        else:
+            rendered = cv2.cvtColor(rendered, cv2.COLOR_BGRA2RGBA)
+        pil_img = Image.frombuffer("RGBA", (rendered.shape[1], rendered.shape[0]),
+                                   rendered, "raw", "RGBA", 0, 1)
+        page._rendered_frame = rendered  # Keep the buffer alive while PIL maps it
+        
+        # Blit into the existing PhotoImage when the size is unchanged (pan,
+        # selection, edits) instead of allocating a new Tk image each redraw
+        tk_image = getattr(page, 'tk_image', None)
+        if (tk_image is not None and tk_image.width() == pil_img.width and
+                tk_image.height() == pil_img.height):
+            tk_image.paste(pil_img)
+        else:
+            page.tk_image = ImageTk.PhotoImage(pil_img)
+        
+        # Keep one background image item and retarget it, rather than
+        # deleting every canvas item and recreating them each redraw
+        image_id = getattr(page, '_canvas_image_id', None)
+        if image_id is None or not page.canvas.type(image_id):
+            page._canvas_image_id = page.canvas.create_image(0, 0, anchor=tk.NW, image=page.tk_image,
+                                                             tags="bgimage")
+            page.canvas.tag_lower(page._canvas_image_id)
+        elif page.canvas.itemcget(image_id, "image") != str(page.tk_image):
+            page.canvas.itemconfigure(image_id, image=page.tk_image)
         page.canvas.configure(scrollregion=(0, 0, rendered.shape[1], rendered.shape[0]))
+        if getattr(page, '_scroll_pending', False):
+            # First time a loaded page is shown: restore its saved scroll position
+            page._scroll_pending = False
+            page.canvas.xview_moveto(page.scroll_x)
+            page.canvas.yview_moveto(page.scroll_y)
         
         self._redraw_points()
+        self._redraw_rectangle()  # Rescale an in-progress rectangle preview
         
         # Update zoom display
         zoom_text = f"{int(self.zoom_level * 100)}%"
@@ -3957,7 +4213,7 @@ class SegmenterApp:
     
     def _redraw_points(self):
         page = self._get_current_page()
-        if not page or not hasattr(page, 'canvas'):
+        if not page or page.canvas is None:
             return
         
         page.canvas.delete("temp")
@@ -3986,7 +4242,7 @@ class SegmenterApp:
     def _redraw_rectangle(self):
         """Draw rectangle preview on canvas."""
         page = self._get_current_page()
-        if not page or not hasattr(page, 'canvas') or not self.rect_start or not self.rect_current:
+        if not page or page.canvas is None or not self.rect_start or not self.rect_current:
             return
         
         page.canvas.delete("rect")
@@ -4013,7 +4269,7 @@ class SegmenterApp:
             return
         
         # Clear rectangle preview
-        if page and hasattr(page, 'canvas'):
+        if page and page.canvas is not None:
             page.canvas.delete("rect")
         
         x1, y1 = self.rect_start
@@ -4155,14 +4411,9 @@ class SegmenterApp:
             for endpoint in endpoints:
                 ex, ey = endpoint
                 for region in all_text_regions:
-                    region_mask = region.get('mask')
-                    if region_mask is None:
-                        continue
-                    
-                    text_pixels = np.where(region_mask > 0)
-                    if len(text_pixels[0]) > 0:
-                        text_y = np.mean(text_pixels[0])
-                        text_x = np.mean(text_pixels[1])
+                    center = self._get_region_center(region)
+                    if center is not None:
+                        text_x, text_y = center
                         dist = np.sqrt((ex - text_x)**2 + (ey - text_y)**2)
                         
                         if dist < 100:  # Within 100 pixels
@@ -4558,7 +4809,7 @@ class SegmenterApp:
     def _save_tree_expansion_state(self) -> dict:
         """Save which categories/nodes are expanded in the tree."""
         expanded_items = set()
-        if hasattr(self, 'tree_grouping_var') and self.tree_grouping_var.get() == "category":
+        if self._grouping_mode == "category":
             for item in self.object_tree.get_children():
                 if item.startswith("cat_"):
                     if self.object_tree.item(item, "open"):
@@ -4574,7 +4825,7 @@ class SegmenterApp:
         if not state or 'expanded_items' not in state:
             return
         expanded_items = state.get('expanded_items', set())
-        if hasattr(self, 'tree_grouping_var') and self.tree_grouping_var.get() == "category":
+        if self._grouping_mode == "category":
             for item in self.object_tree.get_children():
                 if item.startswith("cat_"):
                     if item in expanded_items:
@@ -4584,6 +4835,7 @@ class SegmenterApp:
                 # Also restore object node expansion
                 for child in self.object_tree.get_children(item):
                     if child in expanded_items:
+                        self._populate_tree_item(child)
                         self.object_tree.item(child, open=True)
     
     def _update_tree(self, preserve_state: bool = True, select_object_id: Optional[str] = None):
@@ -4593,27 +4845,18 @@ class SegmenterApp:
         if preserve_state:
             tree_state = self._save_tree_expansion_state()
         
-        self.object_tree.delete(*self.object_tree.get_children())
-        
-        # Update mark_text, mark_hatch, and mark_line counts
-        if hasattr(self, 'mark_text_count_label'):
-            mark_text_count = sum(1 for o in self.all_objects if o.category == "mark_text")
-            self.mark_text_count_label.config(text=f"Mark Text: {mark_text_count}")
+        self._update_mark_counts()
         
-        if hasattr(self, 'mark_hatch_count_label'):
-            mark_hatch_count = sum(1 for o in self.all_objects if o.category == "mark_hatch")
-            self.mark_hatch_count_label.config(text=f"Mark Hatch: {mark_hatch_count}")
-        
-        if hasattr(self, 'mark_line_count_label'):
-            mark_line_count = sum(1 for o in self.all_objects if o.category == "mark_line")
-            self.mark_line_count_label.config(text=f"Mark Line: {mark_line_count}")
-        
-        grouping = self.tree_grouping_var.get() if hasattr(self, 'tree_grouping_var') else "category"
+        grouping = self._grouping_mode
+        expanded_items = tree_state.get('expanded_items', set()) if tree_state else set()
         
+        # Build all rows first as (parent, iid, text, image, open), then insert
+        # them in one pass while the tree is unmapped
+        rows = []
         if grouping == "none":
             # Flat list - all objects
             for obj in self.all_objects:
-                self._add_tree_item(obj)
+                rows.extend(self._object_tree_rows(obj, ""))
         elif grouping == "category":
             # Group by category
             categories_used = {}
@@ -4627,12 +4870,10 @@ class SegmenterApp:
                 icon = self._get_tree_icon(cat_name)
                 # Check if this category should be expanded (from saved state)
                 cat_node_id = f"cat_{cat_name}"
-                should_expand = tree_state and cat_node_id in tree_state.get('expanded_items', set())
-                cat_node = self.object_tree.insert("", "end", iid=cat_node_id, 
-                                                   text=f"📁 {cat_name} ({len(categories_used[cat_name])})",
-                                                   image=icon, open=should_expand)
+                rows.append(("", cat_node_id, f"📁 {cat_name} ({len(categories_used[cat_name])})",
+                             icon, cat_node_id in expanded_items))
                 for obj in categories_used[cat_name]:
-                    self._add_tree_item(obj, parent=cat_node)
+                    rows.extend(self._object_tree_rows(obj, cat_node_id))
         elif grouping == "view":
             # Group by view type - each instance under its own view
             # Structure: view -> (obj, instance) pairs
@@ -4640,46 +4881,20 @@ class SegmenterApp:
             
             for obj in self.all_objects:
                 for inst in obj.instances:
-                    # Get view from instance attributes or view_type
-                    view_name = inst.attributes.view or inst.view_type or ""
-                    if not view_name:
-                        view_name = "Unassigned"
-                    
+                    view_name = self._get_instance_view_name(inst)
                     if view_name not in views_used:
                         views_used[view_name] = []
                     views_used[view_name].append((obj, inst))
             
-            # Sort views with "Unassigned" last
-            sorted_views = sorted([v for v in views_used.keys() if v != "Unassigned"])
-            if "Unassigned" in views_used:
-                sorted_views.append("Unassigned")
-            
-            for view_name in sorted_views:
+            for view_name in sorted(views_used.keys(), key=self._view_sort_key):
                 items = views_used[view_name]
-                view_node = self.object_tree.insert("", "end", iid=f"view_{view_name}",
-                                                    text=f"👁 {view_name} ({len(items)})",
-                                                    open=True)
-                
+                view_node = f"view_{view_name}"
+                rows.append(("", view_node, f"👁 {view_name} ({len(items)})", "", True))
                 for obj, inst in items:
-                    icon = self._get_tree_icon(obj.category)
-                    # Show object name with instance number if multiple instances
-                    if len(obj.instances) > 1:
-                        label = f"{obj.name} [Inst {inst.instance_num}]"
-                    else:
-                        label = obj.name
-                    
-                    # Create unique ID combining object and instance
-                    item_id = f"vi_{obj.object_id}_{inst.instance_id}"
-                    
-                    if len(inst.elements) == 1:
-                        self.object_tree.insert(view_node, "end", iid=item_id, text=label, image=icon)
-                    else:
-                        node = self.object_tree.insert(view_node, "end", iid=item_id,
-                                                       text=f"{label} ({len(inst.elements)} elem)", 
-                                                       image=icon, open=False)
-                        for i, elem in enumerate(inst.elements):
-                            self.object_tree.insert(node, "end", iid=f"ve_{elem.element_id}", 
-                                                    text=f"├ element {i+1}")
+                    rows.extend(self._view_tree_rows(obj, inst, view_node))
+        
+        self._insert_tree_rows(rows)
+        self._tree_item_sigs = {obj.object_id: self._tree_signature(obj) for obj in self.all_objects}
         
         # Restore expansion state if provided
         if preserve_state and tree_state:
@@ -4687,60 +4902,280 @@ class SegmenterApp:
         
         # Select the specified object if provided
         if select_object_id:
-            item_id = f"o_{select_object_id}"
-            if self.object_tree.exists(item_id):
-                self.object_tree.selection_set(item_id)
-                self.object_tree.see(item_id)
-                # Also expand parent category if grouped by category
-                if grouping == "category":
-                    parent = self.object_tree.parent(item_id)
-                    if parent and parent.startswith("cat_"):
-                        self.object_tree.item(parent, open=True)
+            self._select_tree_object(select_object_id)
     
-    def _get_tree_icon(self, category: str):
-        """Get or create icon for a category."""
-        cat = self.categories.get(category)
-        if cat:
-            key = f"{cat.color_rgb[0]}_{cat.color_rgb[1]}_{cat.color_rgb[2]}"
+    def _sync_tree(self, select_object_id: Optional[str] = None):
+        """
+        Bring the tree in line with all_objects, touching only what changed.
+        
+        Objects are diffed against the signatures recorded when their rows
+        were last built. Added, removed and changed objects go through the
+        incremental helpers; when most of the tree changed (open/load) a
+        full rebuild is cheaper and is used instead.
+        """
+        if self._suspend_redraws:
+            # Rows must stay put under an open inline editor; sync afterwards
+            self._tree_sync_pending = True
+            self._tree_sync_select = select_object_id or self._tree_sync_select
+            return
+        self._tree_sync_select = None
+        
+        old_sigs = self._tree_item_sigs
+        current = {obj.object_id: obj for obj in self.all_objects}
+        removed = [obj_id for obj_id in old_sigs if obj_id not in current]
+        added = []
+        changed = []
+        for obj_id, obj in current.items():
+            old_sig = old_sigs.get(obj_id)
+            if old_sig is None:
+                added.append(obj)
+            elif old_sig != self._tree_signature(obj):
+                changed.append(obj)
+        
+        num_changes = len(removed) + len(added) + len(changed)
+        if not old_sigs or num_changes > max(50, len(current) // 2):
+            self._update_tree(select_object_id=select_object_id)
+            return
+        
+        for obj_id in removed:
+            self._remove_tree_item(obj_id, category=old_sigs[obj_id][1])
+        for obj in changed:
+            self._update_tree_item(obj)
+        for obj in added:
+            self._add_tree_item(obj)
+        
+        if removed or added:
+            self._update_mark_counts()
+        if select_object_id:
+            self._select_tree_object(select_object_id)
+    
+    @staticmethod
+    def _tree_signature(obj: SegmentedObject) -> tuple:
+        """Everything an object's tree rows are built from (see _sync_tree)."""
+        return (obj.name, obj.category,
+                tuple((inst.instance_id, inst.instance_num, inst.attributes.view, inst.view_type,
+                       tuple(elem.element_id for elem in inst.elements))
+                      for inst in obj.instances))
+    
+    def _select_tree_object(self, object_id: str):
+        """Select and reveal an object's row, expanding its category group."""
+        item_id = f"o_{object_id}"
+        if self.object_tree.exists(item_id):
+            self.object_tree.selection_set(item_id)
+            self.object_tree.see(item_id)
+            # Also expand parent category if grouped by category
+            if self._grouping_mode == "category":
+                parent = self.object_tree.parent(item_id)
+                if parent and parent.startswith("cat_"):
+                    self.object_tree.item(parent, open=True)
+    
+    def _select_tree_objects(self, object_ids) -> list:
+        """Select several object rows with one selection_set call; returns the rows selected."""
+        tree = self.object_tree
+        wanted = [item_id for item_id in (f"o_{obj_id}" for obj_id in object_ids)
+                  if tree.exists(item_id)]
+        if wanted:
+            tree.selection_set(*wanted)
+            tree.see(wanted[0])
+        return wanted
+    
+    def _update_mark_counts(self):
+        """Update the mark_text, mark_hatch, and mark_line count labels."""
+        counts = {"mark_text": 0, "mark_hatch": 0, "mark_line": 0}
+        for obj in self.all_objects:
+            if obj.category in counts:
+                counts[obj.category] += 1
+        
+        if hasattr(self, 'mark_text_count_label'):
+            self.mark_text_count_label.config(text=f"Mark Text: {counts['mark_text']}")
+        if hasattr(self, 'mark_hatch_count_label'):
+            self.mark_hatch_count_label.config(text=f"Mark Hatch: {counts['mark_hatch']}")
+        if hasattr(self, 'mark_line_count_label'):
+            self.mark_line_count_label.config(text=f"Mark Line: {counts['mark_line']}")
+    
+    def _build_tree_icons(self):
+        """Precompute the tree icon for every category (called when categories change)."""
+        self.category_tree_icons = {}
+        for name, cat in self.categories.items():
+            key = tuple(cat.color_rgb)
             if key not in self.tree_icons:
-                img = Image.new('RGB', (12, 12), cat.color_rgb)
+                img = Image.new('RGB', (12, 12), key)
                 ImageDraw.Draw(img).rectangle([0, 0, 11, 11], outline=(0, 0, 0))
                 self.tree_icons[key] = ImageTk.PhotoImage(img)
-            return self.tree_icons[key]
-        return ""
+            self.category_tree_icons[name] = self.tree_icons[key]
     
-    def _add_tree_item(self, obj: SegmentedObject, parent: str = ""):
-        """Add a single object to the tree (incremental)."""
-        grouping = self.tree_grouping_var.get() if hasattr(self, 'tree_grouping_var') else "none"
+    def _get_tree_icon(self, category: str):
+        """Get icon for a category."""
+        icon = self.category_tree_icons.get(category)
+        if icon is None and category in self.categories:
+            # Category added without a refresh - build icons now
+            self._build_tree_icons()
+            icon = self.category_tree_icons.get(category)
+        return icon or ""
+    
+    def _object_tree_rows(self, obj: SegmentedObject, parent: str) -> list:
+        """Build (parent, iid, text, image, open) rows for an object and its children."""
+        icon = self._get_tree_icon(obj.category)
+        oid = f"o_{obj.object_id}"
+        
+        if obj.is_simple:
+            return [(parent, oid, obj.name, icon, False)]
+        
+        if not obj.has_multiple_instances:
+            rows = [(parent, oid, f"{obj.name} ({obj.element_count})", icon, False)]
+            for i, elem in enumerate(obj.instances[0].elements):
+                rows.append((oid, f"e_{elem.element_id}", f"├ element {i+1}", "", False))
+            return rows
+        
+        rows = [(parent, oid, f"{obj.name} ({len(obj.instances)} inst)", icon, False)]
+        for inst in obj.instances:
+            iid = f"i_{inst.instance_id}"
+            rows.append((oid, iid, f"Instance {inst.instance_num}", "", False))
+            for i, elem in enumerate(inst.elements):
+                rows.append((iid, f"e_{elem.element_id}", f"├ elem {i+1}", "", False))
+        return rows
+    
+    def _get_instance_view_name(self, inst: ObjectInstance) -> str:
+        """Get the view group an instance is listed under in view grouping."""
+        # Get view from instance attributes or view_type
+        return inst.attributes.view or inst.view_type or "Unassigned"
+    
+    @staticmethod
+    def _view_sort_key(view_name: str) -> tuple:
+        """Sort views alphabetically with "Unassigned" last."""
+        return (view_name == "Unassigned", view_name)
+    
+    def _view_tree_rows(self, obj: SegmentedObject, inst: ObjectInstance, parent: str) -> list:
+        """Build (parent, iid, text, image, open) rows for one instance in view grouping."""
         icon = self._get_tree_icon(obj.category)
+        # Show object name with instance number if multiple instances
+        if len(obj.instances) > 1:
+            label = f"{obj.name} [Inst {inst.instance_num}]"
+        else:
+            label = obj.name
+        
+        # Create unique ID combining object and instance
+        item_id = f"vi_{obj.object_id}_{inst.instance_id}"
+        
+        if len(inst.elements) == 1:
+            return [(parent, item_id, label, icon, False)]
+        rows = [(parent, item_id, f"{label} ({len(inst.elements)} elem)", icon, False)]
+        for i, elem in enumerate(inst.elements):
+            rows.append((item_id, f"ve_{elem.element_id}", f"├ element {i+1}", "", False))
+        return rows
+    
+    def _insert_tree_rows(self, rows: list):
+        """
+        Replace the tree contents with the given rows.
+        
+        The tree is unmapped and disconnected from its scrollbar while the
+        rows go in, so Tk doesn't re-layout or call back into Python on
+        every insert.
+        """
+        tree = self.object_tree
+        pack_info = tree.pack_info() if tree.winfo_manager() == "pack" else None
+        yscroll = tree.cget("yscrollcommand")
+        if pack_info:
+            tree.pack_forget()
+        tree.configure(yscrollcommand="")
+        try:
+            tree.delete(*tree.get_children())
+            self._tree_deferred_rows = {}
+            insert = tree.insert
+            for parent, iid, text, image, is_open in self._defer_closed_children(rows):
+                insert(parent, "end", iid=iid, text=text, image=image, open=is_open)
+        finally:
+            tree.configure(yscrollcommand=yscroll)
+            if pack_info:
+                pack_info.pop("in", None)
+                tree.pack(**pack_info)
+    
+    def _defer_closed_children(self, rows: list) -> list:
+        """
+        Hold back the children of collapsed object/instance rows.
+        
+        Each collapsed 'o_'/'vi_' row with children gets a single placeholder
+        child instead, so Tk still draws its expander; the real rows are kept
+        in _tree_deferred_rows until _populate_tree_item inserts them. Large
+        workspaces then only pay for the rows that are actually shown.
+        
+        Returns:
+            The rows to insert now
+        """
+        to_insert = []
+        closed = set()
+        held_by = {}  # Held-back iid -> collapsed row holding it
+        for row in rows:
+            parent, iid, text, image, is_open = row
+            holder = held_by.get(parent, parent if parent in closed else None)
+            if holder is not None:
+                held_by[iid] = holder
+                held = self._tree_deferred_rows.setdefault(holder, [])
+                if not held:
+                    to_insert.append((holder, f"ph_{holder}", "…", "", False))
+                held.append(row)
+                continue
+            to_insert.append(row)
+            if iid.startswith(("o_", "vi_")):
+                self._tree_deferred_rows.pop(iid, None)  # Row is being rebuilt
+                if not is_open:
+                    closed.add(iid)
+        return to_insert
+    
+    def _populate_tree_item(self, item_id: str):
+        """Insert the held-back children of a row (no-op once populated)."""
+        rows = self._tree_deferred_rows.pop(item_id, None)
+        if rows is None:
+            return
+        tree = self.object_tree
+        if tree.exists(f"ph_{item_id}"):
+            tree.delete(f"ph_{item_id}")
+        for row_parent, iid, text, image, is_open in rows:
+            tree.insert(row_parent, "end", iid=iid, text=text, image=image, open=is_open)
+    
+    def _reveal_tree_row(self, item_id: str) -> bool:
+        """Make sure a row is in the tree, inserting it if it is held back; returns whether it exists."""
+        tree = self.object_tree
+        while not tree.exists(item_id):
+            holder = next((h for h, rows in self._tree_deferred_rows.items()
+                           if any(row[1] == item_id for row in rows)), None)
+            if holder is None:
+                return False
+            self._populate_tree_item(holder)
+        return True
+    
+    def _expand_tree_item(self, item_id: str):
+        """Open a row, inserting its held-back children first (item(open=True) fires no <<TreeviewOpen>>)."""
+        self._populate_tree_item(item_id)
+        self.object_tree.item(item_id, open=True)
+    
+    def _on_tree_open(self, event):
+        """Fill in a row's children the first time it is expanded."""
+        # ttk focuses the row before generating <<TreeviewOpen>>
+        self._populate_tree_item(self.object_tree.focus())
+    
+    def _add_tree_item(self, obj: SegmentedObject, parent: str = "", index="end"):
+        """Add a single object to the tree (incremental)."""
+        grouping = self._grouping_mode
         
         # Handle grouping modes
         if grouping == "category" and not parent:
             # Ensure category group exists and add under it
             parent = self._ensure_category_group(obj.category)
         elif grouping == "view" and not parent:
-            # View grouping needs special handling - add to _update_tree instead
-            # For now, do a full rebuild
-            self._update_tree()
+            # One row per instance, each under its own view group
+            self._sync_view_tree_items(obj.object_id, obj)
+            self._tree_item_sigs[obj.object_id] = self._tree_signature(obj)
             return
         
         parent_node = parent if parent else ""
         
-        if obj.is_simple:
-            self.object_tree.insert(parent_node, "end", iid=f"o_{obj.object_id}", text=obj.name, image=icon)
-        elif not obj.has_multiple_instances:
-            node = self.object_tree.insert(parent_node, "end", iid=f"o_{obj.object_id}",
-                                           text=f"{obj.name} ({obj.element_count})", image=icon, open=False)
-            for i, elem in enumerate(obj.instances[0].elements):
-                self.object_tree.insert(node, "end", iid=f"e_{elem.element_id}", text=f"├ element {i+1}")
-        else:
-            node = self.object_tree.insert(parent_node, "end", iid=f"o_{obj.object_id}",
-                                           text=f"{obj.name} ({len(obj.instances)} inst)", image=icon, open=False)
-            for inst in obj.instances:
-                inode = self.object_tree.insert(node, "end", iid=f"i_{inst.instance_id}",
-                                                text=f"Instance {inst.instance_num}", open=False)
-                for i, elem in enumerate(inst.elements):
-                    self.object_tree.insert(inode, "end", iid=f"e_{elem.element_id}", text=f"├ elem {i+1}")
+        rows = self._defer_closed_children(self._object_tree_rows(obj, parent_node))
+        for row_parent, iid, text, image, is_open in rows:
+            # Only the object row itself can go somewhere other than the end
+            row_index = index if iid == rows[0][1] else "end"
+            self.object_tree.insert(row_parent, row_index, iid=iid, text=text, image=image, open=is_open)
+        self._tree_item_sigs[obj.object_id] = self._tree_signature(obj)
         
         # Update category group count if grouped by category
         if grouping == "category":
@@ -4758,6 +5193,83 @@ class SegmenterApp:
                                    text=f"📁 {cat_name} (0)", image=icon, open=True)
         return group_id
     
+    def _ensure_view_group(self, view_name: str) -> str:
+        """Ensure view group exists in tree (in sorted position) and return its ID."""
+        group_id = f"view_{view_name}"
+        
+        if not self.object_tree.exists(group_id):
+            # Keep the same order a full rebuild would produce
+            index = 0
+            sort_key = self._view_sort_key(view_name)
+            for child in self.object_tree.get_children():
+                if child.startswith("view_") and self._view_sort_key(child[5:]) < sort_key:
+                    index += 1
+            self.object_tree.insert("", index, iid=group_id,
+                                    text=f"👁 {view_name} (0)", open=True)
+        return group_id
+    
+    def _update_view_group_count(self, view_name: str):
+        """Update the count in a view group header, removing the group if empty."""
+        group_id = f"view_{view_name}"
+        
+        if self.object_tree.exists(group_id):
+            count = len(self.object_tree.get_children(group_id))
+            if count:
+                self.object_tree.item(group_id, text=f"👁 {view_name} ({count})")
+            else:
+                self.object_tree.delete(group_id)
+    
+    def _sync_view_tree_items(self, object_id: str, obj: Optional[SegmentedObject] = None):
+        """
+        Bring an object's rows in the view-grouped tree up to date.
+        
+        Existing instance rows are relabelled and moved between view groups
+        in place; rows for instances that no longer exist (all of them when
+        obj is None) are deleted. Only the view groups that were touched
+        get their counts refreshed.
+        """
+        tree = self.object_tree
+        prefix = f"vi_{object_id}_"
+        
+        # Current rows for this object, by item ID -> view group
+        existing = {}
+        for group_id in tree.get_children():
+            if group_id.startswith("view_"):
+                for child in tree.get_children(group_id):
+                    if child.startswith(prefix):
+                        existing[child] = group_id
+        
+        touched = set(existing.values())
+        instances = obj.instances if obj is not None else []
+        wanted = set()
+        for inst in instances:
+            view_node = self._ensure_view_group(self._get_instance_view_name(inst))
+            touched.add(view_node)
+            rows = self._view_tree_rows(obj, inst, view_node)
+            _, item_id, text, image, is_open = rows[0]
+            wanted.add(item_id)
+            
+            if item_id in existing:
+                # Keep the row (and whether it is expanded), replace its children
+                is_open = bool(tree.item(item_id, "open"))
+                rows[0] = (view_node, item_id, text, image, is_open)
+                tree.item(item_id, text=text, image=image)
+                tree.delete(*tree.get_children(item_id))
+                if existing[item_id] != view_node:
+                    tree.move(item_id, view_node, "end")
+            else:
+                tree.insert(view_node, "end", iid=item_id, text=text, image=image, open=is_open)
+            for row_parent, iid, row_text, row_image, row_open in self._defer_closed_children(rows)[1:]:
+                tree.insert(row_parent, "end", iid=iid, text=row_text, image=row_image, open=row_open)
+        
+        for item_id in existing:
+            if item_id not in wanted:
+                tree.delete(item_id)
+                self._tree_deferred_rows.pop(item_id, None)
+        
+        for group_id in touched:
+            self._update_view_group_count(group_id[5:])
+    
     def _update_category_group_count(self, category: str):
         """Update the count in a category group header."""
         group_id = f"cat_{category}"
@@ -4772,42 +5284,56 @@ class SegmenterApp:
     
     def _update_tree_item(self, obj: SegmentedObject):
         """Update a single object in the tree (incremental)."""
-        grouping = self.tree_grouping_var.get() if hasattr(self, 'tree_grouping_var') else "none"
+        grouping = self._grouping_mode
         
-        # For view grouping, do full rebuild (view can change)
+        # For view grouping, relabel/move this object's instance rows
         if grouping == "view":
-            self._update_tree()
+            self._sync_view_tree_items(obj.object_id, obj)
+            self._tree_item_sigs[obj.object_id] = self._tree_signature(obj)
             return
         
-        # Remove old item
-        try:
-            self.object_tree.delete(f"o_{obj.object_id}")
-        except:
-            pass
+        # Remove old item, remembering where it was
+        item_id = f"o_{obj.object_id}"
+        old_parent, index, was_open = None, "end", False
+        if self.object_tree.exists(item_id):
+            old_parent = self.object_tree.parent(item_id)
+            index = self.object_tree.index(item_id)
+            was_open = bool(self.object_tree.item(item_id, "open"))
+            self.object_tree.delete(item_id)
         
         # Determine parent for grouped modes
         parent = ""
         if grouping == "category":
             parent = self._ensure_category_group(obj.category)
+        if old_parent != parent:
+            index = "end"
         
-        # Re-add with updated state
-        self._add_tree_item(obj, parent=parent)
+        # Re-add with updated state, in the same place
+        self._add_tree_item(obj, parent=parent, index=index)
+        if was_open:
+            self._populate_tree_item(item_id)
+            self.object_tree.item(item_id, open=True)
     
-    def _remove_tree_item(self, object_id: str):
+    def _remove_tree_item(self, object_id: str, category: Optional[str] = None):
         """Remove a single object from the tree."""
-        grouping = self.tree_grouping_var.get() if hasattr(self, 'tree_grouping_var') else "none"
+        grouping = self._grouping_mode
+        self._tree_item_sigs.pop(object_id, None)
         
         # Find the object to get its category before deletion
-        category = None
-        for obj in self.all_objects:
-            if obj.object_id == object_id:
+        if category is None:
+            obj = self._get_object_by_id(object_id)
+            if obj is not None:
                 category = obj.category
-                break
+        
+        if grouping == "view":
+            self._sync_view_tree_items(object_id)
+            return
         
         try:
             self.object_tree.delete(f"o_{object_id}")
         except:
             pass
+        self._tree_deferred_rows.pop(f"o_{object_id}", None)
         
         # Update category group count
         if grouping == "category" and category:
@@ -4818,7 +5344,35 @@ class SegmenterApp:
                 if not self.object_tree.get_children(group_id):
                     self.object_tree.delete(group_id)
     
+    def _update_selected_categories(self):
+        """Cache the categories of the selected objects (for merge eligibility)."""
+        categories = set()
+        for obj_id in self.selected_object_ids:
+            obj = self._get_object_by_id(obj_id)
+            if obj:
+                categories.add(obj.category)
+        self._selected_categories = categories
+        self._selected_categories_ids = frozenset(self.selected_object_ids)
+    
     def _on_tree_select(self, event):
+        """
+        Handle tree selection changes.
+        
+        <<TreeviewSelect>> fires once per step during keyboard traversal or
+        range selection, so events are coalesced into a single idle pass.
+        Direct calls (event=None) apply the selection immediately.
+        """
+        if event is None:
+            self._apply_tree_selection()
+            return
+        if self._tree_select_pending:
+            return
+        self._tree_select_pending = True
+        self.root.after_idle(self._apply_tree_selection)
+    
+    def _apply_tree_selection(self):
+        """Sync selection state, page and display with the tree selection."""
+        self._tree_select_pending = False
         selection = self.object_tree.selection()
         self.selected_object_ids.clear()
         self.selected_instance_ids.clear()
@@ -4847,8 +5401,10 @@ class SegmenterApp:
                 # Group header - select all children
                 pass  # Could expand to select all in group
         
+        self._update_selected_categories()
+        
         # Only auto-switch pages if the checkbox is enabled
-        if getattr(self, 'auto_show_image_var', None) and self.auto_show_image_var.get():
+        if self._auto_show_image:
             # Determine which page to switch to based on selection
             target_page_id = self._get_page_for_selection()
             if target_page_id and target_page_id != self.current_page_id:
@@ -4863,7 +5419,16 @@ class SegmenterApp:
     def _on_view_changed(self, event=None):
         """Handle current view combo change."""
         # Just store the value - it will be used when creating new objects
-        pass
+        self._current_view = self.current_view_var.get()
+    
+    def _on_grouping_changed(self, event=None):
+        """Handle tree grouping combo change."""
+        self._grouping_mode = self.tree_grouping_var.get()
+        self._update_tree()
+    
+    def _on_auto_show_image_changed(self):
+        """Handle the 'Show image on select' checkbox."""
+        self._auto_show_image = bool(self.auto_show_image_var.get())
     
     def _update_view_from_selection(self):
         """Update current view combo based on selected object."""
@@ -4885,8 +5450,9 @@ class SegmenterApp:
         # Only update if there's a single consistent view
         if len(views) == 1:
             view = views.pop()
-            if view and hasattr(self, 'current_view_var'):
+            if view:
                 self.current_view_var.set(view)
+                self._current_view = view
     
     def _get_page_for_selection(self) -> Optional[str]:
         """
@@ -4897,18 +5463,17 @@ class SegmenterApp:
         
         # Check selected instances
         for inst_id in self.selected_instance_ids:
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    if inst.instance_id == inst_id and inst.page_id:
-                        page_ids.add(inst.page_id)
+            page_ids.update(inst.page_id for obj, inst in self._find_instance_owners(inst_id)
+                            if inst.page_id)
+            if len(page_ids) > 1:
+                return None
         
         # Check selected elements
         for elem_id in self.selected_element_ids:
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    for elem in inst.elements:
-                        if elem.element_id == elem_id and inst.page_id:
-                            page_ids.add(inst.page_id)
+            page_ids.update(inst.page_id for obj, inst, elem in self._find_element_owners(elem_id)
+                            if inst.page_id)
+            if len(page_ids) > 1:
+                return None
         
         # Check selected objects - use first instance's page
         for obj_id in self.selected_object_ids:
@@ -4916,11 +5481,12 @@ class SegmenterApp:
             if obj and obj.instances:
                 # Check if all instances are on same page
                 obj_pages = set(inst.page_id for inst in obj.instances if inst.page_id)
-                if len(obj_pages) == 1:
-                    page_ids.update(obj_pages)
-                elif len(obj_pages) > 1:
+                if len(obj_pages) > 1:
                     # Object spans multiple pages - don't switch
                     return None
+                page_ids.update(obj_pages)
+                if len(page_ids) > 1:
+                    return None
         
         # Return page if exactly one
         if len(page_ids) == 1:
@@ -4939,18 +5505,29 @@ class SegmenterApp:
     
     def _get_object_by_id(self, obj_id: str) -> Optional[SegmentedObject]:
         """Get object by ID from global list."""
+        obj = self._object_by_id.get(obj_id)
+        if obj is not None:
+            return obj
+        # Fall back to a scan in case an object was added without being indexed
         for obj in self.all_objects:
             if obj.object_id == obj_id:
+                self._index_object(obj)
                 return obj
         return None
     
     def _get_element_at_point(self, page_id: str, x: int, y: int):
         """Find element at point on a specific page."""
-        for obj in self.all_objects:
+        for obj in self._objects_by_page.get(page_id, {}).values():
             for inst in obj.instances:
                 if inst.page_id == page_id:
                     for elem in inst.elements:
-                        if elem.mask is not None and elem.mask[y, x] > 0:
+                        mask = elem.mask
+                        if mask is None:
+                            continue
+                        # Cheap bbox reject before touching the mask
+                        bbox = get_mask_bbox(mask)
+                        if (bbox is not None and bbox[0] <= x < bbox[2] and
+                                bbox[1] <= y < bbox[3] and mask[y, x] > 0):
                             return (obj, inst, elem)
         return None
     
@@ -4967,19 +5544,14 @@ class SegmenterApp:
         # Instance selected - find parent object
         if self.selected_instance_ids:
             inst_id = next(iter(self.selected_instance_ids))
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    if inst.instance_id == inst_id:
-                        return obj.object_id
+            for obj, _ in self._find_instance_owners(inst_id):
+                return obj.object_id
         
         # Element selected - find parent object
         if self.selected_element_ids:
             elem_id = next(iter(self.selected_element_ids))
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    for elem in inst.elements:
-                        if elem.element_id == elem_id:
-                            return obj.object_id
+            for obj, _, _ in self._find_element_owners(elem_id):
+                return obj.object_id
         
         return None
     
@@ -5018,12 +5590,10 @@ class SegmenterApp:
         # Check if selected objects are same category (for merge)
         same_category = False
         if num_objects >= 2:
-            categories = set()
-            for obj_id in self.selected_object_ids:
-                obj = self._get_object_by_id(obj_id)
-                if obj:
-                    categories.add(obj.category)
-            same_category = len(categories) == 1
+            if self._selected_categories_ids != self.selected_object_ids:
+                # Selection was changed outside the tree
+                self._update_selected_categories()
+            same_category = len(self._selected_categories) == 1
         
         # Object actions
         if num_objects >= 1:
@@ -5069,7 +5639,7 @@ class SegmenterApp:
         
         # Expand/collapse
         if item:
-            menu.add_command(label="Expand", command=lambda: self.object_tree.item(item, open=True))
+            menu.add_command(label="Expand", command=lambda: self._expand_tree_item(item))
             menu.add_command(label="Collapse", command=lambda: self.object_tree.item(item, open=False))
             menu.add_separator()
         
@@ -5090,23 +5660,25 @@ class SegmenterApp:
     
     def _expand_all_tree(self):
         """Expand all tree items."""
-        def expand_children(item):
-            self.object_tree.item(item, open=True)
-            for child in self.object_tree.get_children(item):
-                expand_children(child)
-        
-        for item in self.object_tree.get_children():
-            expand_children(item)
+        self._set_all_tree_items_open(True)
     
     def _collapse_all_tree(self):
         """Collapse all tree items."""
-        def collapse_children(item):
-            for child in self.object_tree.get_children(item):
-                collapse_children(child)
-            self.object_tree.item(item, open=False)
-        
-        for item in self.object_tree.get_children():
-            collapse_children(item)
+        self._set_all_tree_items_open(False)
+    
+    def _set_all_tree_items_open(self, is_open: bool):
+        """Open or close every tree node that has children (iteratively)."""
+        tree = self.object_tree
+        stack = list(tree.get_children())
+        while stack:
+            item = stack.pop()
+            if is_open:
+                self._populate_tree_item(item)
+            children = tree.get_children(item)
+            # Leaves (most element rows) have nothing to show or hide
+            if children:
+                tree.item(item, open=is_open)
+                stack.extend(children)
     
     def _debug_redraw_selected(self):
         """Debug: Redraw selected object with detailed logging."""
@@ -5277,15 +5849,15 @@ class SegmenterApp:
             )
             inst.instance_num = 1
             new_obj.instances.append(inst)
-            self.all_objects.append(new_obj)
+            self._add_object(new_obj)
         
         # Renumber remaining instances
         self._renumber_instances(obj)
+        self._reindex_object(obj)
         
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
-        self._update_tree()
-        self._update_display()
+        self._request_refresh()
+        self._sync_tree()
         self.status_var.set(f"Separated {len(instances_to_separate)} instances")
     
     def _on_tree_double_click(self, event):
@@ -5333,51 +5905,59 @@ class SegmenterApp:
         
         x, y, width, height = bbox
         
-        # Destroy any existing edit entry
-        if hasattr(self, '_inline_entry') and self._inline_entry:
-            try:
-                self._inline_entry.destroy()
-            except:
-                pass
-        
-        # Create entry widget for editing
-        self._inline_entry = tk.Entry(self.object_tree, font=("Segoe UI", 9),
-                                      bg=self.theme.get("input_bg", "#3c3c3c"),
-                                      fg=self.theme.get("input_fg", "#cccccc"),
-                                      insertbackground=self.theme.get("fg", "#cccccc"),
-                                      relief="solid", borderwidth=1)
-        self._inline_entry.insert(0, obj.name)
-        self._inline_entry.select_range(0, tk.END)
-        self._inline_entry.place(x=x + 20, y=y, width=max(width - 25, 100), height=height)
-        self._inline_entry.focus_set()
-        
-        def finish_edit(event=None):
-            if not hasattr(self, '_inline_entry') or not self._inline_entry:
-                return
-            try:
-                new_name = self._inline_entry.get().strip()
-                if new_name and new_name != obj.name:
-                    obj.name = new_name
-                    self.workspace_modified = True
-                    self.renderer.invalidate_cache()
-                    self._update_tree()
-                    self._update_display()
-                self._inline_entry.destroy()
-                self._inline_entry = None
-            except:
-                pass
-        
-        def cancel_edit(event=None):
-            if hasattr(self, '_inline_entry') and self._inline_entry:
-                try:
-                    self._inline_entry.destroy()
-                    self._inline_entry = None
-                except:
-                    pass
-        
-        self._inline_entry.bind("<Return>", finish_edit)
-        self._inline_entry.bind("<Escape>", cancel_edit)
-        self._inline_entry.bind("<FocusOut>", finish_edit)
+        # Reuse one Entry for every edit instead of building a widget each time
+        entry = self._inline_entry
+        if entry is None:
+            entry = tk.Entry(self.object_tree, font=("Segoe UI", 9),
+                             relief="solid", borderwidth=1)
+            entry.bind("<Return>", self._finish_inline_edit)
+            entry.bind("<Escape>", self._cancel_inline_edit)
+            entry.bind("<FocusOut>", self._finish_inline_edit)
+            self._inline_entry = entry
+        entry.config(bg=self.theme.get("input_bg", "#3c3c3c"),
+                     fg=self.theme.get("input_fg", "#cccccc"),
+                     insertbackground=self.theme.get("fg", "#cccccc"))
+        
+        if self._inline_edit_obj is None:
+            self._suspend_redraws += 1  # Resumed by _hide_inline_entry
+        self._inline_edit_obj = obj
+        entry.delete(0, tk.END)
+        entry.insert(0, obj.name)
+        entry.select_range(0, tk.END)
+        entry.place(x=x + 20, y=y, width=max(width - 25, 100), height=height)
+        entry.focus_set()
+    
+    def _finish_inline_edit(self, event=None):
+        """Apply the inline rename (Return / focus lost)."""
+        obj = self._inline_edit_obj
+        if obj is None or self._inline_entry is None:
+            return
+        try:
+            new_name = self._inline_entry.get().strip()
+            if new_name and new_name != obj.name:
+                obj.name = new_name
+                self.workspace_modified = True
+                self._refresh_labels()
+                self._sync_tree()
+        except:
+            pass
+        self._hide_inline_entry()
+    
+    def _cancel_inline_edit(self, event=None):
+        """Abandon the inline rename (Escape)."""
+        if self._inline_edit_obj is not None:
+            self._hide_inline_entry()
+    
+    def _hide_inline_entry(self):
+        """Hide the inline Entry until the next edit."""
+        # Cleared first: hiding moves focus, which fires <FocusOut> again
+        was_editing = self._inline_edit_obj is not None
+        self._inline_edit_obj = None
+        if self._inline_entry is not None:
+            self._inline_entry.place_forget()
+            self.object_tree.focus_set()
+        if was_editing:
+            self._resume_redraws()
     
     # Object operations
     def _rename_object(self):
@@ -5397,6 +5977,7 @@ class SegmenterApp:
             obj.name = name
             self.workspace_modified = True
             self._update_tree_item(obj)  # Incremental update
+            self._refresh_labels()
     
     def _add_instance(self):
         """Add a new empty instance to the selected object without prompting."""
@@ -5425,6 +6006,7 @@ class SegmenterApp:
         
         # Add instance silently - no dialog needed
         inst = obj.add_instance("", page.tab_id)
+        self._index_object(obj)
         self.workspace_modified = True
         # Note: empty instance doesn't need cache invalidate - no visual change
         self._update_tree_item(obj)  # Incremental update
@@ -5435,17 +6017,24 @@ class SegmenterApp:
         self.selected_element_ids.clear()
         
         # Select in tree view
-        tree_id = f"o_{obj.object_id}"
-        if self.object_tree.exists(tree_id):
-            self.object_tree.selection_set(tree_id)
+        self._select_tree_objects([obj.object_id])
         
         self._update_display()
         self.status_var.set(f"Instance {inst.instance_num} added to {obj.name} - now add elements")
     
-    def _renumber_instances(self, obj: SegmentedObject):
-        """Ensure instances have sequential numbering starting from 1."""
-        for idx, inst in enumerate(obj.instances):
-            inst.instance_num = idx + 1
+    def _renumber_instances(self, obj: SegmentedObject) -> bool:
+        """
+        Ensure instances have sequential numbering starting from 1.
+        
+        Returns:
+            True if any instance number had to change
+        """
+        changed = False
+        for num, inst in enumerate(obj.instances, 1):
+            if inst.instance_num != num:
+                inst.instance_num = num
+                changed = True
+        return changed
     
     def _move_object_to_page(self):
         """Move selected object(s) to a different page."""
@@ -5506,13 +6095,14 @@ class SegmenterApp:
                                 elem.points = [(int(px * scale_x), int(py * scale_y)) for px, py in elem.points]
                     
                     moved_count += 1
+            self._reindex_object(obj)
         
         if moved_count > 0:
             self.workspace_modified = True
             self.renderer.invalidate_cache()
             
             # Update tree to reflect changes
-            self._update_tree()
+            self._sync_tree()
             
             # Switch to target page to show moved objects
             self._switch_to_page(target_page_id)
@@ -5560,36 +6150,37 @@ class SegmenterApp:
         dst_h, dst_w = target_page.original_image.shape[:2]
         needs_resize = (src_h != dst_h) or (src_w != dst_w)
         
-        # Move selected instances to the target page
+        # Move selected instances to the target page. Owners are looked up
+        # before anything moves, since reindexing invalidates the owner maps.
+        owners = [pair for inst_id in self.selected_instance_ids
+                  for pair in self._find_instance_owners(inst_id)]
         moved_count = 0
-        for inst_id in self.selected_instance_ids:
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    if inst.instance_id == inst_id and inst.page_id == current_page.tab_id:
-                        # Update page ID
-                        inst.page_id = target_page_id
-                        
-                        # Resize masks if pages have different dimensions
-                        if needs_resize:
-                            for elem in inst.elements:
-                                if elem.mask is not None and elem.mask.shape == (src_h, src_w):
-                                    # Resize mask to fit target page
-                                    elem.mask = cv2.resize(elem.mask, (dst_w, dst_h), interpolation=cv2.INTER_NEAREST)
-                                # Also adjust points if they exist
-                                if elem.points:
-                                    scale_x = dst_w / src_w
-                                    scale_y = dst_h / src_h
-                                    elem.points = [(int(px * scale_x), int(py * scale_y)) for px, py in elem.points]
-                        
-                        moved_count += 1
-                        break
+        for obj, inst in owners:
+            if inst.page_id == current_page.tab_id:
+                # Update page ID
+                inst.page_id = target_page_id
+                
+                # Resize masks if pages have different dimensions
+                if needs_resize:
+                    for elem in inst.elements:
+                        if elem.mask is not None and elem.mask.shape == (src_h, src_w):
+                            # Resize mask to fit target page
+                            elem.mask = cv2.resize(elem.mask, (dst_w, dst_h), interpolation=cv2.INTER_NEAREST)
+                        # Also adjust points if they exist
+                        if elem.points:
+                            scale_x = dst_w / src_w
+                            scale_y = dst_h / src_h
+                            elem.points = [(int(px * scale_x), int(py * scale_y)) for px, py in elem.points]
+                
+                moved_count += 1
+                self._reindex_object(obj)
         
         if moved_count > 0:
             self.workspace_modified = True
             self.renderer.invalidate_cache()
             
             # Update tree to reflect changes
-            self._update_tree()
+            self._sync_tree()
             
             # Switch to target page to show moved instances
             self._switch_to_page(target_page_id)
@@ -5727,15 +6318,15 @@ class SegmenterApp:
         if target_inst is None:
             # Create new instance on current page
             target_inst = obj.add_instance("", page.tab_id)
+            self._index_object(obj)
             self._renumber_instances(obj)
         
         # Add element to instance
         target_inst.elements.append(elem)
         
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
+        self._request_refresh()
         self._update_tree_item(obj)
-        self._update_display()
         self.status_var.set(f"Added perimeter line to {obj.name}")
     
     def _edit_attributes(self):
@@ -5752,15 +6343,11 @@ class SegmenterApp:
         # Priority: selected instance > selected object's first instance
         if self.selected_instance_ids:
             inst_id = next(iter(self.selected_instance_ids))
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    if inst.instance_id == inst_id:
-                        target_inst = inst
-                        target_obj = obj
-                        obj_name = obj.name
-                        break
-                if target_inst:
-                    break
+            for obj, inst in self._find_instance_owners(inst_id):
+                target_inst = inst
+                target_obj = obj
+                obj_name = obj.name
+                break
         elif self.selected_object_ids:
             obj_id = next(iter(self.selected_object_ids))
             target_obj = self._get_object_by_id(obj_id)
@@ -5779,11 +6366,11 @@ class SegmenterApp:
             # Check if name was changed
             if hasattr(dialog, 'new_name') and dialog.new_name and dialog.new_name != target_obj.name:
                 target_obj.name = dialog.new_name
-                # Invalidate cache since name label will change
-                self.renderer.invalidate_cache()
+                # Only the name label changes
+                self._refresh_labels()
             self.workspace_modified = True
-            self._update_tree()
-            self._update_display()
+            # Only this object's rows can change (name, or view grouping)
+            self._update_tree_item(target_obj)
     
     def _duplicate_object(self):
         """Create a duplicate of the selected object."""
@@ -5814,7 +6401,6 @@ class SegmenterApp:
         )
         
         # Copy all instances
-        total_elements = 0
         for inst in obj.instances:
             new_inst = ObjectInstance(
                 instance_num=inst.instance_num,
@@ -5822,18 +6408,19 @@ class SegmenterApp:
                 view_type=getattr(inst, 'view_type', ''),
                 attributes=copy.deepcopy(inst.attributes) if hasattr(inst, 'attributes') and inst.attributes else None
             )
-            # Copy elements with new IDs
+            # Copy elements with new IDs. Masks are shared rather than copied:
+            # every edit replaces elem.mask with a new array instead of writing
+            # into it, so the copy and the original can't affect each other.
             for elem in inst.elements:
                 new_elem = SegmentElement(
                     category=elem.category,
                     mode=elem.mode,
-                    mask=elem.mask.copy() if elem.mask is not None else None,
+                    mask=elem.mask,
                     points=elem.points.copy() if elem.points else [],
                     color=elem.color,
                     label_position=elem.label_position
                 )
                 new_inst.elements.append(new_elem)
-                total_elements += 1
             
             # Only add instance if it has elements
             if new_inst.elements:
@@ -5844,22 +6431,46 @@ class SegmenterApp:
             messagebox.showwarning("Error", "Object has no elements to duplicate")
             return
         
-        self.all_objects.append(new_obj)
+        self._add_object(new_obj)
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
+        self._request_refresh()
         self._add_tree_item(new_obj)
         
         # Select the new object
         self.selected_object_ids = {new_obj.object_id}
         self.selected_instance_ids.clear()
         self.selected_element_ids.clear()
-        self._update_tree()
-        self._update_display()
+        self._sync_tree()
+        self._select_tree_objects(self.selected_object_ids)
         
         # Start move mode so user can position the duplicate
         self._start_move_objects()
         self.status_var.set(f"Duplicated {obj.name} - Click and drag to position, or press Escape to cancel")
     
+    def _poll_future(self, future, callback, on_wait=None):
+        """
+        Call callback(result) on the Tk thread once a background job finishes.
+        
+        Args:
+            on_wait: Optional callable run on each poll while the job is
+                still running (e.g. to show progress)
+        """
+        if not future.done():
+            if on_wait is not None:
+                on_wait()
+            self.root.after(10, self._poll_future, future, callback, on_wait)
+            return
+        if future.cancelled():
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"ERROR: Background task failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return
+        callback(result)
+    
     def _duplicate_selected(self):
         """Duplicate selected objects or elements."""
         if len(self.selected_object_ids) > 0:
@@ -5880,13 +6491,9 @@ class SegmenterApp:
             return
         
         # Find all selected elements
-        selected_elements = []
-        for obj in self.all_objects:
-            for inst in obj.instances:
-                if inst.page_id == page.tab_id:
-                    for elem in inst.elements:
-                        if elem.element_id in self.selected_element_ids:
-                            selected_elements.append((obj, inst, elem))
+        selected_elements = [owner for elem_id in self.selected_element_ids
+                             for owner in self._find_element_owners(elem_id)
+                             if owner[1].page_id == page.tab_id]
         
         if not selected_elements:
             return
@@ -5894,12 +6501,13 @@ class SegmenterApp:
         # Create new objects for each selected element
         new_objects = []
         for obj, inst, elem in selected_elements:
-            # Create new element with copied mask
+            # Create new element sharing the mask (masks are replaced, never
+            # edited in place - see _duplicate_object)
             new_elem = SegmentElement(
                 category=elem.category,
                 mode=elem.mode,
                 points=elem.points.copy() if elem.points else [],
-                mask=elem.mask.copy() if elem.mask is not None else None,
+                mask=elem.mask,
                 color=elem.color,
                 label_position=elem.label_position
             )
@@ -5920,10 +6528,10 @@ class SegmenterApp:
             )
             
             new_objects.append(new_obj)
-            self.all_objects.append(new_obj)
+            self._add_object(new_obj)
         
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
+        self._request_refresh()
         for obj in new_objects:
             self._add_tree_item(obj)
         
@@ -5932,8 +6540,8 @@ class SegmenterApp:
             self.selected_object_ids = {obj.object_id for obj in new_objects}
             self.selected_instance_ids.clear()
             self.selected_element_ids.clear()
-            self._update_tree()
-            self._update_display()
+            self._sync_tree()
+            self._select_tree_objects(self.selected_object_ids)
             
             # Start move mode so user can position the duplicates
             self._start_move_objects()
@@ -5987,7 +6595,7 @@ class SegmenterApp:
         
         self.is_moving_pixels = True
         page = self._get_current_page()
-        if page and hasattr(page, 'canvas'):
+        if page and page.canvas is not None:
             page.canvas.config(cursor="fleur")
         self.status_var.set("Click and drag to move selected pixels. Right-click to cancel.")
     
@@ -6094,15 +6702,13 @@ class SegmenterApp:
         combined_mask = None
         h, w = page.original_image.shape[:2]
         
-        for obj in self.all_objects:
-            for inst in obj.instances:
+        for elem_id in self.selected_element_ids:
+            for _, inst, elem in self._find_element_owners(elem_id):
                 if inst.page_id == page.tab_id:
-                    for elem in inst.elements:
-                        if elem.element_id in self.selected_element_ids:
-                            if elem.mask is not None and elem.mask.shape == (h, w):
-                                if combined_mask is None:
-                                    combined_mask = np.zeros((h, w), dtype=np.uint8)
-                                combined_mask = np.maximum(combined_mask, elem.mask)
+                    if elem.mask is not None and elem.mask.shape == (h, w):
+                        if combined_mask is None:
+                            combined_mask = np.zeros((h, w), dtype=np.uint8)
+                        combined_mask = np.maximum(combined_mask, elem.mask)
         
         if combined_mask is None or np.sum(combined_mask > 0) == 0:
             return
@@ -6123,15 +6729,22 @@ class SegmenterApp:
                 points = []
             self._add_manual_line_region(page, combined_mask, points, "element_selection")
         
-        # Remove the elements from their objects (they're now hidden)
-        for obj in self.all_objects[:]:  # Copy list to avoid modification during iteration
-            for inst in obj.instances[:]:
+        # Remove the elements from their objects (they're now hidden), dropping
+        # emptied instances/objects in the same pass
+        remaining = []
+        for obj in self.all_objects:
+            kept = []
+            for inst in obj.instances:
                 if inst.page_id == page.tab_id:
                     inst.elements = [e for e in inst.elements if e.element_id not in self.selected_element_ids]
                     if not inst.elements:
-                        obj.instances.remove(inst)
-            if not obj.instances:
-                self.all_objects.remove(obj)
+                        continue
+                kept.append(inst)
+            obj.instances = kept
+            if obj.instances:
+                remaining.append(obj)
+        self.all_objects = remaining
+        self._rebuild_objects_by_page()
         
         # Clear selections
         self.selected_element_ids.clear()
@@ -6139,9 +6752,8 @@ class SegmenterApp:
         self.selected_instance_ids.clear()
         
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
-        self._update_tree()
-        self._update_display()
+        self._request_refresh()
+        self._sync_tree()
         self.status_var.set(f"Added elements to {category}")
     
     def _duplicate_pixel_selection(self):
@@ -6176,19 +6788,18 @@ class SegmenterApp:
         
         # Create new object manually so we can select it
         prefix = cat.prefix if cat else cat_name[0].upper()
-        count = sum(1 for o in self.all_objects if o.category == cat_name) + 1
+        count = self._category_counters.get(cat_name, 0) + 1
         
-        current_view = getattr(self, 'current_view_var', None)
-        view_type = current_view.get() if current_view else ""
+        view_type = self._current_view
         
         new_obj = SegmentedObject(name=f"{prefix}{count}", category=cat_name)
         inst = ObjectInstance(instance_num=1, page_id=page.tab_id, view_type=view_type)
         inst.elements.append(elem)
         new_obj.instances.append(inst)
-        self.all_objects.append(new_obj)
+        self._add_object(new_obj)
         
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
+        self._request_refresh()
         self._add_tree_item(new_obj)
         
         # Clear pixel selection
@@ -6198,8 +6809,8 @@ class SegmenterApp:
         self.selected_object_ids = {new_obj.object_id}
         self.selected_instance_ids.clear()
         self.selected_element_ids.clear()
-        self._update_tree()
-        self._update_display()
+        self._sync_tree()
+        self._select_tree_objects(self.selected_object_ids)
         
         # Start move mode so user can position the duplicate
         self._start_move_objects()
@@ -6219,7 +6830,7 @@ class SegmenterApp:
         self.object_move_offset = None
         
         page = self._get_current_page()
-        if page and hasattr(page, 'canvas'):
+        if page and page.canvas is not None:
             page.canvas.config(cursor="fleur")
             # Focus the canvas so it receives mouse events
             page.canvas.focus_set()
@@ -6264,26 +6875,22 @@ class SegmenterApp:
         
         if self.selected_instance_ids:
             for inst_id in self.selected_instance_ids:
-                for obj in self.all_objects:
-                    for inst in obj.instances:
-                        if inst.instance_id == inst_id and inst.page_id == page.tab_id:
-                            for elem in inst.elements:
-                                if elem.mask is not None and elem.mask.shape == (h, w):
-                                    original_masks.append(elem.mask.copy())
-                                    elements_to_move.append(elem)
-                                    moved_count += 1
+                for _, inst in self._find_instance_owners(inst_id):
+                    if inst.page_id == page.tab_id:
+                        for elem in inst.elements:
+                            if elem.mask is not None and elem.mask.shape == (h, w):
+                                original_masks.append(elem.mask.copy())
+                                elements_to_move.append(elem)
+                                moved_count += 1
         
         if self.selected_element_ids:
             for elem_id in self.selected_element_ids:
-                for obj in self.all_objects:
-                    for inst in obj.instances:
-                        if inst.page_id == page.tab_id:
-                            for elem in inst.elements:
-                                if elem.element_id == elem_id:
-                                    if elem.mask is not None and elem.mask.shape == (h, w):
-                                        original_masks.append(elem.mask.copy())
-                                        elements_to_move.append(elem)
-                                        moved_count += 1
+                for _, inst, elem in self._find_element_owners(elem_id):
+                    if inst.page_id == page.tab_id:
+                        if elem.mask is not None and elem.mask.shape == (h, w):
+                            original_masks.append(elem.mask.copy())
+                            elements_to_move.append(elem)
+                            moved_count += 1
         
         if moved_count > 0 and original_masks:
             # Actually move pixels in the original image
@@ -6309,10 +6916,8 @@ class SegmenterApp:
                 moved_object_ids.update(self.selected_object_ids)
             if self.selected_instance_ids:
                 for inst_id in self.selected_instance_ids:
-                    for obj in self.all_objects:
-                        for inst in obj.instances:
-                            if inst.instance_id == inst_id:
-                                moved_object_ids.add(obj.object_id)
+                    for obj, _ in self._find_instance_owners(inst_id):
+                        moved_object_ids.add(obj.object_id)
             if self.selected_element_ids:
                 moved_element_ids.update(self.selected_element_ids)
             
@@ -6462,25 +7067,25 @@ class SegmenterApp:
             
             h, w = page.original_image.shape[:2]
             
-            # Combine all masks for this page
+            # Combine all masks for this page in place. A mask can be collected
+            # more than once (object and its element both selected), so each
+            # array is only merged once.
             combined_mask = np.zeros((h, w), dtype=np.uint8)
+            seen_masks = set()
             for mask in masks:
-                if mask is not None and mask.shape == (h, w):
-                    combined_mask = np.maximum(combined_mask, mask)
-            
-            # Set pixels to white where mask is active
-            if np.any(combined_mask > 0):
-                if len(page.original_image.shape) == 3:
-                    # BGR image
-                    mask_3channel = cv2.cvtColor(combined_mask, cv2.COLOR_GRAY2BGR)
-                    page.original_image[mask_3channel > 0] = [255, 255, 255]
-                else:
-                    # Grayscale image
-                    page.original_image[combined_mask > 0] = 255
+                if mask is not None and mask.shape == (h, w) and id(mask) not in seen_masks:
+                    seen_masks.add(id(mask))
+                    np.maximum(combined_mask, mask, out=combined_mask, casting='unsafe')
+            
+            # Set pixels to white where mask is active (a 2D boolean index
+            # covers every channel of a BGR image)
+            active = combined_mask > 0
+            if active.any():
+                page.original_image[active] = 255
                 
                 # Invalidate cache for this page since original_image changed
                 self.renderer.invalidate_cache()
-                print(f"DEBUG: Deleted pixels from page {page_id} (mask size: {np.sum(combined_mask > 0)} pixels)")
+                print(f"DEBUG: Deleted pixels from page {page_id} (mask size: {np.count_nonzero(active)} pixels)")
     
     def _delete_selected(self):
         # First, collect all objects/elements that will be deleted and their masks
@@ -6497,18 +7102,11 @@ class SegmenterApp:
         
         # Collect instances to delete
         for inst_id in self.selected_instance_ids:
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    if inst.instance_id == inst_id:
-                        instances_to_delete.append((obj, inst))
+            instances_to_delete.extend(self._find_instance_owners(inst_id))
         
         # Collect elements to delete
         for elem_id in self.selected_element_ids:
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    for elem in inst.elements:
-                        if elem.element_id == elem_id:
-                            elements_to_delete.append((obj, inst, elem))
+            elements_to_delete.extend(self._find_element_owners(elem_id))
         
         # Count total items to delete
         total_count = len(objects_to_delete) + len(instances_to_delete) + len(elements_to_delete)
@@ -6530,135 +7128,70 @@ class SegmenterApp:
         if pixel_action == "delete_pixels":
             self._delete_pixels_from_objects(objects_to_delete, instances_to_delete, elements_to_delete)
         
-        # Now proceed with normal deletion logic
-        modified_objs = set()
-        deleted_objs = set()
-        page_ids_to_update = set()  # Track page IDs that need mask updates (use IDs since PageTab is not hashable)
+        # Now proceed with normal deletion logic. Everything to delete was
+        # collected above, so each list is walked once and page region lists
+        # are filtered once per page at the end.
+        modified_objs: Dict[str, SegmentedObject] = {}
+        # page_id -> category -> element ids whose mark_text/hatch/line regions go
+        regions_to_remove: Dict[str, Dict[str, set]] = defaultdict(lambda: defaultdict(set))
         
-        # Handle element deletions - also remove from page region lists if mark_text/hatch/line
-        for elem_id in self.selected_element_ids:
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    for elem in inst.elements:
-                        if elem.element_id == elem_id:
-                            # If this is a mark_text/hatch/line element, remove from page regions
-                            if obj.category in ["mark_text", "mark_hatch", "mark_line"]:
-                                page = self.pages.get(inst.page_id)
-                                if page:
-                                    page_ids_to_update.add(inst.page_id)
-                                    # Find and remove the corresponding region (from both auto and manual lists)
-                                    if obj.category == "mark_text":
-                                        if hasattr(page, 'manual_text_regions'):
-                                            page.manual_text_regions = [r for r in page.manual_text_regions 
-                                                                        if r.get('id') != elem_id]
-                                        if hasattr(page, 'auto_text_regions'):
-                                            page.auto_text_regions = [r for r in page.auto_text_regions 
-                                                                      if r.get('id') != elem_id]
-                                    elif obj.category == "mark_hatch":
-                                        if hasattr(page, 'manual_hatch_regions'):
-                                            page.manual_hatch_regions = [r for r in page.manual_hatch_regions 
-                                                                         if r.get('id') != elem_id]
-                                    elif obj.category == "mark_line":
-                                        if hasattr(page, 'manual_line_regions'):
-                                            page.manual_line_regions = [r for r in page.manual_line_regions 
-                                                                        if str(r.get('id', '')) != str(elem_id)]
-                    
-                    old_len = len(inst.elements)
-                    inst.elements = [e for e in inst.elements if e.element_id != elem_id]
-                    if len(inst.elements) != old_len:
-                        modified_objs.add(obj.object_id)
-                obj.instances = [i for i in obj.instances if i.elements]
+        def queue_region_removal(obj, inst, elems):
+            if obj.category in ["mark_text", "mark_hatch", "mark_line"] and inst.page_id in self.pages:
+                regions_to_remove[inst.page_id][obj.category].update(e.element_id for e in elems)
         
-        # Handle instance deletions - also remove from page region lists if mark_text/hatch/line
-        for inst_id in self.selected_instance_ids:
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    if inst.instance_id == inst_id:
-                        # If this instance has mark_text/hatch/line elements, remove from page regions
-                        if obj.category in ["mark_text", "mark_hatch", "mark_line"]:
-                            page = self.pages.get(inst.page_id)
-                            if page:
-                                page_ids_to_update.add(inst.page_id)
-                                for elem in inst.elements:
-                                    if obj.category == "mark_text":
-                                        if hasattr(page, 'manual_text_regions'):
-                                            page.manual_text_regions = [r for r in page.manual_text_regions 
-                                                                        if r.get('id') != elem.element_id]
-                                        if hasattr(page, 'auto_text_regions'):
-                                            page.auto_text_regions = [r for r in page.auto_text_regions 
-                                                                      if r.get('id') != elem.element_id]
-                                    elif obj.category == "mark_hatch":
-                                        if hasattr(page, 'manual_hatch_regions'):
-                                            page.manual_hatch_regions = [r for r in page.manual_hatch_regions 
-                                                                         if r.get('id') != elem.element_id]
-                                    elif obj.category == "mark_line":
-                                        if hasattr(page, 'manual_line_regions'):
-                                            page.manual_line_regions = [r for r in page.manual_line_regions 
-                                                                        if str(r.get('id', '')) != str(elem.element_id)]
-                
-                old_len = len(obj.instances)
-                obj.instances = [i for i in obj.instances if i.instance_id != inst_id]
-                if len(obj.instances) != old_len:
-                    modified_objs.add(obj.object_id)
+        # Handle element deletions (grouped per instance)
+        elem_ids_by_inst = {}
+        for obj, inst, elem in elements_to_delete:
+            queue_region_removal(obj, inst, [elem])
+            elem_ids_by_inst.setdefault(id(inst), (obj, inst, set()))[2].add(elem.element_id)
+        for obj, inst, elem_ids in elem_ids_by_inst.values():
+            old_len = len(inst.elements)
+            inst.elements = [e for e in inst.elements if e.element_id not in elem_ids]
+            if len(inst.elements) != old_len:
+                modified_objs[obj.object_id] = obj
+        for obj in modified_objs.values():
+            obj.instances = [i for i in obj.instances if i.elements]
+        
+        # Handle instance deletions
+        inst_ids_by_obj = {}
+        for obj, inst in instances_to_delete:
+            queue_region_removal(obj, inst, inst.elements)
+            inst_ids_by_obj.setdefault(id(obj), (obj, set()))[1].add(inst.instance_id)
+        for obj, inst_ids in inst_ids_by_obj.values():
+            old_len = len(obj.instances)
+            obj.instances = [i for i in obj.instances if i.instance_id not in inst_ids]
+            if len(obj.instances) != old_len:
+                modified_objs[obj.object_id] = obj
+        
+        # Handle object deletions
+        for obj in objects_to_delete:
+            for inst in obj.instances:
+                queue_region_removal(obj, inst, inst.elements)
         
-        # Handle object deletions - also remove from page region lists if mark_text/hatch/line
-        for obj_id in self.selected_object_ids:
-            obj = self._get_object_by_id(obj_id)
-            if obj:
-                # If this object has mark_text/hatch/line elements, remove from page regions
-                if obj.category in ["mark_text", "mark_hatch", "mark_line"]:
-                    for inst in obj.instances:
-                        page = self.pages.get(inst.page_id)
-                        if page:
-                            page_ids_to_update.add(inst.page_id)
-                            for elem in inst.elements:
-                                if obj.category == "mark_text":
-                                    if hasattr(page, 'manual_text_regions'):
-                                        page.manual_text_regions = [r for r in page.manual_text_regions 
-                                                                    if r.get('id') != elem.element_id]
-                                    if hasattr(page, 'auto_text_regions'):
-                                        page.auto_text_regions = [r for r in page.auto_text_regions 
-                                                                  if r.get('id') != elem.element_id]
-                                elif obj.category == "mark_hatch":
-                                    if hasattr(page, 'manual_hatch_regions'):
-                                        page.manual_hatch_regions = [r for r in page.manual_hatch_regions 
-                                                                     if r.get('id') != elem.element_id]
-                                elif obj.category == "mark_line":
-                                    if hasattr(page, 'manual_line_regions'):
-                                        page.manual_line_regions = [r for r in page.manual_line_regions 
-                                                                    if str(r.get('id', '')) != str(elem.element_id)]
-            deleted_objs.add(obj_id)
-        
-        # Remove deleted objects
-        self.all_objects = [o for o in self.all_objects if o.object_id not in deleted_objs]
-        
-        # Clean up empty objects
-        for obj in self.all_objects[:]:
-            if not obj.instances:
-                deleted_objs.add(obj.object_id)
-                self.all_objects.remove(obj)
+        # Remove the queued regions, one filter pass per region list
+        for page_id, by_category in regions_to_remove.items():
+            self._remove_page_regions(self.pages[page_id], by_category)
+        
+        # Remove deleted objects, and objects left without instances. The
+        # selection is still intact here, so test against it directly rather
+        # than copying it into a separate set.
+        deleted_ids = self.selected_object_ids
+        self.all_objects = [obj for obj in self.all_objects
+                            if obj.instances and obj.object_id not in deleted_ids]
+        self._rebuild_objects_by_page()
         
         # Update combined masks for affected pages (optimize for mark_line deletion)
-        print(f"DEBUG _delete_selected: Updating masks for {len(page_ids_to_update)} pages")
+        print(f"DEBUG _delete_selected: Updating masks for {len(regions_to_remove)} pages")
         import time
         start_time = time.time()
         
-        for page_id in page_ids_to_update:
+        for page_id, by_category in regions_to_remove.items():
             page = self.pages.get(page_id)
             if page:
-                # Only update masks if we actually deleted mark_text/hatch/line objects
-                deleted_mark_text = any(
-                    obj.category == "mark_text" for obj_id in deleted_objs 
-                    for obj in [self._get_object_by_id(obj_id)] if obj
-                )
-                deleted_mark_hatch = any(
-                    obj.category == "mark_hatch" for obj_id in deleted_objs 
-                    for obj in [self._get_object_by_id(obj_id)] if obj
-                )
-                deleted_mark_line = any(
-                    obj.category == "mark_line" for obj_id in deleted_objs 
-                    for obj in [self._get_object_by_id(obj_id)] if obj
-                )
+                # Only update masks for the mark_text/hatch/line regions actually removed
+                deleted_mark_text = "mark_text" in by_category
+                deleted_mark_hatch = "mark_hatch" in by_category
+                deleted_mark_line = "mark_line" in by_category
                 
                 if deleted_mark_text and hasattr(page, 'manual_text_regions'):
                     print(f"DEBUG: Updating text mask for page {page_id}")
@@ -6674,38 +7207,17 @@ class SegmenterApp:
         elapsed = time.time() - start_time
         print(f"DEBUG _delete_selected: Mask update took {elapsed:.3f} seconds")
         
-        # Save tree state before rebuild (which categories are expanded)
-        expanded_categories = set()
-        if hasattr(self, 'tree_grouping_var') and self.tree_grouping_var.get() == "category":
-            for item in self.object_tree.get_children():
-                if item.startswith("cat_"):
-                    if self.object_tree.item(item, "open"):
-                        expanded_categories.add(item)
-        
         # Determine if we deleted mark_line objects and should select the category heading
-        deleted_mark_line = any(
-            obj.category == "mark_line" for obj_id in deleted_objs 
-            for obj in [self._get_object_by_id(obj_id)] if obj
-        )
+        deleted_mark_line = any("mark_line" in by_category for by_category in regions_to_remove.values())
         
         self.selected_object_ids.clear()
         self.selected_instance_ids.clear()
         self.selected_element_ids.clear()
         self.workspace_modified = True
-        self.renderer.invalidate_cache()  # Objects changed
-        
-        # Full tree rebuild since objects have been removed
-        # (Incremental update doesn't work well after objects are removed from all_objects)
-        self._update_tree()
+        self._request_refresh()
         
-        # Restore tree state (which categories are expanded)
-        if hasattr(self, 'tree_grouping_var') and self.tree_grouping_var.get() == "category":
-            for item in self.object_tree.get_children():
-                if item.startswith("cat_"):
-                    if item in expanded_categories:
-                        self.object_tree.item(item, open=True)
-                    else:
-                        self.object_tree.item(item, open=False)
+        # Remove/refresh only the affected rows (other groups keep their state)
+        self._sync_tree()
         
         # If mark_line objects were deleted, select the mark_line category heading
         if deleted_mark_line:
@@ -6714,7 +7226,26 @@ class SegmenterApp:
                 self.object_tree.selection_set(mark_line_cat_id)
                 self.object_tree.see(mark_line_cat_id)
         
-        self._update_display()
+    
+    def _remove_page_regions(self, page: PageTab, by_category: Dict[str, set]):
+        """Drop mark_text/hatch/line regions whose ids were deleted, one pass per list."""
+        text_ids = by_category.get("mark_text")
+        if text_ids:
+            if hasattr(page, 'manual_text_regions'):
+                page.manual_text_regions = [r for r in page.manual_text_regions
+                                            if r.get('id') not in text_ids]
+            if hasattr(page, 'auto_text_regions'):
+                page.auto_text_regions = [r for r in page.auto_text_regions
+                                          if r.get('id') not in text_ids]
+        hatch_ids = by_category.get("mark_hatch")
+        if hatch_ids and hasattr(page, 'manual_hatch_regions'):
+            page.manual_hatch_regions = [r for r in page.manual_hatch_regions
+                                         if r.get('id') not in hatch_ids]
+        line_ids = by_category.get("mark_line")
+        if line_ids and hasattr(page, 'manual_line_regions'):
+            line_ids = {str(i) for i in line_ids}
+            page.manual_line_regions = [r for r in page.manual_line_regions
+                                        if str(r.get('id', '')) not in line_ids]
     
     def _merge_as_instances(self):
         if len(self.selected_object_ids) < 2:
@@ -6735,13 +7266,21 @@ class SegmenterApp:
             for inst in other.instances:
                 inst.instance_num = len(target.instances) + 1
                 target.instances.append(inst)
-            self.all_objects.remove(other)
             self._remove_tree_item(other.object_id)
+        self._remove_objects(objs[1:])
+        self._index_object(target)
         
         target.name = name
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
+        # Same pixels, different owners: the renderer's objects hash changes
+        # (ids/instance counts), which rebuilds the base without a full invalidate
         self._update_tree_item(target)
+        
+        # The merged-away objects are gone; keep the result selected
+        self.selected_object_ids = {target.object_id}
+        self.selected_instance_ids.clear()
+        self.selected_element_ids.clear()
+        self._select_tree_objects(self.selected_object_ids)
         self._update_display()
     
     def _merge_as_group(self):
@@ -6764,12 +7303,12 @@ class SegmenterApp:
                     elements.extend(inst.elements)
                 obj_ids_to_remove.add(obj_id)
         
+        seen = {id(elem) for elem in elements}
         for elem_id in self.selected_element_ids:
-            for obj in self.all_objects:
-                for inst in obj.instances:
-                    for elem in inst.elements:
-                        if elem.element_id == elem_id and elem not in elements:
-                            elements.append(elem)
+            for _, _, elem in self._find_element_owners(elem_id):
+                if id(elem) not in seen:
+                    seen.add(id(elem))
+                    elements.append(elem)
         
         if len(elements) < 2:
             return
@@ -6780,24 +7319,42 @@ class SegmenterApp:
             return
         
         # Remove old objects
+        old_objs = []
         for obj_id in obj_ids_to_remove:
             self._remove_tree_item(obj_id)
-        self.all_objects = [o for o in self.all_objects if o.object_id not in obj_ids_to_remove]
+            old_obj = self._get_object_by_id(obj_id)
+            if old_obj is not None:
+                old_objs.append(old_obj)
+        self._remove_objects(old_objs)
         
         # Create new grouped object
         obj = SegmentedObject(name=name, category=cat_name)
         inst = ObjectInstance(instance_num=1, page_id=page.tab_id)
         inst.elements = elements
         obj.instances.append(inst)
-        self.all_objects.append(obj)
+        self._add_object(obj)
         
         self.workspace_modified = True
-        self.renderer.invalidate_cache()
+        self._request_refresh()
         self._add_tree_item(obj)
-        self._update_display()
+        
+        # The grouped elements now belong to the new object; select it
+        self.selected_object_ids = {obj.object_id}
+        self.selected_instance_ids.clear()
+        self.selected_element_ids.clear()
+        self._select_tree_objects(self.selected_object_ids)
     
     # File operations
+    def _pdf_load_in_progress(self) -> bool:
+        """Check for a PDF still rasterizing; opening anything else now would race its install."""
+        if self._pdf_load_future is not None and not self._pdf_load_future.done():
+            self.status_var.set("Still loading a PDF - wait for it to finish")
+            return True
+        return False
+    
     def _open_pdf(self):
+        if self._pdf_load_in_progress():
+            return
         if self.pages and self.workspace_modified:
             r = messagebox.askyesnocancel("Save?", "Save workspace first?")
             if r is None:
@@ -6813,8 +7370,34 @@ class SegmenterApp:
     
     def _open_pdf_from_path(self, path: str):
         """Open PDF from a specific path (used by both dialog and command line)."""
-        # Load with dimension information
-        pages = self.pdf_reader.load_with_dimensions(path)
+        if self._pdf_load_in_progress():
+            return
+        # Rasterizing every page is slow, so it runs on the PDF worker
+        # while the UI stays live; progress comes back through a queue that
+        # the Tk-side poll drains
+        progress_queue = queue.Queue()
+        
+        def show_progress():
+            latest = None
+            while True:
+                try:
+                    latest = progress_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if latest is not None:
+                self.status_var.set(f"Loading PDF... page {latest[0]}/{latest[1]}")
+        
+        if self._pdf_executor is None:
+            self._pdf_executor = ThreadPoolExecutor(max_workers=1)
+        future = self._pdf_load_future = self._pdf_executor.submit(
+            self.pdf_reader.load_with_dimensions, path,
+            progress=lambda done, total: progress_queue.put((done, total)))
+        self.status_var.set(f"Loading PDF: {Path(path).name}...")
+        self._poll_future(future, lambda pages: self._finish_open_pdf(path, pages),
+                          on_wait=show_progress)
+    
+    def _finish_open_pdf(self, path: str, pages: list):
+        """Show the page picker for a rasterized PDF and open the chosen pages."""
         if not pages:
             messagebox.showerror("Error", "Failed to load PDF")
             return
@@ -6832,12 +7415,14 @@ class SegmenterApp:
         
         # Reset all workspace data
         self.all_objects = []  # Clear object list
+        self._category_counters = {}
+        self._rebuild_objects_by_page()
         self.categories = create_default_categories()
         self._refresh_categories()
         self.selected_object_ids.clear()
         self.selected_instance_ids.clear()
         self.selected_element_ids.clear()
-        self._update_tree()  # Clear tree view
+        self._sync_tree()  # Clear tree view
         self.workspace_file = None
         self.workspace_modified = True
         
@@ -6853,6 +7438,7 @@ class SegmenterApp:
                 pdf_height_inches=page_data.get('height_inches', 0),
             )
             self._add_page(page)
+            self.root.update_idletasks()  # Show each tab as it is added
         
         self.status_var.set(f"Loaded {len(result)} pages")
     
@@ -6864,13 +7450,10 @@ class SegmenterApp:
         # Collect view state
         view_state = self._get_view_state()
         
-        # Update page-level view state (zoom, scroll)
+        # Update page-level view state (zoom). Scroll positions are already
+        # on each page, kept current by the canvas scroll callbacks.
         for page in self.pages.values():
             page.zoom_level = self.zoom_level  # Current zoom
-            if hasattr(page, 'canvas'):
-                # Save scroll position
-                page.scroll_x = page.canvas.xview()[0]
-                page.scroll_y = page.canvas.yview()[0]
         
         if self.workspace_mgr.save(self.workspace_file, list(self.pages.values()), 
                                    self.categories, self.all_objects, view_state):
@@ -6904,6 +7487,8 @@ class SegmenterApp:
                 messagebox.showerror("Error", f"PDF file not found: {path}")
     
     def _load_workspace(self):
+        if self._pdf_load_in_progress():
+            return
         if self.pages and self.workspace_modified:
             r = messagebox.askyesnocancel("Save?", "Save workspace first?")
             if r is None:
@@ -6919,6 +7504,8 @@ class SegmenterApp:
     
     def _load_workspace_from_path(self, path: str):
         """Load workspace from a specific path (used by both dialog and command line)."""
+        if self._pdf_load_in_progress():
+            return
         data = self.workspace_mgr.load(path)
         if not data:
             messagebox.showerror("Error", "Failed to load workspace")
@@ -6963,6 +7550,8 @@ class SegmenterApp:
         
         # Load global objects
         self.all_objects = data.objects if data.objects else []
+        self._category_counters = {}
+        self._rebuild_objects_by_page()
         
         # First pass: add all pages (this triggers delayed display updates)
         for page in data.pages:
@@ -6973,16 +7562,25 @@ class SegmenterApp:
         self.status_var.set("Building masks...")
         self.root.update()
         
+        # Text/hatch masks depend only on each page's own regions, so build
+        # them for every page in parallel (np.maximum releases the GIL). The
+        # working image cache was just invalidated, so the results can be
+        # installed directly without the incremental cache update.
+        with ThreadPoolExecutor(max_workers=min(len(data.pages), os.cpu_count() or 1) or 1) as pool:
+            region_masks = [(page,
+                             pool.submit(self._combine_region_masks, page, 'text'),
+                             pool.submit(self._combine_region_masks, page, 'hatch'))
+                            for page in data.pages]
+            for page, text_future, hatch_future in region_masks:
+                page.combined_text_mask, page._text_mask_cache_key = text_future.result()
+                page.combined_hatch_mask, page._hatch_mask_cache_key = hatch_future.result()
+        
         for i, page in enumerate(data.pages):
             # Update progress for large workspaces
             if len(data.pages) > 1:
                 self.status_var.set(f"Building masks... {i+1}/{len(data.pages)}")
                 self.root.update()
             
-            # ALWAYS rebuild combined masks to ensure they're initialized
-            self._update_combined_text_mask(page, force_recompute=True)
-            self._update_combined_hatch_mask(page, force_recompute=True)
-            
             # Add existing text regions to mark_text category
             self._add_existing_text_regions_to_category(page)
             # Add existing line regions to mark_line category (repairs masks)
@@ -6998,7 +7596,7 @@ class SegmenterApp:
         # This forces re-render with correct masks when display updates
         self.renderer.invalidate_cache()
         
-        self._update_tree()  # Rebuild tree with loaded objects
+        self._sync_tree()  # Rebuild tree with loaded objects
         
         # Update view menu (no longer needs hide_text state)
         self._update_view_menu_labels()
@@ -7019,16 +7617,11 @@ class SegmenterApp:
                 self.renderer.invalidate_cache()
                 self._update_display()
                 self._draw_rulers(page)
-                # Restore scroll position if available
-                if hasattr(page, 'scroll_x') and hasattr(page, 'scroll_y'):
-                    page.canvas.xview_moveto(page.scroll_x)
-                    page.canvas.yview_moveto(page.scroll_y)
+                # The saved scroll position is restored by the first render
             # Update zoom display
-            if hasattr(self, 'zoom_label'):
-                zoom_text = f"{int(self.zoom_level * 100)}%"
-                self.zoom_label.config(text=zoom_text)
-            if hasattr(self, 'status_bar'):
-                self.status_bar.set_item_text("zoom", f"{int(self.zoom_level * 100)}%")
+            zoom_text = f"{int(self.zoom_level * 100)}%"
+            self.zoom_label.config(text=zoom_text)
+            self.status_bar.set_item_text("zoom", zoom_text)
         
         self.root.after(500, _final_refresh)  # Increased delay to ensure masks are ready
     
@@ -7298,7 +7891,7 @@ class SegmenterApp:
                 category=planform_obj.category,
                 instances=new_planform_instances
             )
-            self.all_objects.append(new_planform_obj)
+            self._add_object(new_planform_obj)
             copied_count += 1
         
         # CRITICAL: Use the stored list of objects that were within the planform at creation time
@@ -7406,7 +7999,7 @@ class SegmenterApp:
                     category=obj.category,
                     instances=new_instances
                 )
-                self.all_objects.append(new_obj)
+                self._add_object(new_obj)
                 copied_count += 1
         
         # Initialize empty masks for the new page (no mark_* objects)
@@ -7454,9 +8047,9 @@ class SegmenterApp:
         return {
             "current_page_id": self.current_page_id,
             "zoom_level": self.zoom_level,
-            "group_by": self.group_by_var.get() if hasattr(self, 'group_by_var') else "category",
+            "group_by": self._grouping_mode,
             "show_labels": self.show_labels,
-            "current_view": self.current_view_var.get() if hasattr(self, 'current_view_var') else "",
+            "current_view": self._current_view,
         }
     
     def _restore_view_state(self, view_state: dict):
@@ -7466,21 +8059,20 @@ class SegmenterApp:
         
         # Restore zoom level
         self.zoom_level = view_state.get("zoom_level", 1.0)
-        if hasattr(self, 'zoom_var'):
-            self.zoom_var.set(f"{int(self.zoom_level * 100)}%")
         
         # Restore group by
-        if hasattr(self, 'group_by_var'):
-            self.group_by_var.set(view_state.get("group_by", "category"))
+        grouping = view_state.get("group_by", "category")
+        if grouping != self._grouping_mode:
+            self.tree_grouping_var.set(grouping)
+            self._on_grouping_changed()
         
         # Restore show labels
         self.show_labels = view_state.get("show_labels", True)
-        if hasattr(self, 'show_labels_var'):
-            self.show_labels_var.set(self.show_labels)
+        self.show_labels_var.set(self.show_labels)
         
         # Restore current view
-        if hasattr(self, 'current_view_var'):
-            self.current_view_var.set(view_state.get("current_view", ""))
+        self._current_view = view_state.get("current_view", "")
+        self.current_view_var.set(self._current_view)
         
         # Restore current page (done after all pages loaded)
         target_page_id = view_state.get("current_page_id")
@@ -7501,6 +8093,10 @@ class SegmenterApp:
         self.settings.window_x = self.root.winfo_x()
         self.settings.window_y = self.root.winfo_y()
         save_settings(self.settings)
+        if self._render_executor is not None:
+            self._render_executor.shutdown(wait=False, cancel_futures=True)
+        if self._pdf_executor is not None:
+            self._pdf_executor.shutdown(wait=False, cancel_futures=True)
         self.root.quit()
     
     def run(self):
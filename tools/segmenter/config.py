@@ -5,9 +5,10 @@ Modern VS Code/Cursor-inspired themes with responsive layout support.
 """
 
 import json
+import os
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 CONFIG_FILE = Path.home() / ".planmod_segmenter.json"
 
@@ -400,12 +401,34 @@ def load_settings() -> AppSettings:
     return AppSettings()
 
 
+# (contents, file mtime) of the last successful save, so unchanged settings
+# aren't rewritten while the file on disk is still the one we wrote
+_last_saved: Optional[Tuple[str, int]] = None
+
+
 def save_settings(settings: AppSettings):
-    """Save settings to config file."""
+    """
+    Save settings to config file.
+    
+    Skips the write when nothing changed since the last save and the file
+    hasn't been touched since (it is hand-editable, and both settings
+    modules write it). Writes through a temp file so an interrupted save
+    can't truncate the config.
+    """
+    global _last_saved
     try:
-        data = asdict(settings)
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        payload = json.dumps(asdict(settings), indent=2)
+        if _last_saved is not None and _last_saved[0] == payload:
+            try:
+                if CONFIG_FILE.stat().st_mtime_ns == _last_saved[1]:
+                    return
+            except OSError:
+                pass  # Missing or unreadable - write it again
+        tmp_file = CONFIG_FILE.with_name(CONFIG_FILE.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_file, CONFIG_FILE)
+        _last_saved = (payload, CONFIG_FILE.stat().st_mtime_ns)
     except Exception as e:
         print(f"Warning: Could not save settings: {e}")
 
@@ -5,11 +5,15 @@ Uses rectpack library for rectangle bin packing, with object bounding boxes.
 Can optionally use more sophisticated polygon nesting if needed.
 """
 
+import math
 import cv2
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
-import uuid
+import itertools
+import weakref
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 # Try to import rectpack for bin packing
 try:
@@ -20,6 +24,54 @@ except ImportError:
     print("Warning: rectpack not installed. Install with: pip install rectpack")
 
 
+# Sheet ids only need to be unique within the session
+_SHEET_ID_SEQ = itertools.count()
+
+# Part colors (RGB), cycled through when rendering a sheet
+_PART_COLORS = (
+    (66, 133, 244),   # Blue
+    (52, 168, 83),    # Green
+    (251, 188, 5),    # Yellow
+    (234, 67, 53),    # Red
+    (156, 39, 176),   # Purple
+    (0, 188, 212),    # Cyan
+    (255, 152, 0),    # Orange
+    (121, 85, 72),    # Brown
+)
+
+
+@lru_cache(maxsize=1024)
+def _label_size(label: str, font: int, scale: float, thickness: int) -> Tuple[int, int]:
+    """Memoized cv2.getTextSize; parts with quantity > 1 repeat their label."""
+    (text_w, text_h), _ = cv2.getTextSize(label, font, scale, thickness)
+    return text_w, text_h
+
+
+def _bbox_from_mask(mask: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Get the (x, y, w, h) bounding box of a mask's nonzero pixels, or None if empty.
+    
+    Uses cv2.boundingRect (a single compiled pass) for uint8 masks, and
+    row/column projections otherwise; neither allocates index arrays the
+    size of the nonzero count as np.where does.
+    """
+    if mask.dtype == np.uint8 and mask.ndim == 2:
+        x, y, w, h = cv2.boundingRect(mask)
+        if w == 0 or h == 0:
+            return None
+        return (x, y, w, h)
+    
+    cols = mask.any(axis=0)
+    if not cols.any():
+        return None
+    rows = mask.any(axis=1)
+    x1 = int(cols.argmax())
+    x2 = len(cols) - int(cols[::-1].argmax())
+    y1 = int(rows.argmax())
+    y2 = len(rows) - int(rows[::-1].argmax())
+    return (x1, y1, x2 - x1, y2 - y1)
+
+
 @dataclass
 class NestedPart:
     """Represents a part placed on a sheet."""
@@ -31,39 +83,37 @@ class NestedPart:
     width: int  # Bounding box size
     height: int
     rotated: bool  # True if rotated 90 degrees
-    mask: Optional[np.ndarray] = None  # Original mask
+    mask: Optional[np.ndarray] = None  # Part mask (bool), cropped to its bounding box
     source_bbox: Tuple[int, int, int, int] = None  # (x, y, w, h) in source image
+    # (mask, oriented bool mask); reused while self.mask is the same array
+    _oriented_cache: Optional[tuple] = field(default=None, repr=False, compare=False)
+    
+    def get_oriented_crop(self) -> Optional[np.ndarray]:
+        """Get the part's bool mask crop as placed (rotated if needed), or None."""
+        if self.mask is None:
+            return None
+        if self.mask.dtype == np.bool_ and not self.rotated:
+            return self.mask
+        if self._oriented_cache is None or self._oriented_cache[0] is not self.mask:
+            # cv2 has no bool type, so rotate the same bytes viewed as uint8
+            if self.mask.dtype == np.bool_:
+                crop = self.mask.view(np.uint8)
+            else:
+                crop = (self.mask > 0).view(np.uint8)
+            # After 90° rotation, width and height are swapped
+            if self.rotated:
+                crop = cv2.rotate(crop, cv2.ROTATE_90_CLOCKWISE)
+            self._oriented_cache = (self.mask, crop.view(np.bool_))
+        return self._oriented_cache[1]
     
     def get_placed_mask(self, sheet_h: int, sheet_w: int) -> np.ndarray:
         """Get the mask positioned on the sheet."""
-        if self.mask is None:
+        mask_region = self.get_oriented_crop()
+        if mask_region is None:
             return None
         
         result = np.zeros((sheet_h, sheet_w), dtype=np.uint8)
         
-        # Get the mask content
-        mask = self.mask
-        if self.rotated:
-            mask = cv2.rotate(mask, cv2.ROTATE_90_CLOCKWISE)
-        
-        # Extract just the bounding box region from the mask
-        if self.source_bbox:
-            sx, sy, sw, sh = self.source_bbox
-            mask_region = mask[sy:sy+sh, sx:sx+sw]
-        else:
-            # Find bounding box from mask
-            ys, xs = np.where(mask > 0)
-            if len(ys) == 0:
-                return result
-            x1, y1 = xs.min(), ys.min()
-            x2, y2 = xs.max() + 1, ys.max() + 1
-            mask_region = mask[y1:y2, x1:x2]
-        
-        # Handle rotation effects on dimensions
-        if self.rotated:
-            # After 90° rotation, width and height are swapped
-            mask_region = cv2.rotate(mask_region, cv2.ROTATE_90_CLOCKWISE)
-        
         # Place on sheet
         mh, mw = mask_region.shape[:2]
         
@@ -72,7 +122,8 @@ class NestedPart:
         place_w = min(mw, sheet_w - self.x)
         
         if place_h > 0 and place_w > 0:
-            result[self.y:self.y+place_h, self.x:self.x+place_w] = mask_region[:place_h, :place_w]
+            placed = result[self.y:self.y+place_h, self.x:self.x+place_w]
+            placed[mask_region[:place_h, :place_w]] = 255
         
         return result
 
@@ -87,10 +138,12 @@ class NestedSheet:
     thickness: float
     parts: List[NestedPart] = field(default_factory=list)
     sheet_name: str = ""
+    # (part count, total part area); parts are only ever appended
+    _part_area_cache: Optional[tuple] = field(default=None, repr=False, compare=False)
     
     def __post_init__(self):
         if not self.sheet_id:
-            self.sheet_id = str(uuid.uuid4())[:8]
+            self.sheet_id = f"s{next(_SHEET_ID_SEQ):07x}"
     
     @property
     def utilization(self) -> float:
@@ -98,7 +151,10 @@ class NestedSheet:
         if self.width == 0 or self.height == 0:
             return 0.0
         
-        total_part_area = sum(p.width * p.height for p in self.parts)
+        if self._part_area_cache is None or self._part_area_cache[0] != len(self.parts):
+            self._part_area_cache = (len(self.parts),
+                                     sum(p.width * p.height for p in self.parts))
+        total_part_area = self._part_area_cache[1]
         sheet_area = self.width * self.height
         return (total_part_area / sheet_area) * 100
     
@@ -109,34 +165,26 @@ class NestedSheet:
         Returns:
             BGRA image of the sheet with parts
         """
-        # Create white background
-        image = np.ones((self.height, self.width, 4), dtype=np.uint8) * 255
-        image[:, :, 3] = 255  # Full opacity
+        # Create white, fully opaque background in one fill
+        image = np.full((self.height, self.width, 4), 255, dtype=np.uint8)
+        
+        # Label metrics, measured once per distinct part name
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        scale = 0.4
+        thickness = 1
+        text_sizes = {name: _label_size(name, font, scale, thickness)
+                      for name in {part.name for part in self.parts}}
         
         # Draw each part
         for i, part in enumerate(self.parts):
             # Generate a color for this part (cycle through colors)
-            colors = [
-                (66, 133, 244),   # Blue
-                (52, 168, 83),    # Green
-                (251, 188, 5),    # Yellow
-                (234, 67, 53),    # Red
-                (156, 39, 176),   # Purple
-                (0, 188, 212),    # Cyan
-                (255, 152, 0),    # Orange
-                (121, 85, 72),    # Brown
-            ]
-            color = colors[i % len(colors)]
+            color = _PART_COLORS[i % len(_PART_COLORS)]
             
             if include_masks and part.mask is not None:
-                # Draw the actual mask
-                placed_mask = part.get_placed_mask(self.height, self.width)
-                if placed_mask is not None:
-                    mask_region = placed_mask > 0
-                    # Apply semi-transparent color
-                    image[mask_region, 0] = color[2]  # BGR
-                    image[mask_region, 1] = color[1]
-                    image[mask_region, 2] = color[0]
+                # Draw the actual mask, writing only the part's own footprint
+                crop = part.get_oriented_crop()
+                sub = image[part.y:part.y + crop.shape[0], part.x:part.x + crop.shape[1]]
+                sub[crop[:sub.shape[0], :sub.shape[1]], :3] = color[::-1]  # BGR
             else:
                 # Draw bounding box
                 x, y = part.x, part.y
@@ -146,10 +194,7 @@ class NestedSheet:
             
             # Draw label
             label = part.name
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            scale = 0.4
-            thickness = 1
-            (text_w, text_h), _ = cv2.getTextSize(label, font, scale, thickness)
+            text_w, text_h = text_sizes[label]
             
             label_x = part.x + (part.width - text_w) // 2
             label_y = part.y + (part.height + text_h) // 2
@@ -182,43 +227,73 @@ class NestingEngine:
         """
         self.spacing = spacing
         self.allow_rotation = allow_rotation
+        # instance_id -> (weakrefs to the element masks, cropped mask, bbox).
+        # Element masks are replaced rather than edited in place, so the crop
+        # stays valid while the same mask arrays are alive.
+        self._part_info_cache: Dict[str, tuple] = {}
+    
+    def _prune_cache(self):
+        """Drop cached part masks whose element masks have been freed."""
+        self._part_info_cache = {
+            inst_id: entry for inst_id, entry in self._part_info_cache.items()
+            if all(ref() is not None for ref in entry[0])}
     
     def extract_part_info(self, obj, inst, page_image: np.ndarray) -> Optional[Dict]:
         """
         Extract part information from an object instance.
         
         Returns dict with:
-            - mask: Combined mask of all elements
+            - mask: Combined bool mask of all elements, cropped to bbox
             - bbox: Bounding box (x, y, w, h)
             - name: Object name
         """
-        h, w = page_image.shape[:2]
+        # An unset quantity counts as one; skip parts that won't be placed
+        # before touching any masks
+        quantity = inst.attributes.quantity or 1
+        if quantity <= 0:
+            return None
         
-        # Combine all element masks
-        combined_mask = np.zeros((h, w), dtype=np.uint8)
-        for elem in inst.elements:
-            if elem.mask is not None and elem.mask.shape == (h, w):
-                combined_mask = np.maximum(combined_mask, elem.mask)
+        h, w = page_image.shape[:2]
         
-        # Find bounding box
-        ys, xs = np.where(combined_mask > 0)
-        if len(ys) == 0:
+        # Combine all element masks in place (a single mask is used as-is;
+        # it is only read and cropped below)
+        valid = [elem.mask for elem in inst.elements
+                 if elem.mask is not None and elem.mask.shape == (h, w)]
+        if not valid:
             return None
         
-        x1, y1 = xs.min(), ys.min()
-        x2, y2 = xs.max() + 1, ys.max() + 1
-        
-        # Extract mask region
-        mask_region = combined_mask[y1:y2, x1:x2]
+        cached = self._part_info_cache.get(inst.instance_id)
+        if (cached is not None and len(cached[0]) == len(valid)
+                and all(ref() is mask for ref, mask in zip(cached[0], valid, strict=True))):
+            _, mask_region, bbox = cached
+        else:
+            combined_mask = valid[0]
+            if len(valid) > 1:
+                combined_mask = combined_mask.copy()
+                for mask in valid[1:]:
+                    np.maximum(combined_mask, mask, out=combined_mask)
+            
+            # Find bounding box
+            bbox = _bbox_from_mask(combined_mask)
+            mask_region = None
+            if bbox is not None:
+                x1, y1, bw, bh = bbox
+                # Extract mask region as bool (a new array, so the full-page
+                # mask can be freed)
+                mask_region = combined_mask[y1:y1+bh, x1:x1+bw] > 0
+            self._part_info_cache[inst.instance_id] = (
+                tuple(weakref.ref(mask) for mask in valid), mask_region, bbox)
+        
+        if bbox is None:
+            return None
         
         return {
             "mask": mask_region,
-            "bbox": (x1, y1, x2 - x1, y2 - y1),
-            "full_mask": combined_mask,
+            "bbox": bbox,
             "name": obj.name,
             "object_id": obj.object_id,
             "instance_id": inst.instance_id,
-            "quantity": inst.attributes.quantity or 1,
+            "quantity": quantity,
         }
     
     def nest_parts(self, parts: List[Dict], sheet_sizes: List[Tuple[int, int]],
@@ -242,7 +317,8 @@ class NestingEngine:
             return []
         
         # Prepare rectangles for packing
-        # Each rectangle is (width, height, rid) where rid is a unique identifier
+        # Each rectangle is (width, height, rid) where rid is the part's index;
+        # copies for quantity > 1 share their part's rid
         rectangles = []
         part_lookup = {}
         
@@ -250,62 +326,57 @@ class NestingEngine:
             bbox = part["bbox"]
             w = bbox[2] + self.spacing * 2
             h = bbox[3] + self.spacing * 2
+            part_lookup[idx] = part
             
             # Handle quantity - add multiple copies
             quantity = part.get("quantity", 1)
-            for q in range(quantity):
-                rid = f"{idx}_{q}"
-                rectangles.append((w, h, rid))
-                part_lookup[rid] = part
-        
-        # Create packer
-        if self.allow_rotation:
-            packer = rectpack.newPacker(
-                mode=rectpack.PackingMode.Offline,
-                pack_algo=rectpack.MaxRectsBssf,
-                rotation=True
-            )
-        else:
-            packer = rectpack.newPacker(
-                mode=rectpack.PackingMode.Offline,
-                pack_algo=rectpack.MaxRectsBssf,
-                rotation=False
-            )
+            rectangles.extend([(w, h, idx)] * quantity)
+        
+        # Create packer (offline mode sorts the rectangles largest area first
+        # before packing, so they can be added in any order)
+        packer = rectpack.newPacker(
+            mode=rectpack.PackingMode.Offline,
+            pack_algo=rectpack.MaxRectsBssf,
+            sort_algo=rectpack.SORT_AREA,
+            rotation=self.allow_rotation
+        )
         
         # Add rectangles to packer
         for w, h, rid in rectangles:
             packer.add_rect(w, h, rid)
         
-        # Add bins (sheets) - we'll add sheets one at a time until all parts are packed
-        sheet_idx = 0
+        # Add bins (sheets) up front so the packer normally runs only once
         sheets = []
         
         # Sort sheet sizes by area (largest first for efficiency)
         sorted_sheets = sorted(sheet_sizes, key=lambda s: s[0] * s[1], reverse=True)
         
-        # Keep adding sheets until all rectangles are packed
-        remaining = len(rectangles)
         max_sheets = 100  # Safety limit
         
-        while remaining > 0 and sheet_idx < max_sheets:
-            # Use sheet sizes cyclically
-            sw, sh = sorted_sheets[sheet_idx % len(sorted_sheets)]
-            packer.add_bin(sw, sh, count=1)
+        # Estimate the sheet count from total part area, with slack for
+        # packing waste
+        total_area = sum(w * h for w, h, _ in rectangles)
+        sheet_area = max(1, sorted_sheets[0][0] * sorted_sheets[0][1])
+        target_bins = min(max_sheets, math.ceil(total_area / sheet_area * 1.4) + 1)
+        
+        sheet_idx = 0
+        packed_count = 0
+        while sheet_idx < target_bins:
+            while sheet_idx < target_bins:
+                # Use sheet sizes cyclically
+                sw, sh = sorted_sheets[sheet_idx % len(sorted_sheets)]
+                packer.add_bin(sw, sh, count=1)
+                sheet_idx += 1
             
-            # Pack
             packer.pack()
             
-            # Check how many are now packed
-            packed_count = len(packer.all_rects())
-            if packed_count == len(rectangles):
-                remaining = 0
-            elif packed_count == remaining:
-                # No progress - parts might be too large
+            # If the estimate came up short, add more sheets and pack again
+            previous_count = packed_count
+            packed_count = len(packer.rect_list())
+            if packed_count == len(rectangles) or packed_count == previous_count:
+                # Done, or no progress - remaining parts might be too large
                 break
-            else:
-                remaining = len(rectangles) - packed_count
-            
-            sheet_idx += 1
+            target_bins = min(max_sheets, target_bins * 2)
         
         # Convert packed results to NestedSheet objects
         for bin_idx, abin in enumerate(packer):
@@ -321,7 +392,7 @@ class NestingEngine:
             )
             
             for rect in abin:
-                b, x, y, w, h, rid = rect
+                x, y, w, h, rid = rect.x, rect.y, rect.width, rect.height, rect.rid
                 
                 part = part_lookup.get(rid)
                 if not part:
@@ -341,7 +412,7 @@ class NestingEngine:
                     width=part["bbox"][2],
                     height=part["bbox"][3],
                     rotated=rotated,
-                    mask=part["full_mask"],
+                    mask=part["mask"],
                     source_bbox=part["bbox"]
                 )
                 nested_sheet.parts.append(nested_part)
@@ -368,41 +439,58 @@ class NestingEngine:
             Dict mapping material to list of NestedSheet objects
         """
         results = {}
-        
-        for group in material_groups:
-            group_key = f"{group.material}_{group.thickness}"
-            sheet_sizes = sheet_configs.get(group_key, [])
-            
-            if not sheet_sizes:
-                continue
-            
-            # Convert sheet sizes to pixels
-            pixel_sheets = [s.to_pixels(dpi) for s in sheet_sizes]
-            
-            # Extract parts from this group
-            parts = []
-            for obj, inst in group.objects:
-                # Find the page for this instance
-                page = pages.get(inst.page_id)
-                if not page or page.original_image is None:
-                    continue
-                
-                part_info = self.extract_part_info(obj, inst, page.original_image)
-                if part_info:
-                    if not respect_quantity:
-                        part_info["quantity"] = 1
-                    parts.append(part_info)
-            
-            if parts:
-                nested_sheets = self.nest_parts(
-                    parts, pixel_sheets,
-                    group.material, group.thickness
-                )
-                
+        # Entries for deleted or edited instances would otherwise pile up
+        # across runs on the app's long-lived engine
+        self._prune_cache()
+        if not material_groups:
+            return results
+        
+        # Groups are independent; extracting part masks is numpy work that
+        # releases the GIL, so nest them in parallel. Results keep group order.
+        with ThreadPoolExecutor(max_workers=min(8, len(material_groups))) as pool:
+            futures = [pool.submit(self._nest_one_group, group, sheet_configs,
+                                   pages, dpi, respect_quantity)
+                       for group in material_groups]
+            for future in futures:
+                group_key, nested_sheets = future.result()
                 if nested_sheets:
                     results[group_key] = nested_sheets
         
         return results
+    
+    def _nest_one_group(self, group, sheet_configs: Dict, pages: Dict, dpi: float,
+                        respect_quantity: bool) -> Tuple[str, List[NestedSheet]]:
+        """Nest a single material group. Returns (group_key, sheets)."""
+        group_key = f"{group.material}_{group.thickness}"
+        sheet_sizes = sheet_configs.get(group_key, [])
+        
+        if not sheet_sizes:
+            return group_key, []
+        
+        # Convert sheet sizes to pixels
+        pixel_sheets = [s.to_pixels(dpi) for s in sheet_sizes]
+        
+        # Extract parts from this group
+        parts = []
+        for obj, inst in group.objects:
+            # Find the page for this instance
+            page = pages.get(inst.page_id)
+            if not page or page.original_image is None:
+                continue
+            
+            part_info = self.extract_part_info(obj, inst, page.original_image)
+            if part_info:
+                if not respect_quantity:
+                    part_info["quantity"] = 1
+                parts.append(part_info)
+        
+        if not parts:
+            return group_key, []
+        
+        return group_key, self.nest_parts(
+            parts, pixel_sheets,
+            group.material, group.thickness
+        )
 
 
 def check_rectpack_available() -> bool:
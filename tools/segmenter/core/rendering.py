@@ -3,9 +3,12 @@
 import cv2
 import numpy as np
 from typing import Dict, List, Set, Tuple, Optional
-import hashlib
+import threading
+import weakref
+from collections import OrderedDict
 
 from tools.segmenter.models import PageTab, SegmentedObject, DynamicCategory
+from tools.segmenter.utils.image import get_mask_bbox
 
 
 class RenderCache:
@@ -13,19 +16,53 @@ class RenderCache:
     
     def __init__(self):
         self.base_image: Optional[np.ndarray] = None  # Original + overlay blended
-        self.base_hash: str = ""  # Hash of objects state
-        self.zoomed_cache: Dict[float, np.ndarray] = {}  # Zoom level -> zoomed base
+        self.base_hash: Optional[tuple] = None  # Key of the objects/masks state
+        # Hide masks the base was built with; held so their ids in base_hash
+        # can't be reused by new arrays while the base is cached
+        self.base_masks: tuple = ()
+        self.zoomed_cache: Dict[tuple, np.ndarray] = {}  # (zoom, label names or None) -> zoomed base
         self.page_id: str = ""
+        self.version: int = 0  # Bumped on every invalidate (lets other caches follow)
+        self.overlay_buf: Optional[np.ndarray] = None  # Scratch overlay reused by _render_base
+        # Last composite with selection highlights/pending elements drawn on
+        # it, the composite it was drawn over, and the key of what was drawn
+        self.highlight_image: Optional[np.ndarray] = None
+        self.highlight_source: Optional[np.ndarray] = None
+        self.highlight_key: Optional[tuple] = None
+        self.highlight_pins: tuple = ()
+        # Pixels labels changed in a zoomed composite, and that composite
+        self.label_mask: Optional[np.ndarray] = None
+        self.label_mask_source: Optional[np.ndarray] = None
+        self.zoom_version: int = 0  # Bumped on every zoom cache clear
+        # Invalidations come from the UI thread while render_page runs on a
+        # worker; they and the renderer's version-checked stores take this
+        # lock so a store can't land between an invalidate's check and clear
+        self.lock = threading.RLock()
     
     def invalidate(self):
         """Clear all caches."""
-        self.base_image = None
-        self.base_hash = ""
-        self.zoomed_cache.clear()
+        with self.lock:
+            self.version += 1
+            self.base_image = None
+            self.base_hash = None
+            self.base_masks = ()
+            self.invalidate_zoom()
     
     def invalidate_zoom(self):
         """Clear only zoom cache (when base changes)."""
-        self.zoomed_cache.clear()
+        with self.lock:
+            self.zoom_version += 1
+            self.zoomed_cache.clear()
+            self.label_mask = None
+            self.label_mask_source = None
+            self.invalidate_highlight()
+    
+    def invalidate_highlight(self):
+        """Clear the cached highlighted composite."""
+        self.highlight_image = None
+        self.highlight_source = None
+        self.highlight_key = None
+        self.highlight_pins = ()
 
 
 class Renderer:
@@ -43,28 +80,43 @@ class Renderer:
         self.label_scale = 0.5
         self.label_thickness = 1
         self.cache = RenderCache()
+        # Highlight contours: id(mask) -> (weakref to mask, contours), LRU-bounded.
+        # Masks are replaced rather than edited, so entries stay valid across
+        # render cache invalidations while their mask is alive.
+        self._contour_cache: "OrderedDict[int, tuple]" = OrderedDict()
+        self._contour_cache_size = 64
+        # Group centroids: tuple of mask ids -> (weakrefs to the masks, centroid)
+        self._centroid_cache: Dict[tuple, tuple] = {}
+        # render_page may run on a worker thread while exports render on the
+        # UI thread; the caches above are only touched under this lock.
+        # Invalidation doesn't take it (it must not wait for a render) and
+        # synchronizes with the render cache's stores through cache.lock.
+        self._render_lock = threading.Lock()
     
     def invalidate_cache(self):
         """Call when objects change to force re-render."""
         self.cache.invalidate()
     
+    def invalidate_labels(self):
+        """Call when only label text changed; the base (mask layer) is kept."""
+        self.cache.invalidate_zoom()
+    
     def _compute_objects_hash(self, page: PageTab, categories: Dict[str, DynamicCategory], 
-                               planform_opacity: float) -> str:
-        """Compute a hash representing the current state of objects."""
+                               planform_opacity: float) -> tuple:
+        """Compute a key representing the current state of objects."""
         return self._compute_objects_hash_from_list(page.objects, categories, planform_opacity, page.tab_id)
     
     def _compute_objects_hash_from_list(self, objects: list, categories: Dict[str, DynamicCategory], 
-                                        planform_opacity: float, page_id: str = "") -> str:
-        """Compute a hash representing the current state of objects list."""
-        # Simple hash based on object count and element count
-        parts = [page_id, str(planform_opacity)]
-        for obj in objects:
-            cat = categories.get(obj.category)
-            visible = cat.visible if cat else True
-            parts.append(f"{obj.object_id}:{len(obj.instances)}:{visible}")
-            for inst in obj.instances:
-                parts.append(f"{inst.instance_id}:{len(inst.elements)}")
-        return hashlib.md5("|".join(parts).encode()).hexdigest()[:16]
+                                        planform_opacity: float, page_id: str = "") -> tuple:
+        """Compute a key representing the current state of objects list."""
+        # Based on object/instance ids, element counts and category visibility.
+        # A plain tuple compares exactly and needs no string building or digest;
+        # edits that keep the counts call invalidate_cache() instead.
+        return (page_id, planform_opacity, tuple(
+            (obj.object_id,
+             categories[obj.category].visible if obj.category in categories else True,
+             tuple((inst.instance_id, len(inst.elements)) for inst in obj.instances))
+            for obj in objects))
     
     def render_page(self,
                     page: PageTab,
@@ -93,74 +145,160 @@ class Renderer:
             text_mask: Optional mask of text regions to hide (255 = text area)
             hatching_mask: Optional mask of hatching regions to hide (255 = hatching area)
         """
-        if page.original_image is None:
-            return np.zeros((100, 100, 4), dtype=np.uint8)
-        
-        selected_object_ids = selected_object_ids or set()
-        selected_instance_ids = selected_instance_ids or set()
-        selected_element_ids = selected_element_ids or set()
-        pending_elements = pending_elements or []
-        objects = objects if objects is not None else page.objects
-        
-        h, w = page.original_image.shape[:2]
-        
-        # Compute mask hashes to detect when mask content changes
-        text_mask_hash = ""
-        hatching_mask_hash = ""
-        line_mask_hash = ""
-        if text_mask is not None and text_mask.shape == (h, w):
-            text_mask_hash = str(np.sum(text_mask))  # Simple checksum
-        if hatching_mask is not None and hatching_mask.shape == (h, w):
-            hatching_mask_hash = str(np.sum(hatching_mask))
-        if line_mask is not None and line_mask.shape == (h, w):
-            line_mask_hash = str(np.sum(line_mask))
-        
-        # Check if we need to rebuild base image (include mask content in hash)
-        current_hash = (self._compute_objects_hash_from_list(objects, categories, planform_opacity) + 
-                       str(hide_background) + text_mask_hash + hatching_mask_hash + line_mask_hash)
-        need_base_rebuild = (
-            self.cache.base_image is None or 
-            self.cache.base_hash != current_hash or
-            self.cache.page_id != page.tab_id
-        )
-        
-        if need_base_rebuild:
-            # Rebuild base image (expensive)
-            print(f"RENDER: Rebuilding base image for page {page.tab_id}")
-            print(f"  text_mask: {text_mask is not None}, hash={text_mask_hash}")
-            print(f"  hatching_mask: {hatching_mask is not None}, hash={hatching_mask_hash}")
-            print(f"  line_mask: {line_mask is not None}, hash={line_mask_hash}")
-            self.cache.base_image = self._render_base(page, categories, planform_opacity, hide_background, objects, text_mask, hatching_mask, line_mask)
-            self.cache.base_hash = current_hash
-            self.cache.page_id = page.tab_id
-            self.cache.invalidate_zoom()
-        
-        # Start with a copy of the cached base
-        blended = self.cache.base_image.copy()
-        
-        # Draw highlights (lightweight - only contours)
-        self._highlight_selected(
-            blended, objects,
-            selected_object_ids, selected_instance_ids, selected_element_ids,
-            move_offset=object_move_offset
-        )
-        
-        # Draw pending group elements
-        if pending_elements:
-            self._draw_pending_elements(blended, pending_elements)
+        with self._render_lock:
+            if page.original_image is None:
+                return np.zeros((100, 100, 4), dtype=np.uint8)
+            
+            selected_object_ids = selected_object_ids or set()
+            selected_instance_ids = selected_instance_ids or set()
+            selected_element_ids = selected_element_ids or set()
+            pending_elements = pending_elements or []
+            objects = objects if objects is not None else page.objects
+            
+            h, w = page.original_image.shape[:2]
+            
+            # Hide masks are only ever replaced, never edited in place, so
+            # identity tells us when their content changed
+            text_mask_hash = None
+            hatching_mask_hash = None
+            line_mask_hash = None
+            if text_mask is not None and text_mask.shape == (h, w):
+                text_mask_hash = id(text_mask)
+            if hatching_mask is not None and hatching_mask.shape == (h, w):
+                hatching_mask_hash = id(hatching_mask)
+            if line_mask is not None and line_mask.shape == (h, w):
+                line_mask_hash = id(line_mask)
+            
+            # Check if we need to rebuild base image (include mask content in hash)
+            current_hash = (self._compute_objects_hash_from_list(objects, categories, planform_opacity),
+                            hide_background, text_mask_hash, hatching_mask_hash, line_mask_hash)
+            # Read the cached base once - invalidate_cache() can be called from
+            # the UI thread while a render is in progress
+            base = self.cache.base_image
+            need_base_rebuild = (
+                base is None or 
+                self.cache.base_hash != current_hash or
+                self.cache.page_id != page.tab_id
+            )
+            
+            if need_base_rebuild:
+                # Rebuild base image (expensive)
+                version = self.cache.version
+                base = self._render_base(page, categories, planform_opacity, hide_background, objects, text_mask, hatching_mask, line_mask)
+                # Don't cache a base that was invalidated while it was being built
+                with self.cache.lock:
+                    if self.cache.version == version:
+                        self.cache.base_image = base
+                        self.cache.base_hash = current_hash
+                        self.cache.base_masks = (text_mask, hatching_mask, line_mask)
+                        self.cache.page_id = page.tab_id
+                        self.cache.invalidate_zoom()
+            
+            # Labelled + zoomed base, cached per zoom so an unselected frame is
+            # just a lookup. Labels depend on object names, which the objects
+            # hash doesn't cover.
+            labels_key = tuple(obj.name for obj in objects) if show_labels else None
+            composite = self._zoomed_composite(base, objects, categories, zoom, labels_key)
+            
+            # With nothing to draw on top, return the composite itself rather
+            # than a full-frame copy. It may be the cached one, so it is handed
+            # out read-only; callers that modify frames copy it themselves.
+            if not (selected_object_ids or selected_instance_ids or
+                    selected_element_ids or pending_elements):
+                composite.setflags(write=False)
+                return composite
+            
+            # Idle frames with an unchanged selection reuse the last highlighted
+            # frame. Pending elements and masks are keyed by identity and pinned
+            # alongside the frame, so their ids can't be reused while cached.
+            pending_pins = tuple((elem, elem.mask) for elem in pending_elements)
+            highlight_key = (frozenset(selected_object_ids), frozenset(selected_instance_ids),
+                             frozenset(selected_element_ids), object_move_offset,
+                             tuple((id(elem), id(mask)) for elem, mask in pending_pins))
+            if (self.cache.highlight_source is composite and
+                    self.cache.highlight_key == highlight_key):
+                return self.cache.highlight_image
+            
+            # Highlights go under the labels, so they are drawn on the unlabelled
+            # zoomed base and the labels are put back on top afterwards
+            plain = composite
+            if labels_key is not None:
+                plain = self._zoomed_composite(base, objects, categories, zoom, None)
+            blended = plain.copy()
+            
+            # Draw highlights (lightweight - only contours, scaled to the zoom)
+            self._highlight_selected(
+                blended, objects,
+                selected_object_ids, selected_instance_ids, selected_element_ids,
+                move_offset=object_move_offset, zoom=zoom
+            )
+            
+            # Draw pending group elements
+            if pending_elements:
+                self._draw_pending_elements(blended, pending_elements, zoom=zoom)
+            
+            # Draw labels on top
+            if labels_key is not None:
+                if zoom == 1.0:
+                    self._draw_labels_fast(blended, objects, categories)
+                else:
+                    # Labels were drawn before the zoom; copy the pixels they
+                    # changed from the labelled composite
+                    label_mask = self._get_label_mask(composite, plain)
+                    np.copyto(blended, composite, where=label_mask[:, :, None])
+            
+            blended.setflags(write=False)
+            self.cache.highlight_image = blended
+            self.cache.highlight_source = composite
+            self.cache.highlight_key = highlight_key
+            self.cache.highlight_pins = pending_pins
+            return blended
+    
+    def _zoomed_composite(self, base: np.ndarray, objects: list,
+                          categories: Dict[str, DynamicCategory],
+                          zoom: float, labels_key: Optional[tuple]) -> np.ndarray:
+        """Get the base with labels drawn (unless labels_key is None) and zoom applied, cached per key."""
+        zoom_key = (zoom, labels_key)
+        with self.cache.lock:
+            cacheable = base is self.cache.base_image
+            zoom_version = self.cache.zoom_version
+            composite = self.cache.zoomed_cache.get(zoom_key) if cacheable else None
+        if composite is not None:
+            return composite
+        
+        h, w = base.shape[:2]
+        composite = base.copy()
         
         # Draw labels (lightweight)
-        if show_labels:
-            self._draw_labels_fast(blended, objects, categories)
+        if labels_key is not None:
+            self._draw_labels_fast(composite, objects, categories)
         
-        # Apply zoom (use cache if available and no dynamic elements)
+        # Apply zoom
         if zoom != 1.0:
             new_w = max(1, int(w * zoom))
             new_h = max(1, int(h * zoom))
             interp = cv2.INTER_AREA if zoom < 1.0 else cv2.INTER_LINEAR
-            blended = cv2.resize(blended, (new_w, new_h), interpolation=interp)
-        
-        return blended
+            composite = cv2.resize(composite, (new_w, new_h), interpolation=interp)
+        
+        # Don't cache a composite whose base or labels were invalidated while
+        # it was being built
+        with self.cache.lock:
+            if (cacheable and base is self.cache.base_image and
+                    self.cache.zoom_version == zoom_version):
+                # Up to four zoom levels, each labelled and unlabelled
+                if len(self.cache.zoomed_cache) >= 8:
+                    self.cache.zoomed_cache.clear()
+                self.cache.zoomed_cache[zoom_key] = composite
+        return composite
+    
+    def _get_label_mask(self, labelled: np.ndarray, plain: np.ndarray) -> np.ndarray:
+        """Get the pixels where the labelled composite differs from the plain one (cached)."""
+        if self.cache.label_mask_source is labelled:
+            return self.cache.label_mask
+        label_mask = np.any(labelled != plain, axis=2)
+        self.cache.label_mask = label_mask
+        self.cache.label_mask_source = labelled
+        return label_mask
     
     def _render_base(self, page: PageTab, categories: Dict[str, DynamicCategory],
                      planform_opacity: float, hide_background: bool = False,
@@ -172,25 +310,23 @@ class Renderer:
         
         # Start with original image and ALWAYS hide text/hatching first
         # This ensures text/hatch is invisible in ALL areas
-        base_image = page.original_image.copy()
-        
-        # Create combined hide mask (text + hatch)
-        hide_mask = np.zeros((h, w), dtype=np.uint8)
-        
-        if text_mask is not None and text_mask.shape == (h, w):
-            base_image[text_mask > 0] = [255, 255, 255]  # White in BGR
-            hide_mask = np.maximum(hide_mask, text_mask)
-            
-        if hatching_mask is not None and hatching_mask.shape == (h, w):
-            base_image[hatching_mask > 0] = [255, 255, 255]  # White in BGR
-            hide_mask = np.maximum(hide_mask, hatching_mask)
-        
-        if line_mask is not None and line_mask.shape == (h, w):
-            base_image[line_mask > 0] = [255, 255, 255]  # White in BGR
-            hide_mask = np.maximum(hide_mask, line_mask)
-        
-        # Create segmentation overlay
-        overlay = np.zeros((h, w, 4), dtype=np.uint8)
+        # (not needed when only the objects are shown on white)
+        # The BGRA conversion is the working copy, so the hidden areas are
+        # whitened on it directly and it becomes the blend output
+        base_image = None
+        if not hide_background:
+            base_image = cv2.cvtColor(page.original_image, cv2.COLOR_BGR2BGRA)  # Full opacity
+            for hide in (text_mask, hatching_mask, line_mask):
+                if hide is not None and hide.shape == (h, w):
+                    base_image[hide > 0] = (255, 255, 255, 255)  # Opaque white
+        
+        # Create segmentation overlay, reusing the previous rebuild's buffer
+        # (already-mapped memory is much cheaper to clear than fresh pages)
+        overlay = self.cache.overlay_buf
+        if overlay is None or overlay.shape != (h, w, 4):
+            overlay = self.cache.overlay_buf = np.zeros((h, w, 4), dtype=np.uint8)
+        else:
+            overlay.fill(0)
         
         # Check if we have text to fill through (text ghosting fix)
         # Note: We only fix text ghosting, not hatch ghosting
@@ -210,7 +346,7 @@ class Renderer:
             alpha_val = int(255 * opacity)
             
             # Separate line/perimeter elements from filled elements
-            filled_mask = np.zeros((h, w), dtype=np.uint8)
+            filled_elements = []  # (mask, bbox) of regular filled elements
             line_elements = []  # Store line/perimeter elements for special rendering
             
             for inst in obj.instances:
@@ -225,44 +361,58 @@ class Renderer:
                             line_elements.append(elem)
                         else:
                             # Regular filled elements
-                            filled_mask = np.maximum(filled_mask, elem.mask)
+                            bbox = get_mask_bbox(elem.mask)
+                            if bbox is not None:
+                                filled_elements.append((elem.mask, bbox))
             
-            # Text ghosting fix: grow mask into text areas only
-            # This fills gaps caused by text that was present during flood fill
-            if has_text_mask and np.any(filled_mask > 0):
-                kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-                # Use in-place operations where possible to reduce memory
-                grown_mask = filled_mask.copy()
+            if filled_elements:
+                # Combine the filled elements only within their union bbox
+                x1 = min(b[0] for _, b in filled_elements)
+                y1 = min(b[1] for _, b in filled_elements)
+                x2 = max(b[2] for _, b in filled_elements)
+                y2 = max(b[3] for _, b in filled_elements)
                 
+                # Text ghosting fix: grow mask into text areas only
+                # This fills gaps caused by text that was present during flood fill
                 # Limit iterations to prevent excessive memory usage on large images
                 max_iterations = min(100, int(np.sqrt(h * w) / 10))  # Adaptive limit
-                for _ in range(max_iterations):
-                    dilated = cv2.dilate(grown_mask, kernel, iterations=1)
-                    # Only grow into TEXT mask pixels (not hatch)
-                    new_pixels = (dilated > 0) & (grown_mask == 0) & (text_mask > 0)
-                    if not np.any(new_pixels):
-                        break
-                    grown_mask[new_pixels] = 255
+                grow_into_text = False
+                if has_text_mask:
+                    # Growth is at most one pixel per iteration, so only text
+                    # within that margin of the fill matters; skip the growth
+                    # (and keep the tight window) when there is none
+                    gx1, gy1 = max(0, x1 - max_iterations), max(0, y1 - max_iterations)
+                    gx2, gy2 = min(w, x2 + max_iterations), min(h, y2 + max_iterations)
+                    grow_into_text = bool(text_mask[gy1:gy2, gx1:gx2].any())
+                    if grow_into_text:
+                        x1, y1, x2, y2 = gx1, gy1, gx2, gy2
                 
-                filled_mask = grown_mask
-            
-            # Apply filled regions to overlay
-            if np.any(filled_mask > 0):
+                if len(filled_elements) == 1 and not grow_into_text:
+                    # Single element: its own bbox window is the union (read only)
+                    filled_mask = filled_elements[0][0][y1:y2, x1:x2]
+                else:
+                    filled_mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+                    for mask, (ex1, ey1, ex2, ey2) in filled_elements:
+                        roi = filled_mask[ey1 - y1:ey2 - y1, ex1 - x1:ex2 - x1]
+                        np.maximum(roi, mask[ey1:ey2, ex1:ex2], out=roi)
+                
+                if grow_into_text:
+                    filled_mask = self._grow_into_text(filled_mask, text_mask[y1:y2, x1:x2],
+                                                       max_iterations)
+                
+                # Apply filled regions to overlay
                 mask_region = filled_mask > 0
-                overlay[mask_region, 0] = cat.color_bgr[0]
-                overlay[mask_region, 1] = cat.color_bgr[1]
-                overlay[mask_region, 2] = cat.color_bgr[2]
-                overlay[mask_region, 3] = alpha_val
+                overlay[y1:y2, x1:x2][mask_region] = (*cat.color_bgr[:3], alpha_val)
             
             # Draw line/perimeter elements as solid lines on top
             # Use category color at full opacity for visibility
             # IMPORTANT: Draw lines AFTER filled regions so they appear on top
             for elem in line_elements:
-                if elem.mask is not None and elem.mask.shape == (h, w):
-                    line_region = elem.mask > 0
-                    pixel_count = np.sum(line_region)
-                    print(f"DEBUG RENDER LINE: {elem.mode} element for {obj.name}, {pixel_count} pixels, cat={obj.category}, color_bgr={cat.color_bgr}")
-                    if pixel_count > 0:
+                bbox = get_mask_bbox(elem.mask)
+                if bbox is not None:
+                    lx1, ly1, lx2, ly2 = bbox
+                    line_region = elem.mask[ly1:ly2, lx1:lx2] > 0
+                    if line_region.any():
                         # Get line color - use category color but ensure it's dark enough to be visible
                         line_bgr = list(cat.color_bgr)
                         
@@ -272,50 +422,80 @@ class Renderer:
                             # Darken the color significantly
                             line_bgr = [max(0, c - 150) for c in line_bgr]
                         
-                        print(f"DEBUG RENDER LINE: Final color after brightness check: {line_bgr}")
-                        
                         # Force line color and full opacity - this should overwrite filled regions
-                        overlay[line_region, 0] = line_bgr[0]
-                        overlay[line_region, 1] = line_bgr[1]
-                        overlay[line_region, 2] = line_bgr[2]
-                        overlay[line_region, 3] = 255  # Full opacity for lines
+                        overlay[ly1:ly2, lx1:lx2][line_region] = (*line_bgr[:3], 255)  # Full opacity for lines
+        
+        # Blend only where the overlay has coverage; everywhere else the
+        # result is just the background, so the int math runs on the covered
+        # pixels alone instead of on full-page per-channel temporaries
+        covered = overlay[:, :, 3] > 0
+        overlay_px = overlay[covered]
+        alpha = overlay_px[:, 3:4].astype(np.int32)
+        overlay_c = overlay_px[:, :3].astype(np.int32)
         
         if hide_background:
             # Show only objects on white background
-            # Use uint8 operations to avoid float32 memory overhead
-            blended = np.zeros((h, w, 4), dtype=np.uint8)
-            blended[:, :, :3] = 255  # White background
-            alpha_channel = overlay[:, :, 3]  # Extract alpha as 2D array
-            # Blend: result = background * (1 - alpha/255) + overlay * (alpha/255)
+            blended = np.full((h, w, 4), 255, dtype=np.uint8)
             # For white background: result = 255 * (1 - alpha/255) + overlay * (alpha/255)
             # = 255 - alpha + overlay * alpha / 255
-            # Optimized: use uint16 for intermediate calculations
-            alpha_u16 = alpha_channel.astype(np.uint16)
-            for c in range(3):
-                overlay_c = overlay[:, :, c].astype(np.uint16)
-                # result = 255 - alpha + overlay * alpha / 255
-                result = 255 - alpha_u16 + (overlay_c * alpha_u16 // 255)
-                blended[:, :, c] = result.clip(0, 255).astype(np.uint8)
-            blended[:, :, 3] = 255  # Full opacity
+            result = 255 - alpha + (overlay_c * alpha // 255)
+            blended[covered, :3] = result.clip(0, 255).astype(np.uint8)
         else:
             # Blend overlay onto base image (which already has text/hatch hidden)
-            base_rgba = cv2.cvtColor(base_image, cv2.COLOR_BGR2BGRA)
-            alpha_channel = overlay[:, :, 3]  # Extract alpha as 2D array
+            blended = base_image
             # Blending formula: result = base * (1 - alpha/255) + overlay * (alpha/255)
             # Use signed integers for the difference to handle dark-on-light correctly
-            alpha_i32 = alpha_channel.astype(np.int32)
-            blended = base_rgba.copy()
-            for c in range(3):
-                base_c = base_rgba[:, :, c].astype(np.int32)
-                overlay_c = overlay[:, :, c].astype(np.int32)
-                # result = base + (overlay - base) * alpha / 255
-                diff = overlay_c - base_c  # Can be negative (e.g., dark line on white)
-                result = base_c + (diff * alpha_i32 // 255)
-                blended[:, :, c] = result.clip(0, 255).astype(np.uint8)
-            blended[:, :, 3] = 255  # Full opacity
+            base_c = blended[covered, :3].astype(np.int32)
+            # result = base + (overlay - base) * alpha / 255
+            diff = overlay_c - base_c  # Can be negative (e.g., dark line on white)
+            result = base_c + (diff * alpha // 255)
+            blended[covered, :3] = result.clip(0, 255).astype(np.uint8)
         
         return blended
     
+    @staticmethod
+    def _grow_into_text(filled_mask: np.ndarray, text_mask: np.ndarray,
+                        max_iterations: int) -> np.ndarray:
+        """
+        Grow filled_mask into TEXT mask pixels (not hatch), one 3x3 cross
+        dilation per step, for at most max_iterations steps.
+        
+        Text pixels the fill can reach are found first in a few whole-image
+        passes: they share a 4-connected component with the fill and lie
+        within max_iterations L1 steps of it. The step-by-step dilation then
+        only runs over the bounding box of those pixels, which gives the
+        same result as dilating the whole page.
+        """
+        n_labels, labels = cv2.connectedComponents(cv2.bitwise_or(filled_mask, text_mask),
+                                                   connectivity=4)
+        touches_fill = np.zeros(n_labels, dtype=bool)
+        touches_fill[labels[filled_mask > 0]] = True
+        touches_fill[0] = False
+        
+        empty = (filled_mask == 0).astype(np.uint8)
+        dist = cv2.distanceTransform(empty, cv2.DIST_L1, 3)
+        reachable = touches_fill[labels] & (text_mask > 0) & (dist <= max_iterations) & (empty > 0)
+        if not reachable.any():
+            return filled_mask
+        
+        # Window around the reachable pixels plus the fill pixels next to them
+        x, y, bw, bh = cv2.boundingRect(reachable.view(np.uint8))
+        y1, x1 = max(0, y - 1), max(0, x - 1)
+        y2 = min(filled_mask.shape[0], y + bh + 1)
+        x2 = min(filled_mask.shape[1], x + bw + 1)
+        
+        grown_mask = filled_mask.copy()
+        roi = grown_mask[y1:y2, x1:x2]
+        roi_reachable = reachable[y1:y2, x1:x2]
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        for _ in range(max_iterations):
+            dilated = cv2.dilate(roi, kernel, iterations=1)
+            new_pixels = (dilated > 0) & (roi == 0) & roi_reachable
+            if not np.any(new_pixels):
+                break
+            roi[new_pixels] = 255
+        return grown_mask
+    
     def _draw_labels_fast(self, image: np.ndarray, objects: List[SegmentedObject],
                           categories: Dict[str, DynamicCategory]):
         """Draw labels directly on BGRA image with dark text and light shadow."""
@@ -355,7 +535,8 @@ class Renderer:
                             selected_object_ids: Set[str],
                             selected_instance_ids: Set[str],
                             selected_element_ids: Set[str],
-                            move_offset: Tuple[int, int] = None):
+                            move_offset: Tuple[int, int] = None,
+                            zoom: float = 1.0):
         """
         Draw highlight borders around selected elements.
         
@@ -365,6 +546,8 @@ class Renderer:
         - If objects are selected (no instances/elements), highlight all elements in those objects
         
         If move_offset is provided, shows preview of moved location.
+        Contours, offsets and line widths are scaled by zoom when drawing
+        onto an already-zoomed image.
         """
         # Determine what level of selection we have
         has_element_selection = bool(selected_element_ids)
@@ -387,56 +570,85 @@ class Renderer:
                         should_highlight = obj.object_id in selected_object_ids
                     
                     if should_highlight and elem.mask is not None:
-                        # Check if mask has any content
-                        if np.any(elem.mask > 0):
-                            contours, _ = cv2.findContours(
-                                elem.mask.astype(np.uint8),
-                                cv2.RETR_EXTERNAL,
-                                cv2.CHAIN_APPROX_SIMPLE
-                            )
-                            if contours:  # Only draw if contours found
-                                # Draw black outline first (for contrast)
-                                cv2.drawContours(image, contours, -1, (0, 0, 0, 255), 4)
-                                # Yellow highlight contour on top
-                                cv2.drawContours(image, contours, -1, (0, 255, 255, 255), 2)
+                        # Empty masks have no external contours
+                        contours = self._get_mask_contours(elem.mask)
+                        if len(contours):
+                            contours = self._scale_contours(contours, zoom)
+                            # Draw black outline first (for contrast)
+                            cv2.drawContours(image, contours, -1, (0, 0, 0, 255), self._scale_width(4, zoom))
+                            # Yellow highlight contour on top
+                            cv2.drawContours(image, contours, -1, (0, 255, 255, 255), self._scale_width(2, zoom))
                                 
-                                # If moving, draw preview at new location
-                                if move_offset is not None:
-                                    offset_x, offset_y = move_offset
-                                    # Translate contours
-                                    M = np.float32([[1, 0, offset_x], [0, 1, offset_y]])
-                                    shifted_contours = []
-                                    for contour in contours:
-                                        shifted = contour.astype(np.float32)
-                                        shifted = cv2.transform(shifted.reshape(-1, 1, 2), M).reshape(-1, 2)
-                                        shifted_contours.append(shifted.astype(np.int32))
-                                    # Draw cyan dashed outline at new location
-                                    for contour in shifted_contours:
-                                        pts = contour.reshape(-1, 2)
-                                        for i in range(0, len(pts) - 1, 2):
-                                            pt1 = tuple(pts[i])
-                                            pt2 = tuple(pts[min(i + 1, len(pts) - 1)])
-                                            cv2.line(image, pt1, pt2, (255, 255, 0, 255), 2)  # Cyan
-                        else:
-                            print(f"DEBUG: Element {elem.element_id} has empty mask, skipping highlight")
+                            # If moving, draw preview at new location
+                            if move_offset is not None:
+                                # Translate contours
+                                offset = np.array([int(round(move_offset[0] * zoom)),
+                                                   int(round(move_offset[1] * zoom))], dtype=np.int32)
+                                # Draw cyan dashed outline at new location
+                                self._draw_dashed_contours(image, contours, (255, 255, 0, 255),
+                                                           self._scale_width(2, zoom), offset)
     
-    def _draw_pending_elements(self, image: np.ndarray, elements: list):
+    @staticmethod
+    def _scale_contours(contours, zoom: float) -> list:
+        """Scale full-resolution contours to a zoomed image."""
+        if zoom == 1.0:
+            return contours
+        return [np.round(contour * zoom).astype(np.int32) for contour in contours]
+    
+    @staticmethod
+    def _scale_width(width: int, zoom: float) -> int:
+        """Scale a full-resolution line width to a zoomed image."""
+        return max(1, int(round(width * zoom)))
+    
+    def _get_mask_contours(self, mask: np.ndarray) -> list:
+        """Get external contours of a mask, reusing them while the mask is unchanged."""
+        key = id(mask)
+        hit = self._contour_cache.get(key)
+        if hit is not None and hit[0]() is mask:
+            self._contour_cache.move_to_end(key)
+            return hit[1]
+        
+        # findContours doesn't modify its input, so uint8 masks need no copy
+        contours, _ = cv2.findContours(
+            mask if mask.dtype == np.uint8 else mask.astype(np.uint8),
+            cv2.RETR_EXTERNAL,
+            cv2.CHAIN_APPROX_SIMPLE
+        )
+        self._contour_cache[key] = (weakref.ref(mask), contours)
+        if len(self._contour_cache) > self._contour_cache_size:
+            self._contour_cache.popitem(last=False)
+        return contours
+    
+    def _draw_pending_elements(self, image: np.ndarray, elements: list, zoom: float = 1.0):
         """Draw elements being created in group mode."""
+        width = self._scale_width(2, zoom)
         for elem in elements:
             if elem.mask is not None:
-                contours, _ = cv2.findContours(
-                    elem.mask.astype(np.uint8),
-                    cv2.RETR_EXTERNAL,
-                    cv2.CHAIN_APPROX_SIMPLE
-                )
+                contours = self._scale_contours(self._get_mask_contours(elem.mask), zoom)
                 # Cyan dashed outline
-                for contour in contours:
-                    # Draw dashed by skipping points
-                    pts = contour.reshape(-1, 2)
-                    for i in range(0, len(pts) - 1, 2):
-                        pt1 = tuple(pts[i])
-                        pt2 = tuple(pts[min(i + 1, len(pts) - 1)])
-                        cv2.line(image, pt1, pt2, (255, 255, 0, 255), 2)
+                self._draw_dashed_contours(image, contours, (255, 255, 0, 255), width)
+    
+    @staticmethod
+    def _draw_dashed_contours(image: np.ndarray, contours, color: Tuple[int, ...],
+                              width: int, offset: np.ndarray = None):
+        """
+        Draw contours dashed by joining every other pair of points.
+        
+        All segments go to a single polylines call; each (2, 2) point
+        pair is drawn as its own open polyline, same as one cv2.line.
+        """
+        segments = []
+        for contour in contours:
+            pts = contour.reshape(-1, 2)
+            n = len(pts) // 2 * 2
+            if n:
+                segments.append(pts[:n].reshape(-1, 2, 2))
+        if not segments:
+            return
+        segments = np.concatenate(segments).astype(np.int32, copy=False)
+        if offset is not None:
+            segments = segments + offset
+        cv2.polylines(image, segments, False, color, width)
     
     def _draw_pixel_selection(self, image: np.ndarray, mask: np.ndarray, 
                              move_offset: Tuple[int, int] = None) -> np.ndarray:
@@ -572,24 +784,36 @@ class Renderer:
         Returns:
             (cx, cy) centroid coordinates, or None if no valid masks
         """
-        all_xs = []
-        all_ys = []
-        
-        for elem in elements:
-            if elem.mask is not None:
-                ys, xs = np.where(elem.mask > 0)
-                if len(xs) > 0:
-                    all_xs.extend(xs)
-                    all_ys.extend(ys)
-        
-        if not all_xs:
-            return None
+        masks = [elem.mask for elem in elements if elem.mask is not None]
+        key = tuple(id(mask) for mask in masks)
+        hit = self._centroid_cache.get(key)
+        if (hit is not None and len(hit[0]) == len(masks)
+                and all(ref() is mask for ref, mask in zip(hit[0], masks, strict=True))):
+            return hit[1]
+        
+        # Sum the binary image moments of each mask (pixel count and the
+        # x/y coordinate sums) instead of collecting pixel coordinates
+        total = 0.0
+        sum_x = 0.0
+        sum_y = 0.0
+        
+        for mask in masks:
+            m = cv2.moments(mask if mask.dtype == np.uint8 else mask.astype(np.uint8),
+                            binaryImage=True)
+            total += m['m00']
+            sum_x += m['m10']
+            sum_y += m['m01']
         
         # Calculate center of gravity
-        cx = int(np.mean(all_xs))
-        cy = int(np.mean(all_ys))
-        
-        return (cx, cy)
+        centroid = (int(sum_x / total), int(sum_y / total)) if total else None
+        
+        # Masks are replaced rather than edited, so the centroid holds while
+        # the same masks are alive
+        if len(self._centroid_cache) > 4096:
+            self._centroid_cache = {k: v for k, v in self._centroid_cache.items()
+                                    if all(ref() is not None for ref in v[0])}
+        self._centroid_cache[key] = (tuple(weakref.ref(mask) for mask in masks), centroid)
+        return centroid
     
     def render_thumbnail(self, 
                          page: PageTab,
@@ -1,13 +1,17 @@
 """Export functionality for images and data."""
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import cv2
 import numpy as np
 
 from tools.segmenter.models import PageTab, DynamicCategory
 from tools.segmenter.core.rendering import Renderer
+from tools.segmenter.utils.image import expand_mask
 
 
 class ImageExporter:
@@ -78,33 +82,82 @@ class ImageExporter:
         
         if separate_objects:
             # One mask per object
+            tasks = []
+            used = set()
             for obj in page.objects:
-                mask = np.zeros((h, w), dtype=np.uint8)
-                for inst in obj.instances:
-                    for elem in inst.elements:
-                        if elem.mask is not None:
-                            mask = np.maximum(mask, elem.mask)
+                bbox, crop = self._union_masks([elem.mask for inst in obj.instances
+                                                for elem in inst.elements
+                                                if elem.mask is not None])
                 
-                if np.any(mask):
-                    filename = f"{page.model_name}_{page.page_name}_{obj.name}_mask.png"
-                    filepath = out_path / filename
-                    cv2.imwrite(str(filepath), mask)
-                    created.append(str(filepath))
+                if bbox is not None:
+                    # Object names can repeat; number the later ones so no two
+                    # workers write the same file
+                    stem = f"{page.model_name}_{page.page_name}_{obj.name}"
+                    filepath = str(out_path / f"{stem}_mask.png")
+                    n = 1
+                    while filepath in used:
+                        n += 1
+                        filepath = str(out_path / f"{stem}_{n}_mask.png")
+                    used.add(filepath)
+                    tasks.append((filepath, bbox, crop))
+            
+            # PNG encoding runs in OpenCV without the GIL, so the per-object
+            # files are expanded and written in parallel
+            def write_mask(task):
+                filepath, bbox, crop = task
+                return cv2.imwrite(filepath, expand_mask(bbox, crop, (h, w)))
+            
+            if tasks:
+                with ThreadPoolExecutor(max_workers=min(8, len(tasks), os.cpu_count() or 1)) as pool:
+                    written = list(pool.map(write_mask, tasks))
+                created.extend(task[0] for task, ok in zip(tasks, written, strict=True) if ok)
         else:
             # Single combined mask
-            mask = np.zeros((h, w), dtype=np.uint8)
-            for obj in page.objects:
-                for inst in obj.instances:
-                    for elem in inst.elements:
-                        if elem.mask is not None:
-                            mask = np.maximum(mask, elem.mask)
+            bbox, crop = self._union_masks([elem.mask for obj in page.objects
+                                            for inst in obj.instances
+                                            for elem in inst.elements
+                                            if elem.mask is not None])
+            mask = expand_mask(bbox, crop, (h, w))
             
             filename = f"{page.model_name}_{page.page_name}_mask.png"
             filepath = out_path / filename
-            cv2.imwrite(str(filepath), mask)
-            created.append(str(filepath))
+            if cv2.imwrite(str(filepath), mask):
+                created.append(str(filepath))
         
         return created
+    
+    @staticmethod
+    def _union_masks(masks: List[np.ndarray]
+                     ) -> Tuple[Optional[Tuple[int, int, int, int]], Optional[np.ndarray]]:
+        """
+        Combine masks within the bounding box of their set pixels.
+        
+        Returns:
+            ((x1, y1, x2, y2), cropped union), or (None, None) if all are empty
+        """
+        windows = []
+        for mask in masks:
+            x, y, bw, bh = cv2.boundingRect(mask if mask.dtype == np.uint8 else mask.astype(np.uint8))
+            if bw and bh:
+                windows.append((mask, x, y, x + bw, y + bh))
+        
+        bbox, crop = None, None
+        if windows:
+            x1 = min(win[1] for win in windows)
+            y1 = min(win[2] for win in windows)
+            x2 = max(win[3] for win in windows)
+            y2 = max(win[4] for win in windows)
+            bbox = (x1, y1, x2, y2)
+            if len(windows) == 1:
+                # A lone mask's window is the union; copy it instead of
+                # zero-filling a crop and merging into it
+                crop = windows[0][0][y1:y2, x1:x2].astype(np.uint8)
+            else:
+                crop = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+                for mask, mx1, my1, mx2, my2 in windows:
+                    roi = crop[my1 - y1:my2 - y1, mx1 - x1:mx2 - x1]
+                    np.maximum(roi, mask[my1:my2, mx1:mx2], out=roi)
+        return bbox, crop
 
 
 class DataExporter:
@@ -130,48 +183,46 @@ class DataExporter:
             }
             
             for obj in page.objects:
-                obj_data = {
+                attrs = obj.attributes
+                data["objects"].append({
                     "id": obj.object_id,
                     "name": obj.name,
                     "category": obj.category,
                     "attributes": {
-                        "material": obj.attributes.material,
-                        "type": obj.attributes.obj_type,
-                        "view": obj.attributes.view,
+                        "material": attrs.material,
+                        "type": attrs.obj_type,
+                        "view": attrs.view,
                         "size": {
-                            "width": obj.attributes.width,
-                            "height": obj.attributes.height,
-                            "depth": obj.attributes.depth,
+                            "width": attrs.width,
+                            "height": attrs.height,
+                            "depth": attrs.depth,
                         },
-                        "description": obj.attributes.description,
-                        "quantity": obj.attributes.quantity,
+                        "description": attrs.description,
+                        "quantity": attrs.quantity,
                     },
-                    "instances": [],
-                }
-                
-                for inst in obj.instances:
-                    inst_data = {
-                        "instance_num": inst.instance_num,
-                        "view_type": inst.view_type,
-                        "elements": [],
-                    }
-                    
-                    for elem in inst.elements:
-                        elem_data = {
-                            "mode": elem.mode,
-                            "points": elem.points,
-                            "bounds": elem.bounds,
-                            "centroid": elem.centroid,
-                            "area": elem.area,
+                    "instances": [
+                        {
+                            "instance_num": inst.instance_num,
+                            "view_type": inst.view_type,
+                            "elements": [
+                                {
+                                    "mode": elem.mode,
+                                    "points": elem.points,
+                                    "bounds": elem.bounds,
+                                    "centroid": elem.centroid,
+                                    "area": elem.area,
+                                }
+                                for elem in inst.elements
+                            ],
                         }
-                        inst_data["elements"].append(elem_data)
-                    
-                    obj_data["instances"].append(inst_data)
-                
-                data["objects"].append(obj_data)
+                        for inst in obj.instances
+                    ],
+                })
             
+            # One write call instead of json.dump's per-chunk f.write calls
+            # (the file is buffered either way, so no fewer syscalls)
             with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+                f.write(json.dumps(data, indent=2))
             
             return True
             
@@ -191,36 +242,33 @@ class DataExporter:
             True if successful
         """
         try:
-            bom = {
-                "title": "Bill of Materials",
-                "items": [],
-            }
-            
-            # Collect unique objects
-            seen = set()
+            # Collect unique objects (first occurrence of each name wins)
+            items = {}
             
             for page in pages:
                 for obj in page.objects:
-                    if obj.name in seen:
+                    if obj.name in items:
                         continue
-                    seen.add(obj.name)
                     
-                    item = {
+                    attrs = obj.attributes
+                    items[obj.name] = {
                         "name": obj.name,
                         "category": obj.category,
-                        "material": obj.attributes.material,
-                        "type": obj.attributes.obj_type,
-                        "quantity": obj.attributes.quantity,
-                        "size": obj.attributes.size_string,
-                        "description": obj.attributes.description,
+                        "material": attrs.material,
+                        "type": attrs.obj_type,
+                        "quantity": attrs.quantity,
+                        "size": attrs.size_string,
+                        "description": attrs.description,
                     }
-                    bom["items"].append(item)
             
-            # Sort by category then name
-            bom["items"].sort(key=lambda x: (x["category"], x["name"]))
+            # Sort by category then name (names are unique, so the order is total)
+            bom = {
+                "title": "Bill of Materials",
+                "items": sorted(items.values(), key=itemgetter("category", "name")),
+            }
             
             with open(path, 'w', encoding='utf-8') as f:
-                json.dump(bom, f, indent=2)
+                f.write(json.dumps(bom, indent=2))
             
             return True
             
@@ -1,7 +1,7 @@
 """PDF reading and rasterization."""
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional
 import cv2
 import numpy as np
 
@@ -74,12 +74,15 @@ class PDFReader:
             print(f"Error loading PDF: {e}")
             return []
     
-    def load_with_dimensions(self, path: str) -> List[dict]:
+    def load_with_dimensions(self, path: str,
+                             progress: Optional[Callable[[int, int], None]] = None) -> List[dict]:
         """
         Load a PDF and return pages with dimension information.
         
         Args:
             path: Path to PDF file
+            progress: Optional callback(pages_done, page_count), called after
+                each page is rasterized (from the loading thread)
             
         Returns:
             List of dicts with 'image', 'width_inches', 'height_inches', 'dpi'
@@ -89,6 +92,7 @@ class PDFReader:
             
             doc = fitz.open(path)
             pages = []
+            page_count = len(doc)
             
             for page in doc:
                 # Get page dimensions in points (72 points = 1 inch)
@@ -126,6 +130,8 @@ class PDFReader:
                     'height_inches': height_inches,
                     'dpi': self.dpi,
                 })
+                if progress is not None:
+                    progress(len(pages), page_count)
             
             doc.close()
             return pages
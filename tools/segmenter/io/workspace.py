@@ -12,6 +12,7 @@ from tools.segmenter.models import (
     ObjectAttributes, DynamicCategory,
 )
 from tools.segmenter.core.segmentation import SegmentationEngine
+from tools.segmenter.utils.image import crop_mask
 
 
 VERSION = "5.0"
@@ -101,8 +102,8 @@ class WorkspaceManager:
                     "pdf_height_inches": getattr(page, 'pdf_height_inches', 0.0),
                     # View state
                     "zoom_level": getattr(page, 'zoom_level', 1.0),
-                    "scroll_x": getattr(page, 'scroll_x', 0.0),
-                    "scroll_y": getattr(page, 'scroll_y', 0.0),
+                    "scroll_x": page.scroll_x,
+                    "scroll_y": page.scroll_y,
                     # View settings
                     "hide_background": getattr(page, 'hide_background', False),
                     "hide_text": getattr(page, 'hide_text', False),
@@ -297,7 +298,14 @@ class WorkspaceManager:
                 region_data['center'] = list(r['center'])
             
             # For manual regions, store mask as RLE (run-length encoding) for compactness
-            if r.get('mode') != 'auto' and 'mask' in r and r['mask'] is not None:
+            if r.get('mode') != 'auto' and r.get('mask_crop') is not None:
+                # Already stored as bbox + crop
+                x1, y1, x2, y2 = [int(v) for v in r['mask_bbox']]
+                cropped = r['mask_crop']
+                region_data['mask_bbox'] = [x1, y1, x2, y2]
+                region_data['mask_shape'] = [int(cropped.shape[0]), int(cropped.shape[1])]
+                region_data['mask_rle'] = self._encode_rle(cropped)
+            elif r.get('mode') != 'auto' and 'mask' in r and r['mask'] is not None:
                 mask = r['mask']
                 # Store bounding box of mask to reduce data
                 ys, xs = np.where(mask > 0)
@@ -352,7 +360,8 @@ class WorkspaceManager:
         # Process auto regions (fast - just bbox operations)
         for r in auto_regions:
             region = dict(r)  # Copy all stored data
-            mask = np.zeros((h, w), dtype=np.uint8)
+            region['mask_bbox'] = None
+            region['mask_crop'] = None
             
             bbox = region.get('bbox', [0, 0, 0, 0])
             if len(bbox) == 4:
@@ -362,9 +371,10 @@ class WorkspaceManager:
                 x2 = max(0, min(x2, w))
                 y2 = max(0, min(y2, h))
                 if x2 > x1 and y2 > y1:
-                    mask[y1:y2, x1:x2] = 255
+                    # Keep only the box itself, not a full-page mask
+                    region['mask_bbox'] = (x1, y1, x2, y2)
+                    region['mask_crop'] = np.full((y2 - y1, x2 - x1), 255, dtype=np.uint8)
             
-            region['mask'] = mask
             regions.append(region)
         
         # Process manual regions (slower - RLE decoding)
@@ -434,7 +444,10 @@ class WorkspaceManager:
                     if x2 > x1 and y2 > y1:
                         mask[y1:y2, x1:x2] = 255
             
-            region['mask'] = mask
+            # Keep the mask cropped to its bbox; the RLE data is re-encoded on save
+            region.pop('mask_rle', None)
+            region.pop('mask_shape', None)
+            region['mask_bbox'], region['mask_crop'] = crop_mask(mask)
             regions.append(region)
         
         return regions
@@ -3,6 +3,7 @@
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 import uuid
+import cv2
 import numpy as np
 
 
@@ -48,27 +49,31 @@ class SegmentElement:
         """Get bounding box (x1, y1, x2, y2) of the mask."""
         if self.mask is None:
             return None
-        ys, xs = np.where(self.mask > 0)
-        if len(xs) == 0:
+        x, y, w, h = cv2.boundingRect(self._mask_u8())
+        if w == 0 or h == 0:
             return None
-        return (int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max()))
+        return (x, y, x + w - 1, y + h - 1)
     
     @property
     def centroid(self) -> Optional[Tuple[int, int]]:
         """Get center point of the mask."""
         if self.mask is None:
             return None
-        ys, xs = np.where(self.mask > 0)
-        if len(xs) == 0:
+        m = cv2.moments(self._mask_u8(), binaryImage=True)
+        if m['m00'] == 0:
             return None
-        return (int(np.mean(xs)), int(np.mean(ys)))
+        return (int(m['m10'] / m['m00']), int(m['m01'] / m['m00']))
     
     @property
     def area(self) -> int:
         """Get pixel area of the mask."""
         if self.mask is None:
             return 0
-        return int(np.sum(self.mask > 0))
+        return cv2.countNonZero(self._mask_u8())
+    
+    def _mask_u8(self) -> np.ndarray:
+        """Mask as uint8 for the OpenCV reductions (no copy when already uint8)."""
+        return self.mask if self.mask.dtype == np.uint8 else (self.mask > 0).astype(np.uint8)
     
     def get_label_position(self) -> Optional[Tuple[int, int]]:
         """Calculate label position based on label_position setting."""
@@ -42,6 +42,10 @@ class PageTab:
     dpi: float = 150.0  # Default rasterization DPI
     pdf_width_inches: float = 0.0  # Original PDF width in inches
     pdf_height_inches: float = 0.0  # Original PDF height in inches
+    # View state; canvas is set once the page is added to the notebook
+    canvas: Optional[object] = field(default=None, repr=False, compare=False)
+    scroll_x: float = 0.0
+    scroll_y: float = 0.0
     
     def __post_init__(self):
         if not self.tab_id:
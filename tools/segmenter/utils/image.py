@@ -1,9 +1,12 @@
 """Image processing utility functions."""
 
+import threading
+import weakref
+
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageTk
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 
 
 def resize_image(image: np.ndarray, 
@@ -231,3 +234,73 @@ def draw_dashed_polygon(image: np.ndarray,
                         thickness, dash_length, gap_length)
 
 
+
+
+def crop_mask(mask: np.ndarray) -> Tuple[Optional[Tuple[int, int, int, int]], Optional[np.ndarray]]:
+    """
+    Crop a full-page mask down to the bounding box of its set pixels.
+    
+    Args:
+        mask: Single-channel uint8 mask
+        
+    Returns:
+        ((x1, y1, x2, y2), cropped_mask), or (None, None) if the mask is empty
+    """
+    x, y, w, h = cv2.boundingRect(mask)
+    if w == 0 or h == 0:
+        return None, None
+    return (x, y, x + w, y + h), mask[y:y + h, x:x + w].copy()
+
+
+def expand_mask(bbox: Optional[Tuple[int, int, int, int]],
+                crop: Optional[np.ndarray],
+                shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Rebuild a full-page mask from a bounding box and cropped mask.
+    
+    Args:
+        bbox: (x1, y1, x2, y2) of the crop, or None for an empty mask
+        crop: Cropped mask as returned by crop_mask
+        shape: Full mask shape (only the first two dimensions are used)
+        
+    Returns:
+        Full-size uint8 mask
+    """
+    mask = np.zeros(shape[:2], dtype=np.uint8)
+    if bbox is not None and crop is not None:
+        x1, y1, x2, y2 = bbox
+        mask[y1:y2, x1:x2] = crop
+    return mask
+
+
+# id(mask) -> (weakref to mask, bbox). Masks are replaced rather than edited
+# in place, so a live matching mask means the bbox still holds; weakrefs keep
+# old masks collectable. Shared by the UI thread and the render worker.
+_bbox_cache: Dict[int, tuple] = {}
+_bbox_cache_lock = threading.Lock()
+
+
+def get_mask_bbox(mask: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Get the bounding box of a mask's set pixels, cached by mask identity.
+    
+    Args:
+        mask: Single-channel mask
+        
+    Returns:
+        (x1, y1, x2, y2) with exclusive end, or None if the mask is empty
+    """
+    global _bbox_cache
+    key = id(mask)
+    hit = _bbox_cache.get(key)
+    if hit is not None and hit[0]() is mask:
+        return hit[1]
+    
+    x, y, w, h = cv2.boundingRect(mask if mask.dtype == np.uint8 else mask.astype(np.uint8))
+    bbox = (x, y, x + w, y + h) if w and h else None
+    with _bbox_cache_lock:
+        if len(_bbox_cache) > 4096:
+            # Drop entries for masks that have since been replaced and freed
+            _bbox_cache = {k: v for k, v in _bbox_cache.items() if v[0]() is not None}
+        _bbox_cache[key] = (weakref.ref(mask), bbox)
+    return bbox